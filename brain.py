@@ -15,7 +15,7 @@
 # Axon: 축삭돌기 (neuron에서 신호를 전달하는 구조)
 # ============================================================
 
-import constants
+from connectome import load_connectome
 import random
 import math
 
@@ -33,6 +33,7 @@ class Brain:
     - 감각 뉴런 자극 처리
     
     속성:
+        connectome: 컴파일된 커넥톰 (connectome.py에서 로드)
         weights: 뉴런 간 연결 가중치 (constants.py에서 로드)
         PostSynaptic: 각 뉴런의 신호 강도 (double buffering)
         AdaptationCurrent: 각 뉴런의 적응 전류 (w)
@@ -45,10 +46,18 @@ class Brain:
         AccumulatedRightMusclesSignal: 우측 근육 신호 누적
     """
     
-    def __init__(self):
-        """Brain 객체 초기화"""
-        # 뉴런 간 연결 가중치 (constants.py에서 로드)
-        self.weights = constants.weights
+    def __init__(self, connectome=None):
+        """
+        Brain 객체 초기화
+
+        Args:
+            connectome: CompiledConnectome (None 이면 기본 데이터 파일에서 로드)
+        """
+        # 컴파일된 커넥톰 (뉴런 목록, 근육 분류, readout 그룹)
+        self.connectome = connectome if connectome is not None else load_connectome()
+
+        # 뉴런 간 연결 가중치 (커넥톰에서 딕셔너리 형식으로 변환)
+        self.weights = self.connectome.weights_dict()
         
         # Double buffering: 동시 업데이트를 위해 두 개의 신호 강도 배열 사용
         self.CurrentSignalIntensityIndex = 0  # 현재 신호 강도 인덱스
@@ -95,6 +104,7 @@ class Brain:
         self.IsStimulatedHungerNeurons = True      # 배고픔 뉴런 자극 여부
         self.IsStimulatedNoseTouchNeurons = True   # 코 터치 뉴런 자극 여부
         self.IsStimulatedFoodSenseNeurons = True   # 먹이 감각 뉴런 자극 여부
+        self.FoodSenseIntensity = 1.0              # 먹이 감각 자극 세기 (냄새 농도에 따른 배율)
         
         # 각 뉴런의 신호 강도 딕셔너리 (double buffering)
         # 형식: {neuron_name: [current_signal, next_signal]}
@@ -104,248 +114,41 @@ class Brain:
         # 형식: {source_neuron: [(target_neuron, weight), ...]}
         self.Connectome = {}
 
-        # 근육 카테고리
-        self.MusclesCategory = ['MVU', 'MVL', 'MDL', 'MVR', 'MDR']
+        # 근육 카테고리 (readout_spec.json 에서 로드)
+        self.MusclesCategory = list(self.connectome.spec.get('muscle_prefixes', []))
         # MVU: 배쪽 상부 근육 (Muscle Ventral Upper)
         # MVL: 배쪽 좌측 근육 (Muscle Ventral Left)
         # MDL: 등쪽 좌측 근육 (Muscle Dorsal Left)
         # MVR: 배쪽 우측 근육 (Muscle Ventral Right)
         # MDR: 등쪽 우측 근육 (Muscle Dorsal Right)
-      
-        # 모든 근육의 세부 목록 (07-23 번호는 벌레 몸체의 위치를 나타냄)
-        self.AllMuscleList = [
-            'MDL07',
-            'MDL08',
-            'MDL09',
-            'MDL10',
-            'MDL11',
-            'MDL12',
-            'MDL13',
-            'MDL14',
-            'MDL15',
-            'MDL16',
-            'MDL17',
-            'MDL18',
-            'MDL19',
-            'MDL20',
-            'MDL21',
-            'MDL22',
-            'MDL23',
-            'MVL07',
-            'MVL08',
-            'MVL09',
-            'MVL10',
-            'MVL11',
-            'MVL12',
-            'MVL13',
-            'MVL14',
-            'MVL15',
-            'MVL16',
-            'MVL17',
-            'MVL18',
-            'MVL19',
-            'MVL20',
-            'MVL21',
-            'MVL22',
-            'MVL23',
-            'MDR07',
-            'MDR08',
-            'MDR09',
-            'MDR10',
-            'MDR11',
-            'MDR12',
-            'MDR13',
-            'MDR14',
-            'MDR15',
-            'MDR16',
-            'MDR17',
-            'MDR18',
-            'MDR19',
-            'MDR20',
-            'MDL21',
-            'MDR22',
-            'MDR23',
-            'MVR07',
-            'MVR08',
-            'MVR09',
-            'MVR10',
-            'MVR11',
-            'MVR12',
-            'MVR13',
-            'MVR14',
-            'MVR15',
-            'MVR16',
-            'MVR17',
-            'MVR18',
-            'MVR19',
-            'MVR20',
-            'MVL21',
-            'MVR22',
-            'MVR23',
-        ]
-        
+
         # ========================================
-        # 왼쪽 근육 목록 (좌측 회전 담당)
+        # readout 근육 그룹 (readout_spec.json 에서 로드, 컴파일 시 검증됨)
         # ========================================
-        self.AllLeftMuscles = [
-            'MDR07',
-            'MDR08',
-            'MDR09',
-            'MDR10',
-            'MDR11',
-            'MDR12',
-            'MDR13',
-            'MDR14',
-            'MDR15',
-            'MDR16',
-            'MDR17',
-            'MDR18',
-            'MDR19',
-            'MDR20',
-            'MDR21',
-            'MDR22',
-            'MDR23',
-            'MVL07',
-            'MVL08',
-            'MVL09',
-            'MVL10',
-            'MVL11',
-            'MVL12',
-            'MVL13',
-            'MVL14',
-            'MVL15',
-            'MVL16',
-            'MVL17',
-            'MVL18',
-            'MVL19',
-            'MVL20',
-            'MVL21',
-            'MVL22',
-            'MVL23',
-        ]
-        # 오른쪽 근육들의 전체 목록
-        self.AllRightMuscles = [
-            'MDL07',
-            'MDL08',
-            'MDL09',
-            'MDL10',
-            'MDL11',
-            'MDL12',
-            'MDL13',
-            'MDL14',
-            'MDL15',
-            'MDL16',
-            'MDL17',
-            'MDL18',
-            'MDL19',
-            'MDL20',
-            'MDL21', # WTF?? Why left muscle in right muscle list??
-            'MDL22',
-            'MDL23',
-            'MVR07',
-            'MVR08',
-            'MVR09',
-            'MVR10',
-            'MVR11',
-            'MVR12',
-            'MVR13',
-            'MVR14',
-            'MVR15',
-            'MVR16',
-            'MVR17',
-            'MVR18',
-            'MVR19',
-            'MVR20',
-            'MVR21', # WTF?? Why left muscle in right muscle list??
-            'MVR22',
-            'MVR23',
-        ]
-        # 왼쪽 등쪽 근육 (Muscle Dorsal Left)
-        self.AllLeftDorsalMuscles = [
-            'MDR07',
-            'MDR08',
-            'MDR09',
-            'MDR10',
-            'MDR11',
-            'MDR12',
-            'MDR13',
-            'MDR14',
-            'MDR15',
-            'MDR16',
-            'MDR17',
-            'MDR18',
-            'MDR19',
-            'MDR20',
-            'MDR21',
-            'MDR22',
-            'MDR23',
-        ]
-        # 왼쪽 배쪽 근육 (Muscle Ventral Left)
-        self.AllLeftVentralMuscles = [
-            'MVL07',
-            'MVL08',
-            'MVL09',
-            'MVL10',
-            'MVL11',
-            'MVL12',
-            'MVL13',
-            'MVL14',
-            'MVL15',
-            'MVL16',
-            'MVL17',
-            'MVL18',
-            'MVL19',
-            'MVL20',
-            'MVL21',
-            'MVL22',
-            'MVL23',
-        ]
-        # 오른쪽 등쪽 근육 (Muscle Dorsal Right)
-        self.AllRightDorsalMuscles = [
-            'MDL07',
-            'MDL08',
-            'MDL09',
-            'MDL10',
-            'MDL11',
-            'MDL12',
-            'MDL13',
-            'MDL14',
-            'MDL15',
-            'MDL16',
-            'MDL17',
-            'MDL18',
-            'MDL19',
-            'MDL20',
-            'MDL21', # WTF?? Why left muscle in right muscle list??
-            'MDL22',
-            'MDL23',
-        ]
-        # 오른쪽 배쪽 근육 (Muscle Ventral Right)
-        self.AllRightVentralMuscles = [
-            'MVR07',
-            'MVR08',
-            'MVR09',
-            'MVR10',
-            'MVR11',
-            'MVR12',
-            'MVR13',
-            'MVR14',
-            'MVR15',
-            'MVR16',
-            'MVR17',
-            'MVR18',
-            'MVR19',
-            'MVR20',
-            'MVR21', # 주의: MVL21이어야 하는데 MVR21로 잘못 표기됨 (버그)
-            'MVR22',
-            'MVR23',
-        ]
+        readout = self.connectome.readout_names
+        # 왼쪽 근육 목록 (좌측 회전 담당): 등쪽 MDR + 배쪽 MVL
+        self.AllLeftMuscles = readout.get('left', [])
+        # 오른쪽 근육 목록 (우측 회전 담당): 등쪽 MDL + 배쪽 MVR
+        self.AllRightMuscles = readout.get('right', [])
+        self.AllLeftDorsalMuscles = readout.get('left_dorsal', [])
+        self.AllLeftVentralMuscles = readout.get('left_ventral', [])
+        self.AllRightDorsalMuscles = readout.get('right_dorsal', [])
+        self.AllRightVentralMuscles = readout.get('right_ventral', [])
+        # 신호를 누적하는 모든 근육 (07-23 번호는 벌레 몸체의 위치를 나타냄)
+        self.AllMuscleList = self.AllLeftMuscles + self.AllRightMuscles
+
+        # 감각 그룹별 뉴런 목록 (readout_spec.json 의 sensory_groups 에서 로드)
+        # 예: 'hunger' = RIM/RIC, 'nose_touch' = FLP/ASH/IL1V/OLQ, 'food_sense' = ADF/ASG/ASI/ASJ
+        self.SensoryGroups = {
+            group: list(names)
+            for group, names in self.connectome.spec.get('sensory_groups', {}).items()
+        }
 
     # ========================================
     # 신경망 시뮬레이션 메서드
     # ========================================
     
-    def signal_indensity_accumulate(self, PreSynapticName : str):
+    def signal_indensity_accumulate(self, PreSynapticName : str, scale=1.0):
         """
         시냅스 전 뉴런(PreSynaptic)에서 연결된 모든 시냅스 후 뉴런(PostSynaptic)으로
         신호를 전달하고 누적합니다.
@@ -357,6 +160,7 @@ class Brain:
         
         Args:
             PreSynapticName: 신호를 발생시키는 뉴런 이름
+            scale: 가중치 배율 (감각 자극 세기)
         """
         # KeyError 방지: PreSynapticName이 weights에 없으면 무시
         if PreSynapticName not in self.weights:
@@ -365,7 +169,18 @@ class Brain:
         # 연결된 모든 PostSynaptic 뉴런에 신호 전달
         for SynapticsConnectedToPreSynaptic in self.weights[PreSynapticName]:
             self.PostSynaptic[SynapticsConnectedToPreSynaptic][self.NextSignalIntensityIndex] += \
-                self.weights[PreSynapticName][SynapticsConnectedToPreSynaptic]
+                self.weights[PreSynapticName][SynapticsConnectedToPreSynaptic] * scale
+
+    def stimulate_group(self, group, scale=1.0):
+        """
+        readout 명세의 감각 그룹 전체를 한 번에 자극합니다. (FastBrain.stimulate_group 과 같음)
+
+        Args:
+            group: 감각 그룹 이름 ('hunger', 'nose_touch', 'food_sense', ...)
+            scale: 자극 세기 배율
+        """
+        for name in self.SensoryGroups.get(group, ()):
+            self.signal_indensity_accumulate(name, scale)
 
     def RandExcite(self):
         """
@@ -387,58 +202,8 @@ class Brain:
         각각 [current_signal, next_signal] 형태의 double buffering 배열을 생성합니다.
         또한 weights에서 Connectome 연결 맵을 구축합니다.
         """
-        # JavaScript의 방식대로 명시적으로 모든 뉴런을 초기화
-        # 이는 정확한 뉴런 목록을 보장합니다
-        neuron_names = ['ADAL', 'ADAR', 'ADEL', 'ADER', 'ADFL', 'ADFR', 'ADLL', 'ADLR', 
-                       'AFDL', 'AFDR', 'AIAL', 'AIAR', 'AIBL', 'AIBR', 'AIML', 'AIMR', 
-                       'AINL', 'AINR', 'AIYL', 'AIYR', 'AIZL', 'AIZR', 'ALA', 'ALML', 
-                       'ALMR', 'ALNL', 'ALNR', 'AQR', 'AS1', 'AS10', 'AS11', 'AS2', 
-                       'AS3', 'AS4', 'AS5', 'AS6', 'AS7', 'AS8', 'AS9', 'ASEL', 'ASER', 
-                       'ASGL', 'ASGR', 'ASHL', 'ASHR', 'ASIL', 'ASIR', 'ASJL', 'ASJR', 
-                       'ASKL', 'ASKR', 'AUAL', 'AUAR', 'AVAL', 'AVAR', 'AVBL', 'AVBR', 
-                       'AVDL', 'AVDR', 'AVEL', 'AVER', 'AVFL', 'AVFR', 'AVG', 'AVHL', 
-                       'AVHR', 'AVJL', 'AVJR', 'AVKL', 'AVKR', 'AVL', 'AVM', 'AWAL', 
-                       'AWAR', 'AWBL', 'AWBR', 'AWCL', 'AWCR', 'BAGL', 'BAGR', 'BDUL', 
-                       'BDUR', 'CEPDL', 'CEPDR', 'CEPVL', 'CEPVR', 'DA1', 'DA2', 'DA3', 
-                       'DA4', 'DA5', 'DA6', 'DA7', 'DA8', 'DA9', 'DB1', 'DB2', 'DB3', 
-                       'DB4', 'DB5', 'DB6', 'DB7', 'DD1', 'DD2', 'DD3', 'DD4', 'DD5', 
-                       'DD6', 'DVA', 'DVB', 'DVC', 'FLPL', 'FLPR', 'HSNL', 'HSNR', 'I1L', 
-                       'I1R', 'I2L', 'I2R', 'I3', 'I4', 'I5', 'I6', 'IL1DL', 'IL1DR', 
-                       'IL1L', 'IL1R', 'IL1VL', 'IL1VR', 'IL2L', 'IL2R', 'IL2DL', 'IL2DR', 
-                       'IL2VL', 'IL2VR', 'LUAL', 'LUAR', 'M1', 'M2L', 'M2R', 'M3L', 'M3R', 
-                       'M4', 'M5', 'MANAL', 'MCL', 'MCR', 'MDL01', 'MDL02', 'MDL03', 
-                       'MDL04', 'MDL05', 'MDL06', 'MDL07', 'MDL08', 'MDL09', 'MDL10', 
-                       'MDL11', 'MDL12', 'MDL13', 'MDL14', 'MDL15', 'MDL16', 'MDL17', 
-                       'MDL18', 'MDL19', 'MDL20', 'MDL21', 'MDL22', 'MDL23', 'MDL24', 
-                       'MDR01', 'MDR02', 'MDR03', 'MDR04', 'MDR05', 'MDR06', 'MDR07', 
-                       'MDR08', 'MDR09', 'MDR10', 'MDR11', 'MDR12', 'MDR13', 'MDR14', 
-                       'MDR15', 'MDR16', 'MDR17', 'MDR18', 'MDR19', 'MDR20', 'MDR21', 
-                       'MDR22', 'MDR23', 'MDR24', 'MI', 'MVL01', 'MVL02', 'MVL03', 'MVL04', 
-                       'MVL05', 'MVL06', 'MVL07', 'MVL08', 'MVL09', 'MVL10', 'MVL11', 
-                       'MVL12', 'MVL13', 'MVL14', 'MVL15', 'MVL16', 'MVL17', 'MVL18', 
-                       'MVL19', 'MVL20', 'MVL21', 'MVL22', 'MVL23', 'MVR01', 'MVR02', 
-                       'MVR03', 'MVR04', 'MVR05', 'MVR06', 'MVR07', 'MVR08', 'MVR09', 
-                       'MVR10', 'MVR11', 'MVR12', 'MVR13', 'MVR14', 'MVR15', 'MVR16', 
-                       'MVR17', 'MVR18', 'MVR19', 'MVR20', 'MVR21', 'MVR22', 'MVR23', 
-                       'MVR24', 'MVULVA', 'NSML', 'NSMR', 'OLLL', 'OLLR', 'OLQDL', 'OLQDR', 
-                       'OLQVL', 'OLQVR', 'PDA', 'PDB', 'PDEL', 'PDER', 'PHAL', 'PHAR', 
-                       'PHBL', 'PHBR', 'PHCL', 'PHCR', 'PLML', 'PLMR', 'PLNL', 'PLNR', 
-                       'PQR', 'PVCL', 'PVCR', 'PVDL', 'PVDR', 'PVM', 'PVNL', 'PVNR', 
-                       'PVPL', 'PVPR', 'PVQL', 'PVQR', 'PVR', 'PVT', 'PVWL', 'PVWR', 
-                       'RIAL', 'RIAR', 'RIBL', 'RIBR', 'RICL', 'RICR', 'RID', 'RIFL', 
-                       'RIFR', 'RIGL', 'RIGR', 'RIH', 'RIML', 'RIMR', 'RIPL', 'RIPR', 
-                       'RIR', 'RIS', 'RIVL', 'RIVR', 'RMDDL', 'RMDDR', 'RMDL', 'RMDR', 
-                       'RMDVL', 'RMDVR', 'RMED', 'RMEL', 'RMER', 'RMEV', 'RMFL', 'RMFR', 
-                       'RMGL', 'RMGR', 'RMHL', 'RMHR', 'SAADL', 'SAADR', 'SAAVL', 'SAAVR', 
-                       'SABD', 'SABVL', 'SABVR', 'SDQL', 'SDQR', 'SIADL', 'SIADR', 'SIAVL', 
-                       'SIAVR', 'SIBDL', 'SIBDR', 'SIBVL', 'SIBVR', 'SMBDL', 'SMBDR', 
-                       'SMBVL', 'SMBVR', 'SMDDL', 'SMDDR', 'SMDVL', 'SMDVR', 'URADL', 
-                       'URADR', 'URAVL', 'URAVR', 'URBL', 'URBR', 'URXL', 'URXR', 'URYDL', 
-                       'URYDR', 'URYVL', 'URYVR', 'VA1', 'VA10', 'VA11', 'VA12', 'VA2', 
-                       'VA3', 'VA4', 'VA5', 'VA6', 'VA7', 'VA8', 'VA9', 'VB1', 'VB10', 
-                       'VB11', 'VB2', 'VB3', 'VB4', 'VB5', 'VB6', 'VB7', 'VB8', 'VB9', 
-                       'VC1', 'VC2', 'VC3', 'VC4', 'VC5', 'VC6', 'VD1', 'VD10', 'VD11', 
-                       'VD12', 'VD13', 'VD2', 'VD3', 'VD4', 'VD5', 'VD6', 'VD7', 'VD8', 'VD9']
+        # 뉴런 목록은 커넥톰 데이터(all_neuron_list.txt, 가중치 테이블, readout 명세)에서 유도
+        neuron_names = self.connectome.neuron_names
         
         # 모든 뉴런을 PostSynaptic에 등록 (double buffering: [current, next])
         for neuron in neuron_names:
@@ -455,9 +220,10 @@ class Brain:
         뇌의 신경망을 한 프레임 업데이트합니다.
         
         감각 뉴런 자극 처리:
-        1. IsStimulatedHungerNeurons: 배고픔 감각 (RIM, RIC 뉴런)
-        2. IsStimulatedNoseTouchNeurons: 코 터치 감각 (FLP, ASH, IL1V, OLQ 뉴런)
-        3. IsStimulatedFoodSenseNeurons: 먹이 감각 (ADF, ASG, ASI 뉴런)
+        1. IsStimulatedHungerNeurons: 배고픔 감각 ('hunger' 그룹)
+        2. IsStimulatedNoseTouchNeurons: 코 터치 감각 ('nose_touch' 그룹)
+        3. IsStimulatedFoodSenseNeurons: 먹이 감각 ('food_sense' 그룹, FoodSenseIntensity 배율)
+        (그룹별 뉴런 목록은 readout_spec.json 의 sensory_groups 에서 로드)
         
         각 자극에 따라 해당 감각 뉴런을 활성화하고 run_connectome()을 호출하여
         전체 신경망에 신호를 전파합니다.
@@ -465,36 +231,17 @@ class Brain:
         
         # 배고픔 뉴런 자극
         if (self.IsStimulatedHungerNeurons):
-            self.signal_indensity_accumulate('RIML')  # 링 인터뉴런 (좌)
-            self.signal_indensity_accumulate('RIMR')  # 링 인터뉴런 (우)
-            self.signal_indensity_accumulate('RICL')  # 링 인터뉴런 (좌)
-            self.signal_indensity_accumulate('RICR')  # 링 인터뉴런 (우)
+            self.stimulate_group('hunger')
             self.run_connectome()
             
         # 코 터치(벽 충돌) 뉴런 자극
         if (self.IsStimulatedNoseTouchNeurons):
-            self.signal_indensity_accumulate('FLPR')  # 앞쪽 감각 (우)
-            self.signal_indensity_accumulate('FLPL')  # 앞쪽 감각 (좌)
-            self.signal_indensity_accumulate('ASHL')  # 머리 부분 감각 (좌)
-            self.signal_indensity_accumulate('ASHR')  # 머리 부분 감각 (우)
-            self.signal_indensity_accumulate('IL1VL') # 입 주변 감각 (좌)
-            self.signal_indensity_accumulate('IL1VR') # 입 주변 감각 (우)
-            self.signal_indensity_accumulate('OLQDL') # 외축 감각 (좌등)
-            self.signal_indensity_accumulate('OLQDR') # 외축 감각 (우등)
-            self.signal_indensity_accumulate('OLQVR') # 외축 감각 (우복)
-            self.signal_indensity_accumulate('OLQVL') # 외축 감각 (좌복)
+            self.stimulate_group('nose_touch')
             self.run_connectome()        
         
         # 먹이 감각 뉴런 자극
         if (self.IsStimulatedFoodSenseNeurons):
-            self.signal_indensity_accumulate('ADFL')  # 냄새 감지 (좌)
-            self.signal_indensity_accumulate('ADFR')  # 냄새 감지 (우)
-            self.signal_indensity_accumulate('ASGR')  # 페로몬 감지 (우)
-            self.signal_indensity_accumulate('ASGL')  # 페로몬 감지 (좌)
-            self.signal_indensity_accumulate('ASIL') # 화학물질 감지
-            self.signal_indensity_accumulate('ASIR')
-            self.signal_indensity_accumulate('ASJR')
-            self.signal_indensity_accumulate('ASJL')
+            self.stimulate_group('food_sense', self.FoodSenseIntensity)
             self.run_connectome()            
 
   # RIML RIMR RICL RICR hunger neurons
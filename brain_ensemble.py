@@ -0,0 +1,299 @@
+# ============================================================
+# brain_ensemble.py - 여러 신경망을 한 번에 계산하는 AdEx 엔진
+# ============================================================
+#
+# FastBrain 은 신경망 하나의 상태를 (2, N) 배열로 가지고 있습니다.
+# 벌레 수백 ~ 수만 마리의 신경망을 하나씩 update() 하면 파이썬 호출 비용이
+# 벌레 수만큼 쌓이므로, 모든 신경망의 상태를 (B, N) 배열 하나로 모아
+# 같은 AdEx 계산을 행 단위로 한 번에 수행합니다.
+#
+# - 커넥톰(CompiledConnectome)과 AdEx 파라미터는 모든 신경망이 공유
+# - 감각 자극 플래그 / 먹이 감각 세기 / 근육 신호는 신경망별 (B,) 배열
+# - 자극 단계(배고픔 → 코 터치 → 먹이 감각)마다 플래그가 켜진 신경망만 계산
+# - 같은 상태의 FastBrain 을 하나씩 update() 한 것과 같은 값 (발화 순서 규칙 포함)
+#
+# FastBrain 의 이중 버퍼는 매 스텝 끝에 현재 = 다음 으로 복사한 뒤 역할만 바꾸므로,
+# 여기서는 voltage(현재) / input(다음) 두 배열로 두고 스텝 끝에 복사만 합니다.
+# ============================================================
+
+import numpy as np
+
+from connectome import load_connectome
+from fast_brain import FastBrain
+
+# 자극 단계 순서 (FastBrain.update 와 같음): (플래그 속성, 감각 그룹)
+STIMULUS_STAGES = (
+    ('hunger_stimulated', 'hunger'),
+    ('nose_touch_stimulated', 'nose_touch'),
+    ('food_sense_stimulated', 'food_sense'),
+)
+
+
+class BrainEnsemble:
+    """
+    같은 커넥톰을 쓰는 신경망 B 개의 묶음 (AdEx 모델)
+
+    속성:
+        connectome: CompiledConnectome (공유)
+        count: 신경망 수 B
+        voltage: (B, N) 현재 신호 강도 (FastBrain.SignalIntensity[CurrentSignalIntensityIndex])
+        input: (B, N) 다음 신호 강도 (자극과 시냅스 입력이 누적됨)
+        adaptation: (B, N) 적응 전류
+        hunger_stimulated / nose_touch_stimulated / food_sense_stimulated: (B,) 감각 자극 플래그
+        food_sense_intensity: (B,) 먹이 감각 자극 세기
+        left_muscle_signal / right_muscle_signal: (B,) 마지막 스텝의 좌/우 근육 신호 합
+    """
+
+    def __init__(self, count, connectome=None):
+        """
+        Args:
+            count: 신경망 수
+            connectome: CompiledConnectome (None 이면 기본 데이터 파일에서 로드)
+        """
+        self.connectome = connectome if connectome is not None else load_connectome()
+        self.count = count
+
+        # === AdEx 모델 파라미터 (FastBrain 과 동일, 모든 신경망 공유) ===
+        self.FireThreshold = 30
+        self.C_m = 200.0
+        self.g_L = 10.0
+        self.E_L = 0.0
+        self.V_reset = 0.0
+        self.V_T = 20.0
+        self.delta_T = 2.0
+        self.tau_w = 30.0
+        self.a = 2.0
+        self.b = 5.0
+        self.tau_m = self.C_m / self.g_L
+        self.dt = 1.0
+        self.Vth = 30.0
+
+        size = self.connectome.size
+        self.voltage = np.zeros((count, size), dtype=np.float64)
+        self.input = np.zeros((count, size), dtype=np.float64)
+        self.adaptation = np.zeros((count, size), dtype=np.float64)
+
+        self.hunger_stimulated = np.ones(count, dtype=bool)
+        self.nose_touch_stimulated = np.ones(count, dtype=bool)
+        self.food_sense_stimulated = np.ones(count, dtype=bool)
+        self.food_sense_intensity = np.ones(count, dtype=np.float64)
+        self.left_muscle_signal = np.zeros(count, dtype=np.float64)
+        self.right_muscle_signal = np.zeros(count, dtype=np.float64)
+
+        self._stimulus_vectors = {
+            group: self.connectome.stimulus_vector(names)
+            for group, names in self.connectome.spec.get('sensory_groups', {}).items()
+        }
+        self._left_muscles = self.connectome.readout_groups.get('left', np.zeros(0, dtype=np.int32))
+        self._right_muscles = self.connectome.readout_groups.get('right', np.zeros(0, dtype=np.int32))
+        self._can_fire = ~self.connectome.is_muscle
+
+    @classmethod
+    def from_brains(cls, brains):
+        """
+        FastBrain 목록의 현재 상태로 묶음을 만듭니다. (모두 같은 커넥톰이어야 함)
+
+        AdEx 파라미터는 첫 번째 신경망의 값을 사용합니다.
+        """
+        first = brains[0]
+        ensemble = cls(len(brains), first.connectome)
+        for name in ('FireThreshold', 'C_m', 'g_L', 'E_L', 'V_reset', 'V_T', 'delta_T',
+                     'tau_w', 'a', 'b', 'tau_m', 'dt', 'Vth'):
+            setattr(ensemble, name, getattr(first, name))
+        for row, brain in enumerate(brains):
+            if brain.connectome is not first.connectome:
+                raise ValueError("모든 신경망이 같은 커넥톰을 사용해야 합니다")
+            ensemble.voltage[row] = brain.SignalIntensity[brain.CurrentSignalIntensityIndex]
+            ensemble.input[row] = brain.SignalIntensity[brain.NextSignalIntensityIndex]
+            ensemble.adaptation[row] = brain.AdaptationCurrent
+            ensemble.hunger_stimulated[row] = brain.IsStimulatedHungerNeurons
+            ensemble.nose_touch_stimulated[row] = brain.IsStimulatedNoseTouchNeurons
+            ensemble.food_sense_stimulated[row] = brain.IsStimulatedFoodSenseNeurons
+            ensemble.food_sense_intensity[row] = brain.FoodSenseIntensity
+            ensemble.left_muscle_signal[row] = brain.AccumulatedLeftMusclesSignal
+            ensemble.right_muscle_signal[row] = brain.AccumulatedRightMusclesSignal
+        return ensemble
+
+    def fork(self):
+        """
+        현재 상태에서 분기한 새 BrainEnsemble 을 만듭니다. (FastBrain.fork 와 같은 방식)
+
+        커넥톰과 자극 벡터 등 불변 데이터는 공유하고, (B, N) 상태 배열과 (B,) 감각 배열만 복사합니다.
+        """
+        branch = object.__new__(BrainEnsemble)
+        branch.__dict__.update(self.__dict__)
+        for name in ('voltage', 'input', 'adaptation', 'hunger_stimulated', 'nose_touch_stimulated',
+                     'food_sense_stimulated', 'food_sense_intensity', 'left_muscle_signal', 'right_muscle_signal'):
+            setattr(branch, name, getattr(self, name).copy())
+        return branch
+
+    def brain(self, row):
+        """
+        row 번째 신경망과 같은 상태의 FastBrain 을 만듭니다. (뉴런 패널 표시 / 개별 분석용 복사본)
+        """
+        brain = FastBrain(self.connectome)
+        for name in ('FireThreshold', 'C_m', 'g_L', 'E_L', 'V_reset', 'V_T', 'delta_T',
+                     'tau_w', 'a', 'b', 'tau_m', 'dt', 'Vth'):
+            setattr(brain, name, getattr(self, name))
+        brain.SignalIntensity[brain.CurrentSignalIntensityIndex] = self.voltage[row]
+        brain.SignalIntensity[brain.NextSignalIntensityIndex] = self.input[row]
+        brain.AdaptationCurrent[:] = self.adaptation[row]
+        brain.IsStimulatedHungerNeurons = bool(self.hunger_stimulated[row])
+        brain.IsStimulatedNoseTouchNeurons = bool(self.nose_touch_stimulated[row])
+        brain.IsStimulatedFoodSenseNeurons = bool(self.food_sense_stimulated[row])
+        brain.FoodSenseIntensity = float(self.food_sense_intensity[row])
+        brain.AccumulatedLeftMusclesSignal = float(self.left_muscle_signal[row])
+        brain.AccumulatedRightMusclesSignal = float(self.right_muscle_signal[row])
+        return brain
+
+    # ========================================
+    # 신경망 시뮬레이션 메서드
+    # ========================================
+
+    def setup(self):
+        """모든 신경망의 신호 강도와 적응 전류를 0으로 초기화합니다."""
+        self.voltage.fill(0.0)
+        self.input.fill(0.0)
+        self.adaptation.fill(0.0)
+
+    def rand_excite(self, rng, count=40):
+        """
+        신경망마다 무작위로 count 개 뉴런을 골라 연결된 뉴런에 가중치를 누적합니다. (FastBrain.RandExcite)
+
+        Args:
+            rng: numpy Generator (seed 로 재현 가능)
+            count: 신경망 하나당 고르는 뉴런 수
+        """
+        c = self.connectome
+        sources = np.array([c.index[name] for name in c.source_names if name in c.index], dtype=np.int64)
+        if len(sources) == 0:
+            return
+        chosen = sources[rng.integers(len(sources), size=(self.count, count))]
+        rows = np.repeat(np.arange(self.count), count)
+        self._add_rows(rows, chosen.ravel(), self.input)
+
+    def stimulate(self, group, rows, scale=None):
+        """
+        rows 신경망의 감각 그룹 전체를 자극합니다. (FastBrain.stimulate_group)
+
+        Args:
+            group: 감각 그룹 이름 ('hunger', 'nose_touch', 'food_sense', ...)
+            rows: 자극할 신경망 번호 배열
+            scale: (len(rows),) 자극 세기 배율 (None 이면 1)
+        """
+        vector = self._stimulus_vectors.get(group)
+        if vector is None:
+            return
+        if scale is None:
+            self.input[rows] += vector
+        else:
+            self.input[rows] += vector * scale[:, None]
+
+    def update(self, rows=None):
+        """
+        신경망들을 한 번 업데이트합니다. (FastBrain.update 와 같은 순서)
+
+        자극 단계마다 플래그가 켜진 신경망만 자극 후 run_connectome() 합니다.
+        먹이 감각은 food_sense_intensity 배율로 자극합니다.
+
+        Args:
+            rows: 업데이트할 신경망 번호 배열 (None 이면 전체)
+        """
+        for flag, group in STIMULUS_STAGES:
+            stimulated = getattr(self, flag)
+            if rows is None:
+                stage_rows = np.flatnonzero(stimulated)
+            else:
+                stage_rows = rows[stimulated[rows]]
+            if len(stage_rows) == 0:
+                continue
+            scale = self.food_sense_intensity[stage_rows] if group == 'food_sense' else None
+            self.stimulate(group, stage_rows, scale)
+            self.run_connectome(stage_rows)
+
+    def run_connectome(self, rows=None):
+        """
+        rows 신경망을 AdEx 모델로 한 스텝 갱신합니다. (FastBrain.run_connectome 의 묶음 버전)
+
+        Args:
+            rows: 갱신할 신경망 번호 배열 (None 이면 전체)
+        """
+        everyone = rows is None or len(rows) == self.count
+        if everyone:
+            current, following, w = self.voltage, self.input, self.adaptation
+        else:
+            current, following, w = self.voltage[rows], self.input[rows], self.adaptation[rows]
+
+        # 1단계: 막전위 업데이트
+        V = current
+        exponential_term = np.zeros_like(V)
+        spiking = (V > self.V_T) & (V < self.Vth)
+        if spiking.any():
+            exponent = np.minimum((V[spiking] - self.V_T) / self.delta_T, 10.0)
+            exponential_term[spiking] = self.g_L * self.delta_T * np.exp(exponent)
+        leak_current = -self.g_L * (V - self.E_L)
+        I = following * self.g_L
+        current += (leak_current + exponential_term - w + I) / self.C_m * self.dt
+
+        # 2단계: 적응 전류 업데이트
+        w += (self.a * (current - self.E_L) - w) / self.tau_w * self.dt
+
+        # 3단계: 임계값 검사 및 발화
+        fired = self._can_fire & (current > self.Vth)
+        if fired.any():
+            self._fire(fired, following)
+            current[fired] = self.V_reset
+            w[fired] += self.b
+
+        # 4단계: 근육 신호 누적
+        left = following[:, self._left_muscles].sum(axis=1)
+        right = following[:, self._right_muscles].sum(axis=1)
+        following[:, self._left_muscles] = 0.0
+        following[:, self._right_muscles] = 0.0
+
+        # 5단계: 현재 = 다음
+        current[:] = following
+
+        if everyone:
+            self.left_muscle_signal[:] = left
+            self.right_muscle_signal[:] = right
+        else:
+            self.voltage[rows], self.input[rows], self.adaptation[rows] = current, following, w
+            self.left_muscle_signal[rows] = left
+            self.right_muscle_signal[rows] = right
+
+    def _fire(self, fired, following):
+        """
+        발화한 뉴런들의 신호를 신경망별로 한 번에 전달합니다.
+
+        FastBrain._fire 와 같은 규칙: 발화 뉴런을 대상으로 하는 시냅스는 pre > post 인 것만 더합니다.
+        """
+        c = self.connectome
+        owners, emitters = np.nonzero(fired & c.is_emitter)
+        if len(emitters) == 0:
+            return
+
+        starts = c.indptr[emitters]
+        lengths = c.indptr[emitters + 1] - starts
+        edge_ids = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        sources = np.repeat(emitters, lengths)
+        edge_owners = np.repeat(owners, lengths)
+        targets = c.indices[edge_ids]
+        weights = c.data[edge_ids]
+
+        emitting = np.zeros(fired.shape, dtype=bool)
+        emitting[owners, emitters] = True
+        keep = ~emitting[edge_owners, targets] | (sources > targets)
+
+        following[owners, emitters] = 0.0
+        bins = edge_owners[keep] * c.size + targets[keep]
+        following += np.bincount(bins, weights=weights[keep], minlength=following.size).reshape(following.shape)
+
+    def _add_rows(self, owners, sources, out):
+        """신경망 owners[k] 에 뉴런 sources[k] 의 시냅스 가중치를 더합니다."""
+        c = self.connectome
+        starts = c.indptr[sources]
+        lengths = c.indptr[sources + 1] - starts
+        edge_ids = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        bins = np.repeat(owners, lengths) * c.size + c.indices[edge_ids]
+        out += np.bincount(bins, weights=c.data[edge_ids], minlength=out.size).reshape(out.shape)
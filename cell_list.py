@@ -0,0 +1,102 @@
+# ============================================================
+# cell_list.py - 움직이는 점들의 이웃 찾기 (셀 리스트)
+# ============================================================
+#
+# 벌레 무리처럼 매 스텝 모든 점이 움직이면 먹이 공간 해시처럼 구조를 유지하며
+# 고치는 것보다 스텝마다 새로 만드는 편이 빠릅니다.
+#
+# - rebuild(positions): 점을 cell_size 격자 칸 순서로 정렬 (argsort 한 번)
+# - pairs(radius): 거리 radius 이내인 모든 점 쌍 (i < j)
+#   칸 크기 ≥ radius 이면 이웃은 자기 칸과 주변 8칸에만 있으므로,
+#   각 칸은 자기 칸 + 오른쪽/아래쪽 4칸만 짝지어 모든 쌍을 한 번씩만 만듭니다.
+#
+# 점이 고르게 퍼져 있으면 비용은 점 수에 비례합니다 (모든 쌍을 비교하는 N² 대신 N × 칸당 점 수).
+# ============================================================
+
+import numpy as np
+
+# 격자 칸 (cx, cy) 를 정수 하나로 합칠 때 cy 에 더하는 값 (음수 칸 좌표 허용)
+_CELL_KEY_OFFSET = 1 << 31
+
+# 자기 칸을 제외하고 짝지을 이웃 칸 (반대쪽 4칸은 그 칸 쪽에서 짝지어짐)
+_FORWARD_OFFSETS = ((1, -1), (1, 0), (1, 1), (0, 1))
+
+
+class CellList:
+    """
+    균일 격자 셀 리스트 (rebuild() 때마다 전체를 다시 정렬)
+
+    속성:
+        cell_size: 격자 칸 크기 (픽셀, 자주 쓰는 조회 반경 이상)
+        positions: 마지막 rebuild() 의 (N, 2) 위치
+        order: 칸 순서로 정렬한 점 번호
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.positions = np.empty((0, 2), dtype=np.float64)
+        self.order = np.empty(0, dtype=np.int64)
+        self._cell_keys = np.empty(0, dtype=np.int64)   # 칸 키 (정렬, 중복 없음)
+        self._cell_starts = np.empty(0, dtype=np.int64)  # order 안의 칸 구간 [시작, 끝)
+        self._cell_ends = np.empty(0, dtype=np.int64)
+
+    def rebuild(self, positions):
+        """(N, 2) 위치로 셀 리스트를 다시 만듭니다."""
+        self.positions = np.asarray(positions, dtype=np.float64)
+        keys = self._keys(np.floor(self.positions / self.cell_size).astype(np.int64))
+        self.order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[self.order]
+        self._cell_keys, self._cell_starts, counts = np.unique(sorted_keys, return_index=True, return_counts=True)
+        self._cell_ends = self._cell_starts + counts
+
+    @staticmethod
+    def _keys(cells):
+        return (cells[:, 0] << 32) + (cells[:, 1] + _CELL_KEY_OFFSET)
+
+    def pairs(self, radius):
+        """
+        거리 radius 이내인 점 쌍을 모두 찾습니다.
+
+        Args:
+            radius: 최대 거리 (cell_size 이하)
+
+        Returns:
+            (i, j, distances): 점 번호 배열 (i < j, (i, j) 순으로 정렬)과 거리
+        """
+        if radius > self.cell_size:
+            raise ValueError(f"조회 반경({radius})이 칸 크기({self.cell_size})보다 큽니다")
+        n = len(self.order)
+        if n < 2:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, np.empty(0, dtype=np.float64)
+
+        # 정렬된 점 k 마다 짝지을 구간 [시작, 끝) 들: 같은 칸의 뒤쪽 점 + 앞쪽 이웃 칸 전체
+        cell_of_point = np.repeat(np.arange(len(self._cell_keys)), self._cell_ends - self._cell_starts)
+        points = np.arange(n)
+        firsts = [points]
+        starts = [points + 1]
+        ends = [self._cell_ends[cell_of_point]]
+        cells = np.stack([self._cell_keys >> 32, (self._cell_keys & 0xFFFFFFFF) - _CELL_KEY_OFFSET], axis=1)
+        for dx, dy in _FORWARD_OFFSETS:
+            neighbour_keys = self._keys(cells + (dx, dy))
+            found = np.minimum(np.searchsorted(self._cell_keys, neighbour_keys), len(self._cell_keys) - 1)
+            hit = self._cell_keys[found] == neighbour_keys
+            point_hit = hit[cell_of_point]
+            firsts.append(points[point_hit])
+            starts.append(self._cell_starts[found][cell_of_point][point_hit])
+            ends.append(self._cell_ends[found][cell_of_point][point_hit])
+        firsts, starts, ends = np.concatenate(firsts), np.concatenate(starts), np.concatenate(ends)
+
+        # 구간을 (점, 짝) 쌍으로 펼침
+        lengths = ends - starts
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        first = self.order[np.repeat(firsts, lengths)]
+        second = self.order[np.repeat(starts, lengths) + offsets]
+
+        distances = np.hypot(self.positions[first, 0] - self.positions[second, 0],
+                             self.positions[first, 1] - self.positions[second, 1])
+        inside = distances <= radius
+        first, second, distances = first[inside], second[inside], distances[inside]
+        i, j = np.minimum(first, second), np.maximum(first, second)
+        order = np.lexsort((j, i))
+        return i[order], j[order], distances[order]
@@ -0,0 +1,198 @@
+# ============================================================
+# checkpoint.py - 시뮬레이션 상태 저장/복원 (체크포인트)
+# ============================================================
+#
+# 실행 중인 시뮬레이션의 전체 상태를 바이너리 파일(.npz)로 저장하고
+# 다시 불러옵니다. 한 번 워밍업한 신경망 상태에서 여러 실험을
+# 반복 시작할 때 사용합니다.
+#
+# 체크포인트 구성:
+# - arrays: 큰 데이터 (뉴런 신호 강도, 적응 전류, 벌레 경로, 먹이, 온도 맵 등)
+# - values: 작은 값 (버퍼 인덱스, 플래그, 벌레 자세, 타이머 등) → JSON 으로 저장
+#
+# 신경망(FastBrain / BrainEnsemble)과 난수 생성기 상태는 이 모듈의 함수로 저장/복원하고,
+# 벌레/먹이/온도 등 나머지 상태는 main.py 에서 채웁니다.
+# ============================================================
+
+import copy
+import json
+import random
+
+import numpy as np
+
+CHECKPOINT_FORMAT_VERSION = 1
+
+# 체크포인트에 저장하는 FastBrain 스칼라 속성
+BRAIN_VALUE_ATTRIBUTES = [
+    'CurrentSignalIntensityIndex',
+    'NextSignalIntensityIndex',
+    'AccumulatedLeftMusclesSignal',
+    'AccumulatedRightMusclesSignal',
+    'IsStimulatedHungerNeurons',
+    'IsStimulatedNoseTouchNeurons',
+    'IsStimulatedFoodSenseNeurons',
+    'FoodSenseIntensity',
+    # AdEx 파라미터 (실험 중 바꾼 값도 보존)
+    'FireThreshold', 'C_m', 'g_L', 'E_L', 'V_reset', 'V_T', 'delta_T',
+    'tau_w', 'a', 'b', 'tau_m', 'dt', 'Vth',
+]
+
+# 나중에 추가된 스칼라 속성의 기본값 (이전 체크포인트에는 없음)
+BRAIN_VALUE_DEFAULTS = {'FoodSenseIntensity': 1.0}
+
+# 체크포인트에 저장하는 FastBrain 배열 속성
+BRAIN_ARRAY_ATTRIBUTES = ['SignalIntensity', 'AdaptationCurrent']
+
+
+class Checkpoint:
+    """
+    시뮬레이션 상태 묶음
+
+    속성:
+        arrays: {이름: numpy 배열}
+        values: {이름: JSON 으로 저장 가능한 값}
+    """
+
+    def __init__(self, arrays=None, values=None):
+        self.arrays = dict(arrays or {})
+        self.values = dict(values or {})
+
+    def copy(self):
+        """배열과 값을 복사한 독립적인 Checkpoint 를 만듭니다. (메모리 내 분기용)"""
+        return Checkpoint(
+            {name: array.copy() for name, array in self.arrays.items()},
+            copy.deepcopy(self.values),
+        )
+
+
+# ============================================================
+# 신경망 / 난수 상태
+# ============================================================
+
+def capture_brain(brain, checkpoint, prefix='brain.'):
+    """
+    FastBrain 의 상태를 체크포인트에 기록합니다.
+
+    Args:
+        brain: FastBrain 객체
+        checkpoint: 기록할 Checkpoint
+        prefix: 이름 접두어 (여러 신경망을 저장할 때 구분용)
+    """
+    for name in BRAIN_ARRAY_ATTRIBUTES:
+        checkpoint.arrays[prefix + name] = np.array(getattr(brain, name))
+    for name in BRAIN_VALUE_ATTRIBUTES:
+        value = getattr(brain, name)
+        checkpoint.values[prefix + name] = value.item() if isinstance(value, np.generic) else value
+    checkpoint.values[prefix + 'connectome'] = brain.connectome.fingerprint()
+
+
+def restore_brain(brain, checkpoint, prefix='brain.'):
+    """
+    체크포인트의 상태를 FastBrain 에 복원합니다. (배열은 제자리 복사)
+
+    Raises:
+        ValueError: 체크포인트가 다른 커넥톰으로 저장된 경우
+    """
+    saved = checkpoint.values.get(prefix + 'connectome')
+    if saved != brain.connectome.fingerprint():
+        raise ValueError(f"체크포인트의 커넥톰이 다릅니다 (저장: {saved}, 현재: {brain.connectome.fingerprint()})")
+    for name in BRAIN_ARRAY_ATTRIBUTES:
+        getattr(brain, name)[...] = checkpoint.arrays[prefix + name]
+    for name in BRAIN_VALUE_ATTRIBUTES:
+        if name in BRAIN_VALUE_DEFAULTS:
+            setattr(brain, name, checkpoint.values.get(prefix + name, BRAIN_VALUE_DEFAULTS[name]))
+        else:
+            setattr(brain, name, checkpoint.values[prefix + name])
+
+
+# 체크포인트에 저장하는 BrainEnsemble 배열 속성 (신경망별 행)
+ENSEMBLE_ARRAY_ATTRIBUTES = [
+    'voltage', 'input', 'adaptation',
+    'hunger_stimulated', 'nose_touch_stimulated', 'food_sense_stimulated',
+    'food_sense_intensity', 'left_muscle_signal', 'right_muscle_signal',
+]
+
+
+def capture_ensemble(ensemble, checkpoint, prefix='ensemble.'):
+    """BrainEnsemble 의 상태를 체크포인트에 기록합니다. (AdEx 파라미터 포함)"""
+    for name in ENSEMBLE_ARRAY_ATTRIBUTES:
+        checkpoint.arrays[prefix + name] = getattr(ensemble, name).copy()
+    for name in ('FireThreshold', 'C_m', 'g_L', 'E_L', 'V_reset', 'V_T', 'delta_T',
+                 'tau_w', 'a', 'b', 'tau_m', 'dt', 'Vth'):
+        checkpoint.values[prefix + name] = getattr(ensemble, name)
+    checkpoint.values[prefix + 'connectome'] = ensemble.connectome.fingerprint()
+
+
+def restore_ensemble(ensemble, checkpoint, prefix='ensemble.'):
+    """
+    체크포인트의 상태를 BrainEnsemble 에 복원합니다. (배열은 제자리 복사)
+
+    Raises:
+        ValueError: 체크포인트가 다른 커넥톰 / 다른 신경망 수로 저장된 경우
+    """
+    saved = checkpoint.values.get(prefix + 'connectome')
+    if saved != ensemble.connectome.fingerprint():
+        raise ValueError(f"체크포인트의 커넥톰이 다릅니다 (저장: {saved}, 현재: {ensemble.connectome.fingerprint()})")
+    saved_count = len(checkpoint.arrays[prefix + 'voltage'])
+    if saved_count != ensemble.count:
+        raise ValueError(f"체크포인트의 신경망 수가 다릅니다 (저장: {saved_count}, 현재: {ensemble.count})")
+    for name in ENSEMBLE_ARRAY_ATTRIBUTES:
+        getattr(ensemble, name)[...] = checkpoint.arrays[prefix + name]
+    for name in ('FireThreshold', 'C_m', 'g_L', 'E_L', 'V_reset', 'V_T', 'delta_T',
+                 'tau_w', 'a', 'b', 'tau_m', 'dt', 'Vth'):
+        setattr(ensemble, name, checkpoint.values[prefix + name])
+
+
+def capture_random(checkpoint, rng=random, prefix='random.'):
+    """파이썬 random 모듈(또는 random.Random 객체)의 상태를 기록합니다."""
+    version, internal_state, gauss_next = rng.getstate()
+    checkpoint.arrays[prefix + 'state'] = np.array(internal_state, dtype=np.uint32)
+    checkpoint.values[prefix + 'version'] = version
+    checkpoint.values[prefix + 'gauss_next'] = gauss_next
+
+
+def restore_random(checkpoint, rng=random, prefix='random.'):
+    """capture_random() 으로 기록한 난수 상태를 복원합니다."""
+    internal_state = tuple(int(v) for v in checkpoint.arrays[prefix + 'state'])
+    rng.setstate((checkpoint.values[prefix + 'version'], internal_state, checkpoint.values[prefix + 'gauss_next']))
+
+
+# ============================================================
+# 파일 저장 / 로드
+# ============================================================
+
+def save_checkpoint(path, checkpoint, compress=False):
+    """
+    체크포인트를 .npz 바이너리 파일로 저장합니다.
+
+    Args:
+        path: 저장할 파일 경로
+        checkpoint: Checkpoint
+        compress: True 면 zlib 압축 (파일은 작아지지만 복원이 느려짐)
+    """
+    save = np.savez_compressed if compress else np.savez
+    with open(path, 'wb') as f:
+        save(
+            f,
+            format_version=np.array(CHECKPOINT_FORMAT_VERSION),
+            values_json=np.array(json.dumps(checkpoint.values)),
+            **{'array.' + name: array for name, array in checkpoint.arrays.items()},
+        )
+
+
+def load_checkpoint(path):
+    """
+    save_checkpoint() 로 저장한 파일을 읽습니다.
+
+    Raises:
+        ValueError: 지원하지 않는 포맷 버전인 경우
+    """
+    with np.load(path, allow_pickle=False) as archive:
+        version = int(archive['format_version'])
+        if version != CHECKPOINT_FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 체크포인트 포맷 버전: {version}")
+        arrays = {
+            key[len('array.'):]: archive[key]
+            for key in archive.files if key.startswith('array.')
+        }
+        return Checkpoint(arrays, json.loads(str(archive['values_json'])))
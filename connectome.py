@@ -0,0 +1,492 @@
+# ============================================================
+# connectome.py - 커넥톰 로더 및 컴파일러
+# ============================================================
+#
+# 뉴런 목록, 근육 분류, 좌/우 근육 그룹(readout), 감각 뉴런 그룹을
+# 코드에 하드코딩하지 않고 데이터 파일에서 읽어 옵니다.
+#
+# 입력 데이터:
+# - 가중치 테이블: constants.py 의 weights 딕셔너리
+#   형식) {PreSynaptic: {PostSynaptic: weight, ...}, ...}
+# - all_neuron_list.txt: 한 줄에 뉴런 이름 하나
+# - readout_spec.json: 근육 접두어, readout 그룹, 감각 뉴런 그룹
+#
+# 컴파일 결과(CompiledConnectome)는 numpy 배열(CSR 행렬)로 구성되며
+# .npz 바이너리 파일로 저장/로드할 수 있습니다.
+# ============================================================
+
+import hashlib
+import importlib
+import json
+import os
+import re
+
+import numpy as np
+
+# 기본 데이터 파일 경로 (이 파일과 같은 폴더)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_WEIGHTS_MODULE = 'constants'
+DEFAULT_NEURON_LIST_FILE = os.path.join(BASE_DIR, 'all_neuron_list.txt')
+DEFAULT_READOUT_SPEC_FILE = os.path.join(BASE_DIR, 'readout_spec.json')
+
+# 컴파일된 커넥톰 바이너리 포맷 버전
+COMPILED_FORMAT_VERSION = 1
+
+# 시냅스 종류 (kind 배열 값)
+SYNAPSE_MERGED = 0   # 가중치 테이블에서 읽은 값 (화학/전기 시냅스가 합쳐진 값)
+SYNAPSE_CHEMICAL = 1  # 화학 시냅스 (Send)
+SYNAPSE_GAP = 2       # 전기 시냅스 (GapJunction)
+
+# 유효한 뉴런 이름 형식 (대문자/숫자)
+NEURON_NAME_PATTERN = re.compile(r'^[A-Z0-9]+$')
+
+
+class CompiledConnectome:
+    """
+    컴파일된 커넥톰 (변경 불가능한 데이터로 취급)
+
+    시냅스는 CSR 형식으로 저장됩니다:
+    행 i(시냅스 전 뉴런)의 연결은 indices[indptr[i]:indptr[i+1]] 이고,
+    가중치는 data[indptr[i]:indptr[i+1]] 입니다.
+
+    속성:
+        neuron_names: 모든 뉴런/근육 이름 목록 (배열 인덱스 순서)
+        index: {뉴런 이름: 배열 인덱스}
+        source_names: 가중치 테이블에 행이 있는 뉴런 (테이블 순서)
+        pre, post, weight, kind, count: 시냅스 목록 (COO 형식)
+        indptr, indices, data: 시냅스 전 뉴런별로 합쳐진 CSR 행렬
+        is_muscle: 근육 여부 (근육은 발화하지 않음)
+        is_emitter: 발화 시 신호를 전달하는 뉴런 여부
+        readout_groups: {그룹 이름: 인덱스 배열} (좌/우 근육 등)
+        sensory_groups: {그룹 이름: 인덱스 배열} (배고픔/코 터치/먹이 감각 등)
+        spec: readout 명세 딕셔너리
+        metadata: 출처 정보 등 부가 정보
+    """
+
+    def __init__(self, neuron_names, source_names, pre, post, weight, kind, count, spec, metadata=None):
+        self.neuron_names = list(neuron_names)
+        self.index = {name: i for i, name in enumerate(self.neuron_names)}
+        self.source_names = list(source_names)
+        self.size = len(self.neuron_names)
+
+        self.pre = np.asarray(pre, dtype=np.int32)
+        self.post = np.asarray(post, dtype=np.int32)
+        self.weight = np.asarray(weight, dtype=np.float64)
+        self.kind = np.asarray(kind, dtype=np.int8)
+        self.count = np.asarray(count, dtype=np.int32)
+
+        self.spec = spec
+        self.metadata = dict(metadata or {})
+
+        self._build_csr()
+        self._build_masks()
+
+    # ========================================
+    # 내부 구조 생성
+    # ========================================
+
+    def _build_csr(self):
+        """같은 (pre, post) 쌍을 합쳐 CSR 행렬을 만듭니다."""
+        n = self.size
+        if len(self.pre) == 0:
+            self.indptr = np.zeros(n + 1, dtype=np.int64)
+            self.indices = np.zeros(0, dtype=np.int32)
+            self.data = np.zeros(0, dtype=np.float64)
+            return
+
+        # (pre, post) 키로 정렬 후 중복 합산 (화학 + 전기 시냅스 등)
+        keys = self.pre.astype(np.int64) * n + self.post
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        summed = np.zeros(len(unique_keys), dtype=np.float64)
+        np.add.at(summed, inverse, self.weight)
+
+        rows = (unique_keys // n).astype(np.int32)
+        self.indices = (unique_keys % n).astype(np.int32)
+        self.data = summed
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=self.indptr[1:])
+
+    def _build_masks(self):
+        """근육/발화 마스크와 그룹 인덱스 배열을 만듭니다."""
+        prefixes = tuple(self.spec.get('muscle_prefixes', []))
+        self.is_muscle = np.array([name.startswith(prefixes) for name in self.neuron_names], dtype=bool)
+
+        non_emitting = set(self.spec.get('non_emitting', []))
+        self.is_emitter = np.zeros(self.size, dtype=bool)
+        for name in self.source_names:
+            if name not in non_emitting:
+                self.is_emitter[self.index[name]] = True
+
+        self.readout_names = resolve_readout_groups(self.spec, self.index)
+        self.readout_groups = {
+            group: np.array([self.index[name] for name in names], dtype=np.int32)
+            for group, names in self.readout_names.items()
+        }
+        self.sensory_groups = {
+            group: np.array([self.index[name] for name in names if name in self.index], dtype=np.int32)
+            for group, names in self.spec.get('sensory_groups', {}).items()
+        }
+
+    # ========================================
+    # 조회
+    # ========================================
+
+    def row(self, name):
+        """
+        시냅스 전 뉴런 하나의 연결 목록을 반환합니다.
+
+        Returns:
+            (targets, weights): 연결된 뉴런 인덱스 배열, 가중치 배열
+        """
+        i = self.index[name]
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:end], self.data[start:end]
+
+    def stimulus_vector(self, names):
+        """
+        여러 뉴런을 동시에 자극했을 때 각 뉴런에 누적되는 신호 벡터를 계산합니다.
+        (Brain.signal_indensity_accumulate 를 names 에 대해 반복한 결과와 같음)
+        """
+        vector = np.zeros(self.size, dtype=np.float64)
+        source_set = set(self.source_names)
+        for name in names:
+            if name in source_set:
+                targets, weights = self.row(name)
+                np.add.at(vector, targets, weights)
+        return vector
+
+    def dense_matrix(self):
+        """(pre, post) 형태의 밀집 가중치 행렬을 반환합니다. (작은 네트워크용)"""
+        matrix = np.zeros((self.size, self.size), dtype=np.float64)
+        rows = np.repeat(np.arange(self.size), np.diff(self.indptr))
+        matrix[rows, self.indices] = self.data
+        return matrix
+
+    def fingerprint(self):
+        """뉴런 목록과 합쳐진 가중치(CSR)로 식별값(SHA-256 앞 16자리)을 계산합니다."""
+        digest = hashlib.sha256()
+        digest.update('\n'.join(self.neuron_names).encode())
+        digest.update(self.indptr.astype(np.int64).tobytes())
+        digest.update(self.indices.astype(np.int32).tobytes())
+        digest.update(self.data.astype(np.float64).tobytes())
+        return digest.hexdigest()[:16]
+
+    def weights_dict(self):
+        """
+        기존 Brain 클래스가 사용하는 딕셔너리 형식의 가중치를 만듭니다.
+
+        Returns:
+            {PreSynaptic: {PostSynaptic: weight}} (source_names 순서)
+        """
+        weights = {}
+        for name in self.source_names:
+            targets, values = self.row(name)
+            weights[name] = {self.neuron_names[t]: _plain_number(v) for t, v in zip(targets, values)}
+        return weights
+
+    # ========================================
+    # 바이너리 저장
+    # ========================================
+
+    def save(self, path):
+        """
+        컴파일된 커넥톰을 .npz 바이너리 파일로 저장합니다.
+
+        Args:
+            path: 저장할 파일 경로
+        """
+        with open(path, 'wb') as f:
+            np.savez_compressed(
+                f,
+                format_version=np.array(COMPILED_FORMAT_VERSION),
+                neuron_names=np.array(self.neuron_names, dtype=str),
+                source_names=np.array(self.source_names, dtype=str),
+                pre=self.pre,
+                post=self.post,
+                weight=self.weight,
+                kind=self.kind,
+                count=self.count,
+                spec_json=np.array(json.dumps(self.spec)),
+                metadata_json=np.array(json.dumps(self.metadata)),
+            )
+
+
+def _plain_number(value):
+    """정수 값이면 int, 아니면 float 으로 변환합니다. (constants.py 와 같은 표기)"""
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+# ============================================================
+# 데이터 파일 읽기
+# ============================================================
+
+def load_weights_table(module_name=DEFAULT_WEIGHTS_MODULE):
+    """
+    가중치 테이블 모듈(constants.py 등)에서 weights 딕셔너리를 읽어 옵니다.
+
+    Args:
+        module_name: 모듈 이름 ('constants', 'constants_chem_sensitive' 등)
+    """
+    return importlib.import_module(module_name).weights
+
+
+def read_neuron_list(path=DEFAULT_NEURON_LIST_FILE):
+    """all_neuron_list.txt 형식(한 줄에 이름 하나)의 파일을 읽습니다."""
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def load_readout_spec(path=DEFAULT_READOUT_SPEC_FILE):
+    """readout 명세(JSON)를 읽습니다."""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def resolve_readout_groups(spec, known_names):
+    """
+    readout 명세의 그룹을 실제 이름 목록으로 펼칩니다.
+
+    그룹은 접두어 + 번호 범위("prefixes", "segments") 또는
+    명시적 이름 목록("members")으로 정의합니다.
+    예) {"prefixes": ["MDR", "MVL"], "segments": [7, 23]} → MDR07 ... MVL23
+    "members" 로 정의한 그룹도 "prefixes" 로 좌우 구분 접두어를 밝혀야 합니다. (검증 시 확인)
+
+    Args:
+        spec: readout 명세 딕셔너리
+        known_names: 알려진 이름 집합 (명시적 목록이 없을 때 존재 여부 확인용)
+
+    Returns:
+        {그룹 이름: [이름, ...]}
+    """
+    groups = {}
+    for group, definition in spec.get('readout_groups', {}).items():
+        if 'members' in definition:
+            groups[group] = list(definition['members'])
+            continue
+        first, last = definition.get('segments', [1, 24])
+        names = []
+        for prefix in definition.get('prefixes', []):
+            for number in range(first, last + 1):
+                name = f"{prefix}{number:02d}"
+                if name in known_names:
+                    names.append(name)
+        groups[group] = names
+    return groups
+
+
+# ============================================================
+# 검증
+# ============================================================
+
+def validate_connectome(edges, neuron_list, spec):
+    """
+    커넥톰 입력 데이터를 검증하고 문제 목록을 반환합니다.
+
+    검사 항목:
+    - 이름 형식 (대문자/숫자, 앞뒤 공백 없음)
+    - 뉴런 목록의 중복 이름
+    - 근육이 아닌데 뉴런 목록에 없는 이름 (오타 가능성)
+    - readout 그룹마다 좌우 구분 접두어(prefixes)가 지정되었는지 ("members" 그룹 포함)
+    - readout 그룹 구성원이 실제 근육인지, 그룹 접두어와 일치하는지, 중복은 없는지
+      (예: 오른쪽 그룹에 왼쪽 근육 MDL21 이 섞인 경우)
+    - 서로 배타적인 그룹(좌/우) 간 중복
+    - 감각 뉴런 그룹 구성원의 존재 여부
+
+    Args:
+        edges: [(pre, post, weight, kind, count), ...]
+        neuron_list: all_neuron_list.txt 의 이름 목록
+        spec: readout 명세
+
+    Returns:
+        list[str]: 문제 설명 목록 (비어 있으면 정상)
+    """
+    problems = []
+    muscle_prefixes = tuple(spec.get('muscle_prefixes', []))
+
+    # 이름 형식 및 중복 검사
+    seen = set()
+    for name in neuron_list:
+        if not NEURON_NAME_PATTERN.match(name):
+            problems.append(f"뉴런 목록: 잘못된 이름 형식 {name!r}")
+        if name in seen:
+            problems.append(f"뉴런 목록: 중복된 이름 {name!r}")
+        seen.add(name)
+
+    known = set(neuron_list) | set(spec.get('isolated_nodes', []))
+    for pre, post, _weight, _kind, _count in edges:
+        for name in (pre, post):
+            if name in known:
+                continue
+            if not NEURON_NAME_PATTERN.match(name):
+                problems.append(f"가중치 테이블: 잘못된 이름 형식 {name!r}")
+            elif not name.startswith(muscle_prefixes):
+                problems.append(f"가중치 테이블: 뉴런 목록에 없는 뉴런 {name!r}")
+            known.add(name)
+
+    # readout 그룹 검사
+    groups = resolve_readout_groups(spec, known)
+    definitions = spec.get('readout_groups', {})
+    for group, names in groups.items():
+        allowed = tuple(definitions[group].get('prefixes', ()))
+        if not allowed:
+            problems.append(f"readout 그룹 {group!r}: 허용 접두어(prefixes)가 지정되지 않았습니다")
+        if not names:
+            problems.append(f"readout 그룹 {group!r}: 구성원이 없습니다")
+        members = set()
+        for name in names:
+            if name not in known:
+                problems.append(f"readout 그룹 {group!r}: 알 수 없는 이름 {name!r}")
+            elif not name.startswith(muscle_prefixes):
+                problems.append(f"readout 그룹 {group!r}: 근육이 아닌 이름 {name!r}")
+            elif allowed and not name.startswith(allowed):
+                problems.append(f"readout 그룹 {group!r}: 잘못 분류된 근육 {name!r} (허용 접두어 {list(allowed)})")
+            if name in members:
+                problems.append(f"readout 그룹 {group!r}: 중복된 이름 {name!r}")
+            members.add(name)
+
+    for exclusive in spec.get('exclusive_groups', []):
+        for i, first in enumerate(exclusive):
+            for second in exclusive[i + 1:]:
+                overlap = set(groups.get(first, [])) & set(groups.get(second, []))
+                for name in sorted(overlap):
+                    problems.append(f"readout 그룹 {first!r}/{second!r}: 양쪽에 모두 속한 근육 {name!r}")
+
+    # 감각 뉴런 그룹 검사
+    for group, names in spec.get('sensory_groups', {}).items():
+        for name in names:
+            if name not in known:
+                problems.append(f"감각 그룹 {group!r}: 알 수 없는 뉴런 {name!r}")
+
+    return problems
+
+
+# ============================================================
+# 컴파일
+# ============================================================
+
+def weights_to_edges(weights):
+    """weights 딕셔너리를 시냅스 목록 [(pre, post, weight, kind, count), ...] 으로 변환합니다."""
+    return [
+        (pre, post, weight, SYNAPSE_MERGED, 0)
+        for pre, targets in weights.items()
+        for post, weight in targets.items()
+    ]
+
+
+def compile_edges(edges, neuron_list, spec, source_names=None, metadata=None):
+    """
+    시냅스 목록을 검증하고 CompiledConnectome 으로 컴파일합니다.
+
+    뉴런 집합 = 뉴런 목록 ∪ 시냅스에 등장하는 이름 ∪ 명세의 isolated_nodes
+    (이름순 정렬, 배열 인덱스 순서)
+
+    Args:
+        edges: [(pre, post, weight, kind, count), ...]
+        neuron_list: 뉴런 이름 목록
+        spec: readout 명세
+        source_names: 발화 시 신호를 전달하는 뉴런 목록 (기본값: 시냅스 전 뉴런, 등장 순서)
+        metadata: 부가 정보 딕셔너리
+
+    Raises:
+        ValueError: 검증에 실패한 경우 (모든 문제를 메시지에 포함)
+    """
+    problems = validate_connectome(edges, neuron_list, spec)
+    if problems:
+        raise ValueError("커넥톰 검증 실패:\n  " + "\n  ".join(problems))
+
+    names = set(neuron_list) | set(spec.get('isolated_nodes', []))
+    for pre, post, _weight, _kind, _count in edges:
+        names.add(pre)
+        names.add(post)
+    neuron_names = sorted(names)
+    index = {name: i for i, name in enumerate(neuron_names)}
+
+    if source_names is None:
+        source_names = list(dict.fromkeys(pre for pre, _post, _weight, _kind, _count in edges))
+
+    return CompiledConnectome(
+        neuron_names,
+        source_names,
+        [index[pre] for pre, _post, _weight, _kind, _count in edges],
+        [index[post] for _pre, post, _weight, _kind, _count in edges],
+        [weight for _pre, _post, weight, _kind, _count in edges],
+        [kind for _pre, _post, _weight, kind, _count in edges],
+        [count for _pre, _post, _weight, _kind, count in edges],
+        spec,
+        metadata,
+    )
+
+
+def compile_connectome(weights, neuron_list, spec, metadata=None):
+    """
+    weights 딕셔너리(가중치 테이블)를 CompiledConnectome 으로 컴파일합니다.
+
+    Args:
+        weights: {PreSynaptic: {PostSynaptic: weight}}
+        neuron_list: 뉴런 이름 목록
+        spec: readout 명세
+        metadata: 부가 정보 딕셔너리
+    """
+    return compile_edges(weights_to_edges(weights), neuron_list, spec,
+                         source_names=list(weights.keys()), metadata=metadata)
+
+
+def load_connectome(weights_module=DEFAULT_WEIGHTS_MODULE,
+                    neuron_list_path=DEFAULT_NEURON_LIST_FILE,
+                    readout_spec_path=DEFAULT_READOUT_SPEC_FILE):
+    """
+    데이터 파일에서 커넥톰을 읽어 컴파일합니다.
+
+    Args:
+        weights_module: 가중치 테이블 모듈 이름 또는 컴파일된 .npz 파일 경로
+        neuron_list_path: 뉴런 목록 파일 경로
+        readout_spec_path: readout 명세 파일 경로
+
+    Returns:
+        CompiledConnectome
+    """
+    if weights_module.endswith('.npz'):
+        return load_compiled(weights_module)
+    return compile_connectome(
+        load_weights_table(weights_module),
+        read_neuron_list(neuron_list_path),
+        load_readout_spec(readout_spec_path),
+        metadata={'source': weights_module},
+    )
+
+
+def load_compiled(path):
+    """
+    CompiledConnectome.save() 로 저장한 .npz 파일을 읽습니다.
+
+    Raises:
+        ValueError: 지원하지 않는 포맷 버전인 경우
+    """
+    with np.load(path, allow_pickle=False) as archive:
+        version = int(archive['format_version'])
+        if version != COMPILED_FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 커넥톰 포맷 버전: {version}")
+        neuron_names = [str(name) for name in archive['neuron_names']]
+        return CompiledConnectome(
+            neuron_names,
+            [str(name) for name in archive['source_names']],
+            archive['pre'],
+            archive['post'],
+            archive['weight'],
+            archive['kind'],
+            archive['count'],
+            json.loads(str(archive['spec_json'])),
+            json.loads(str(archive['metadata_json'])),
+        )
+
+
+if __name__ == '__main__':
+    # 사용법: python connectome.py [가중치 모듈] [출력 .npz]
+    import sys
+
+    module_name = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_WEIGHTS_MODULE
+    output_path = sys.argv[2] if len(sys.argv) > 2 else f"{module_name}.npz"
+    compiled = load_connectome(module_name)
+    compiled.save(output_path)
+    print(f"{compiled.size}개 뉴런, {len(compiled.data)}개 연결 → '{output_path}' 저장 완료")
@@ -0,0 +1,355 @@
+# ============================================================
+# connectome_delta.py - 커넥톰 변형(variant) 델타 저장 및 비교 도구
+# ============================================================
+#
+# constants_chem_sensitive.py 처럼 기본 커넥톰과 일부 시냅스 가중치만 다른
+# 변형을 전체 복사본 대신 "바뀐 시냅스 목록(델타)"으로 저장합니다.
+#
+# 델타 파일(.npz) 구성:
+# - op: 0 = 가중치 변경, 1 = 시냅스 추가, 2 = 시냅스 제거
+# - pre_names, post_names: 시냅스 전/후 뉴런 이름
+# - old_weights, new_weights: 기준/변형 커넥톰의 가중치 (추가/제거 쪽은 0)
+# - base_fingerprint: 기준 커넥톰 식별값 (다른 기준에 적용하는 실수 방지)
+# - source_names: 변형 커넥톰의 source_names 순서 (RandExcite 가 고르는 뉴런 순서, 없으면 이름순)
+#
+# 사용법:
+#   python connectome_delta.py diff constants constants_chem_sensitive
+#   python connectome_delta.py make constants constants_chem_sensitive -o chem_sensitive.delta.npz
+#   python connectome_delta.py show chem_sensitive.delta.npz
+#   python connectome_delta.py apply constants chem_sensitive.delta.npz -o chem_sensitive.npz
+# ============================================================
+
+import argparse
+import json
+
+import numpy as np
+
+from connectome import SYNAPSE_MERGED, CompiledConnectome, load_connectome
+
+DELTA_FORMAT_VERSION = 1
+
+# 델타 연산 종류
+DELTA_CHANGED = 0
+DELTA_ADDED = 1
+DELTA_REMOVED = 2
+
+DELTA_OP_NAMES = {
+    DELTA_CHANGED: '변경',
+    DELTA_ADDED: '추가',
+    DELTA_REMOVED: '제거',
+}
+
+# 가중치가 같다고 볼 허용 오차
+WEIGHT_TOLERANCE = 1e-9
+
+
+class ConnectomeDelta:
+    """
+    기준 커넥톰에 대한 시냅스 변경 목록
+
+    속성:
+        op: (K,) 연산 종류 배열 (DELTA_CHANGED / DELTA_ADDED / DELTA_REMOVED)
+        pre_names, post_names: 시냅스 전/후 뉴런 이름 목록
+        old_weights: 기준 커넥톰의 가중치 (추가는 0)
+        new_weights: 변형 커넥톰의 가중치 (제거는 0)
+        base_fingerprint: 기준 커넥톰 식별값
+        metadata: 부가 정보
+        source_names: 변형 커넥톰의 source_names (순서 포함, None 이면 apply_delta 가 이름순으로 만듦)
+    """
+
+    def __init__(self, op, pre_names, post_names, old_weights, new_weights, base_fingerprint, metadata=None,
+                 source_names=None):
+        self.op = np.asarray(op, dtype=np.int8)
+        self.pre_names = list(pre_names)
+        self.post_names = list(post_names)
+        self.old_weights = np.asarray(old_weights, dtype=np.float64)
+        self.new_weights = np.asarray(new_weights, dtype=np.float64)
+        self.base_fingerprint = base_fingerprint
+        self.metadata = dict(metadata or {})
+        self.source_names = list(source_names) if source_names is not None else None
+
+    def __len__(self):
+        return len(self.op)
+
+    def count(self, op):
+        """해당 연산 종류의 시냅스 수를 반환합니다."""
+        return int((self.op == op).sum())
+
+    def save(self, path):
+        """델타를 .npz 바이너리 파일로 저장합니다."""
+        with open(path, 'wb') as f:
+            np.savez_compressed(
+                f,
+                format_version=np.array(DELTA_FORMAT_VERSION),
+                op=self.op,
+                pre_names=np.array(self.pre_names, dtype=str),
+                post_names=np.array(self.post_names, dtype=str),
+                old_weights=self.old_weights,
+                new_weights=self.new_weights,
+                base_fingerprint=np.array(self.base_fingerprint),
+                metadata_json=np.array(json.dumps(self.metadata)),
+                **({'source_names': np.array(self.source_names, dtype=str)} if self.source_names is not None else {}),
+            )
+
+
+def load_delta(path):
+    """
+    ConnectomeDelta.save() 로 저장한 파일을 읽습니다.
+
+    Raises:
+        ValueError: 지원하지 않는 포맷 버전인 경우
+    """
+    with np.load(path, allow_pickle=False) as archive:
+        version = int(archive['format_version'])
+        if version != DELTA_FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 델타 포맷 버전: {version}")
+        return ConnectomeDelta(
+            archive['op'],
+            [str(name) for name in archive['pre_names']],
+            [str(name) for name in archive['post_names']],
+            archive['old_weights'],
+            archive['new_weights'],
+            str(archive['base_fingerprint']),
+            json.loads(str(archive['metadata_json'])),
+            [str(name) for name in archive['source_names']] if 'source_names' in archive.files else None,
+        )
+
+
+# ============================================================
+# 비교 / 적용
+# ============================================================
+
+def fingerprint(connectome):
+    """커넥톰 식별값 (CompiledConnectome.fingerprint)"""
+    return connectome.fingerprint()
+
+
+def _synapse_table(connectome):
+    """{(pre 이름, post 이름): 합쳐진 가중치} 딕셔너리를 만듭니다."""
+    names = connectome.neuron_names
+    rows = np.repeat(np.arange(connectome.size), np.diff(connectome.indptr))
+    return {
+        (names[pre], names[post]): float(weight)
+        for pre, post, weight in zip(rows, connectome.indices, connectome.data)
+    }
+
+
+def diff_connectomes(base, variant):
+    """
+    두 커넥톰의 합쳐진 가중치를 비교하여 델타를 만듭니다.
+
+    Args:
+        base: 기준 CompiledConnectome
+        variant: 변형 CompiledConnectome
+
+    Returns:
+        ConnectomeDelta (pre, post 이름순 정렬)
+    """
+    base_table = _synapse_table(base)
+    variant_table = _synapse_table(variant)
+
+    entries = []
+    for key, old in base_table.items():
+        new = variant_table.get(key)
+        if new is None:
+            entries.append((key, DELTA_REMOVED, old, 0.0))
+        elif abs(new - old) > WEIGHT_TOLERANCE:
+            entries.append((key, DELTA_CHANGED, old, new))
+    for key, new in variant_table.items():
+        if key not in base_table:
+            entries.append((key, DELTA_ADDED, 0.0, new))
+    entries.sort()
+
+    return ConnectomeDelta(
+        [op for _key, op, _old, _new in entries],
+        [key[0] for key, _op, _old, _new in entries],
+        [key[1] for key, _op, _old, _new in entries],
+        [old for _key, _op, old, _new in entries],
+        [new for _key, _op, _old, new in entries],
+        fingerprint(base),
+        metadata={'base': base.metadata.get('source'), 'variant': variant.metadata.get('source')},
+        source_names=variant.source_names,
+    )
+
+
+def apply_delta(base, delta, check_fingerprint=True):
+    """
+    기준 커넥톰에 델타를 적용한 새 커넥톰을 만듭니다.
+
+    바뀌지 않은 시냅스는 기준 커넥톰의 시냅스 종류/연결 수를 그대로 유지하고,
+    변경/추가된 시냅스는 합쳐진 가중치(SYNAPSE_MERGED) 하나로 기록됩니다.
+
+    source_names 는 델타에 기록된 변형 커넥톰의 순서를 그대로 쓰므로, 같은 난수 시드에서
+    RandExcite 가 변형 가중치 테이블을 직접 컴파일한 커넥톰과 같은 뉴런을 고릅니다.
+    순서가 없는 델타는 출력 시냅스가 남은 뉴런을 이름순(뉴런 인덱스 순서)으로 씁니다.
+
+    Args:
+        base: 기준 CompiledConnectome
+        delta: ConnectomeDelta
+        check_fingerprint: True 면 델타의 기준 식별값이 다를 때 오류
+
+    Raises:
+        ValueError: 델타가 다른 기준 커넥톰으로 만들어진 경우
+    """
+    if check_fingerprint and delta.base_fingerprint != fingerprint(base):
+        raise ValueError(
+            f"델타의 기준 커넥톰이 다릅니다 (델타: {delta.base_fingerprint}, 기준: {fingerprint(base)})")
+
+    # 델타에 처음 등장하는 뉴런은 뉴런 목록에 추가 (이름순 정렬 유지)
+    names = set(base.neuron_names)
+    new_names = sorted(set(delta.pre_names + delta.post_names) - names)
+    if new_names:
+        neuron_names = sorted(names | set(new_names))
+        index = {name: i for i, name in enumerate(neuron_names)}
+        remap = np.array([index[name] for name in base.neuron_names], dtype=np.int32)
+    else:
+        neuron_names = base.neuron_names
+        index = base.index
+        remap = np.arange(base.size, dtype=np.int32)
+    size = len(neuron_names)
+
+    pre = remap[base.pre]
+    post = remap[base.post]
+    delta_pre = np.array([index[name] for name in delta.pre_names], dtype=np.int64)
+    delta_post = np.array([index[name] for name in delta.post_names], dtype=np.int64)
+
+    # 변경/제거 대상 (pre, post) 쌍의 기존 시냅스는 모두 제외
+    touched = np.unique(delta_pre * size + delta_post)
+    keep = ~np.isin(pre.astype(np.int64) * size + post, touched)
+
+    # 변경/추가 시냅스는 합쳐진 가중치 하나로 추가
+    written = delta.op != DELTA_REMOVED
+    pre = np.concatenate([pre[keep], delta_pre[written]])
+
+    # 발화 뉴런: 출력 시냅스가 모두 제거된 뉴런은 빠지고, 새로 출력 시냅스가 생긴 뉴런은 들어감
+    if delta.source_names is not None:
+        source_names = delta.source_names
+    else:
+        source_names = [neuron_names[i] for i in np.unique(pre)]
+
+    metadata = dict(base.metadata)
+    metadata['delta'] = delta.metadata
+    return CompiledConnectome(
+        neuron_names,
+        source_names,
+        pre,
+        np.concatenate([post[keep], delta_post[written]]),
+        np.concatenate([base.weight[keep], delta.new_weights[written]]),
+        np.concatenate([base.kind[keep], np.full(written.sum(), SYNAPSE_MERGED, dtype=np.int8)]),
+        np.concatenate([base.count[keep], np.zeros(written.sum(), dtype=np.int32)]),
+        base.spec,
+        metadata,
+    )
+
+
+def load_variant(base_source, delta_path):
+    """
+    기준 커넥톰을 로드하고 델타를 적용합니다.
+
+    Args:
+        base_source: 가중치 모듈 이름 또는 컴파일된 .npz 경로
+        delta_path: 델타 .npz 경로
+    """
+    return apply_delta(load_connectome(base_source), load_delta(delta_path))
+
+
+# ============================================================
+# 출력
+# ============================================================
+
+def neuron_summary(delta):
+    """
+    뉴런별 변경 요약을 계산합니다.
+
+    Returns:
+        {뉴런 이름: {'out': [변경, 추가, 제거], 'in': [변경, 추가, 제거], 'out_weight': 출력 가중치 변화량}}
+    """
+    summary = {}
+    for op, pre, post, old, new in zip(delta.op, delta.pre_names, delta.post_names,
+                                        delta.old_weights, delta.new_weights):
+        for name, direction in ((pre, 'out'), (post, 'in')):
+            entry = summary.setdefault(name, {'out': [0, 0, 0], 'in': [0, 0, 0], 'out_weight': 0.0})
+            entry[direction][op] += 1
+        summary[pre]['out_weight'] += new - old
+    return summary
+
+
+def print_delta(delta, limit=None):
+    """
+    델타를 구조화된 형식으로 출력합니다.
+
+    Args:
+        delta: ConnectomeDelta
+        limit: 연산 종류별로 출력할 최대 시냅스 수 (None 이면 전부)
+    """
+    print(f"기준: {delta.metadata.get('base')} ({delta.base_fingerprint})  변형: {delta.metadata.get('variant')}")
+    print(f"변경 {delta.count(DELTA_CHANGED)}개, 추가 {delta.count(DELTA_ADDED)}개, "
+          f"제거 {delta.count(DELTA_REMOVED)}개 시냅스")
+
+    for op in (DELTA_CHANGED, DELTA_ADDED, DELTA_REMOVED):
+        indices = np.flatnonzero(delta.op == op)
+        if len(indices) == 0:
+            continue
+        print(f"\n=== {DELTA_OP_NAMES[op]} ({len(indices)}) ===")
+        for i in indices[:limit]:
+            pre, post = delta.pre_names[i], delta.post_names[i]
+            if op == DELTA_CHANGED:
+                print(f"  {pre:>6} → {post:<6} {delta.old_weights[i]:g} → {delta.new_weights[i]:g}")
+            elif op == DELTA_ADDED:
+                print(f"  {pre:>6} → {post:<6} + {delta.new_weights[i]:g}")
+            else:
+                print(f"  {pre:>6} → {post:<6} - {delta.old_weights[i]:g}")
+        if limit is not None and len(indices) > limit:
+            print(f"  ... 외 {len(indices) - limit}개")
+
+    summary = neuron_summary(delta)
+    print(f"\n=== 뉴런별 요약 ({len(summary)}개 뉴런) ===")
+    print(f"  {'뉴런':<6} {'출력(변경/추가/제거)':>20} {'입력(변경/추가/제거)':>20} {'출력 가중치 변화':>16}")
+    for name in sorted(summary):
+        entry = summary[name]
+        out_text = '/'.join(str(v) for v in entry['out'])
+        in_text = '/'.join(str(v) for v in entry['in'])
+        print(f"  {name:<6} {out_text:>20} {in_text:>20} {entry['out_weight']:>+16g}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="커넥톰 변형 델타 저장 및 비교 도구")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    diff_parser = commands.add_parser('diff', help="두 커넥톰의 차이 출력")
+    diff_parser.add_argument('base', help="기준 (가중치 모듈 이름 또는 .npz)")
+    diff_parser.add_argument('variant', help="변형 (가중치 모듈 이름 또는 .npz)")
+    diff_parser.add_argument('--limit', type=int, default=None, help="종류별 최대 출력 시냅스 수")
+
+    make_parser = commands.add_parser('make', help="델타 파일 생성")
+    make_parser.add_argument('base')
+    make_parser.add_argument('variant')
+    make_parser.add_argument('-o', '--output', required=True, help="출력 델타 .npz 파일")
+
+    show_parser = commands.add_parser('show', help="델타 파일 내용 출력")
+    show_parser.add_argument('delta')
+    show_parser.add_argument('--limit', type=int, default=None)
+
+    apply_parser = commands.add_parser('apply', help="델타를 적용한 컴파일된 커넥톰 저장")
+    apply_parser.add_argument('base')
+    apply_parser.add_argument('delta')
+    apply_parser.add_argument('-o', '--output', required=True, help="출력 .npz 파일")
+
+    args = parser.parse_args()
+
+    if args.command == 'diff':
+        print_delta(diff_connectomes(load_connectome(args.base), load_connectome(args.variant)), args.limit)
+    elif args.command == 'make':
+        delta = diff_connectomes(load_connectome(args.base), load_connectome(args.variant))
+        delta.save(args.output)
+        print(f"{len(delta)}개 시냅스 델타 → '{args.output}' 저장 완료")
+    elif args.command == 'show':
+        print_delta(load_delta(args.delta), args.limit)
+    elif args.command == 'apply':
+        variant = load_variant(args.base, args.delta)
+        variant.save(args.output)
+        print(f"'{args.output}' 저장 완료 ({variant.size}개 뉴런, {len(variant.data)}개 연결)")
+
+
+if __name__ == '__main__':
+    main()
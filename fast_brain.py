@@ -0,0 +1,272 @@
+# ============================================================
+# fast_brain.py - 배열 기반 AdEx 신경망 엔진
+# ============================================================
+#
+# brain.py 의 Brain 과 같은 AdEx 모델을 numpy 배열로 계산합니다.
+# 뉴런별 파이썬 루프 대신 전체 뉴런을 한 번에 갱신하므로
+# 커넥톰 크기와 관계없이 빠르게 동작합니다.
+#
+# 커넥톰 데이터(CompiledConnectome)는 connectome.py 에서 로드하며,
+# 뉴런 목록/근육 분류/감각 그룹을 코드 수정 없이 교체할 수 있습니다.
+# ============================================================
+
+import random
+
+import numpy as np
+
+from connectome import load_connectome
+
+
+class PostSynapticView:
+    """
+    Brain.PostSynaptic 딕셔너리와 같은 방식으로 접근하기 위한 뷰
+
+    view['AFDL'][brain.NextSignalIntensityIndex] += 10 처럼 사용하면
+    FastBrain 의 상태 배열이 직접 수정됩니다.
+    """
+
+    def __init__(self, brain):
+        self._brain = brain
+
+    def __getitem__(self, name):
+        # (2,) 크기의 numpy 뷰: [current_signal, next_signal]
+        return self._brain.SignalIntensity[:, self._brain.connectome.index[name]]
+
+    def __contains__(self, name):
+        return name in self._brain.connectome.index
+
+    def __iter__(self):
+        return iter(self._brain.connectome.neuron_names)
+
+    def __len__(self):
+        return self._brain.connectome.size
+
+    def keys(self):
+        return list(self._brain.connectome.neuron_names)
+
+
+class FastBrain:
+    """
+    배열 기반 C. elegans 신경망 (AdEx 모델)
+
+    Brain 과 같은 공개 속성/메서드를 제공하므로 main.py 에서 그대로 교체할 수 있습니다.
+
+    속성:
+        connectome: CompiledConnectome (여러 FastBrain 이 공유하는 불변 데이터)
+        SignalIntensity: (2, N) 신호 강도 배열 (double buffering)
+        AdaptationCurrent: (N,) 적응 전류 배열
+        PostSynaptic: 이름으로 접근하는 신호 강도 뷰
+    """
+
+    def __init__(self, connectome=None):
+        """
+        Args:
+            connectome: CompiledConnectome (None 이면 기본 데이터 파일에서 로드)
+        """
+        self.connectome = connectome if connectome is not None else load_connectome()
+
+        # Double buffering 인덱스
+        self.CurrentSignalIntensityIndex = 0
+        self.NextSignalIntensityIndex = 1
+
+        # 뉴런 발화 임계값
+        self.FireThreshold = 30
+
+        # === AdEx 모델 파라미터 (Brain 과 동일) ===
+        self.C_m = 200.0
+        self.g_L = 10.0
+        self.E_L = 0.0
+        self.V_reset = 0.0
+        self.V_T = 20.0
+        self.delta_T = 2.0
+        self.tau_w = 30.0
+        self.a = 2.0
+        self.b = 5.0
+        self.tau_m = self.C_m / self.g_L
+        self.dt = 1.0
+        self.Vth = 30.0
+
+        # 좌우 근육 신호 누적
+        self.AccumulatedLeftMusclesSignal = 0
+        self.AccumulatedRightMusclesSignal = 0
+
+        # 감각 뉴런 자극 플래그
+        self.IsStimulatedHungerNeurons = True
+        self.IsStimulatedNoseTouchNeurons = True
+        self.IsStimulatedFoodSenseNeurons = True
+        self.FoodSenseIntensity = 1.0  # 먹이 감각 자극 세기 (냄새 농도에 따라 main.py 에서 설정)
+
+        # 상태 배열
+        size = self.connectome.size
+        self.SignalIntensity = np.zeros((2, size), dtype=np.float64)
+        self.AdaptationCurrent = np.zeros(size, dtype=np.float64)
+        self.PostSynaptic = PostSynapticView(self)
+
+        # 근육 카테고리 (readout 명세에서 로드)
+        self.MusclesCategory = list(self.connectome.spec.get('muscle_prefixes', []))
+
+        # 감각 그룹별 자극 벡터 (미리 계산)
+        self._stimulus_vectors = {
+            group: self.connectome.stimulus_vector(names)
+            for group, names in self.connectome.spec.get('sensory_groups', {}).items()
+        }
+
+        self._left_muscles = self.connectome.readout_groups.get('left', np.zeros(0, dtype=np.int32))
+        self._right_muscles = self.connectome.readout_groups.get('right', np.zeros(0, dtype=np.int32))
+        self._can_fire = ~self.connectome.is_muscle
+
+    def fork(self):
+        """
+        현재 상태에서 분기한 새 FastBrain 을 만듭니다.
+
+        커넥톰과 미리 계산한 자극 벡터 등 불변 데이터는 공유하고,
+        변하는 상태 배열(SignalIntensity, AdaptationCurrent)만 복사합니다.
+        (딕셔너리 기반 Brain 을 deepcopy 하는 것보다 훨씬 적은 객체만 생성)
+
+        Returns:
+            FastBrain: 같은 상태를 가진 독립적인 신경망
+        """
+        branch = object.__new__(FastBrain)
+        branch.__dict__.update(self.__dict__)
+        branch.SignalIntensity = self.SignalIntensity.copy()
+        branch.AdaptationCurrent = self.AdaptationCurrent.copy()
+        branch.PostSynaptic = PostSynapticView(branch)
+        return branch
+
+    # ========================================
+    # 신경망 시뮬레이션 메서드
+    # ========================================
+
+    def setup(self):
+        """모든 뉴런의 신호 강도와 적응 전류를 0으로 초기화합니다."""
+        self.SignalIntensity.fill(0.0)
+        self.AdaptationCurrent.fill(0.0)
+
+    def signal_indensity_accumulate(self, PreSynapticName: str):
+        """
+        시냅스 전 뉴런에 연결된 모든 뉴런의 다음 신호 강도에 가중치를 누적합니다.
+
+        Args:
+            PreSynapticName: 신호를 발생시키는 뉴런 이름
+        """
+        if PreSynapticName not in self.connectome.index:
+            return
+        targets, weights = self.connectome.row(PreSynapticName)
+        np.add.at(self.SignalIntensity[self.NextSignalIntensityIndex], targets, weights)
+
+    def stimulate_group(self, group, scale=1.0):
+        """
+        readout 명세의 감각 그룹 전체를 한 번에 자극합니다.
+
+        Args:
+            group: 감각 그룹 이름 ('hunger', 'nose_touch', 'food_sense', ...)
+            scale: 자극 세기 배율
+        """
+        vector = self._stimulus_vectors.get(group)
+        if vector is not None:
+            self.SignalIntensity[self.NextSignalIntensityIndex] += vector * scale
+
+    def RandExcite(self):
+        """무작위로 40개 뉴런을 골라 신경망 초기 활성화를 유도합니다."""
+        neurons = self.connectome.source_names
+        for _ in range(40):
+            self.signal_indensity_accumulate(random.choice(neurons))
+
+    def update(self):
+        """
+        뇌의 신경망을 한 프레임 업데이트합니다.
+
+        활성화된 감각 그룹(배고픔, 코 터치, 먹이 감각)마다 자극 후
+        run_connectome()을 호출합니다. (Brain.update 와 같은 순서)
+        먹이 감각은 FoodSenseIntensity 배율로 자극합니다.
+        """
+        if self.IsStimulatedHungerNeurons:
+            self.stimulate_group('hunger')
+            self.run_connectome()
+
+        if self.IsStimulatedNoseTouchNeurons:
+            self.stimulate_group('nose_touch')
+            self.run_connectome()
+
+        if self.IsStimulatedFoodSenseNeurons:
+            self.stimulate_group('food_sense', self.FoodSenseIntensity)
+            self.run_connectome()
+
+    def run_connectome(self):
+        """
+        AdEx 모델로 전체 뉴런을 한 스텝 갱신합니다. (Brain.run_connectome 의 배열 버전)
+
+        1. 막전위 업데이트 (Leak + Exponential + Input - Adaptation)
+        2. 적응 전류 업데이트
+        3. 임계값 검사 및 발화
+        4. 근육 신호 누적
+        5. 버퍼 스왑
+        """
+        current = self.SignalIntensity[self.CurrentSignalIntensityIndex]
+        following = self.SignalIntensity[self.NextSignalIntensityIndex]
+        w = self.AdaptationCurrent
+
+        # 1단계: 막전위 업데이트
+        V = current
+        exponential_term = np.zeros_like(V)
+        spiking = (V > self.V_T) & (V < self.Vth)
+        if spiking.any():
+            exponent = np.minimum((V[spiking] - self.V_T) / self.delta_T, 10.0)
+            exponential_term[spiking] = self.g_L * self.delta_T * np.exp(exponent)
+        leak_current = -self.g_L * (V - self.E_L)
+        I = following * self.g_L  # following / R_membrance (R = 1 / g_L)
+        current += (leak_current + exponential_term - w + I) / self.C_m * self.dt
+
+        # 2단계: 적응 전류 업데이트
+        w += (self.a * (current - self.E_L) - w) / self.tau_w * self.dt
+
+        # 3단계: 임계값 검사 및 발화
+        fired = self._can_fire & (current > self.Vth)
+        if fired.any():
+            self._fire(fired, following)
+            current[fired] = self.V_reset
+            w[fired] += self.b
+
+        # 4단계: 근육 신호 누적
+        self.accumulate_signal()
+
+        # 5단계: 버퍼 스왑
+        current[:] = following
+        self.CurrentSignalIntensityIndex, self.NextSignalIntensityIndex = \
+            self.NextSignalIntensityIndex, self.CurrentSignalIntensityIndex
+
+    def _fire(self, fired, following):
+        """
+        발화한 뉴런들의 신호를 한 번에 전달합니다.
+
+        Brain 은 뉴런 순서대로 하나씩 발화하면서 "신호 전달 → 자신의 다음 신호 0" 을
+        반복하므로, 발화한 뉴런 j 에는 j 보다 뒤 순서로 발화한 뉴런의 신호만 남습니다.
+        같은 결과를 얻기 위해 발화 뉴런을 대상으로 하는 시냅스는 pre > post 인 것만 더합니다.
+        """
+        c = self.connectome
+        emitters = np.flatnonzero(fired & c.is_emitter)
+        if len(emitters) == 0:
+            return
+
+        # 발화한 뉴런들의 CSR 행을 하나의 시냅스 목록으로 모음
+        starts = c.indptr[emitters]
+        lengths = c.indptr[emitters + 1] - starts
+        edge_ids = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        sources = np.repeat(emitters, lengths)
+        targets = c.indices[edge_ids]
+        weights = c.data[edge_ids]
+
+        emitting = np.zeros(c.size, dtype=bool)
+        emitting[emitters] = True
+        keep = ~emitting[targets] | (sources > targets)
+
+        following[emitters] = 0.0
+        following += np.bincount(targets[keep], weights=weights[keep], minlength=c.size)
+
+    def accumulate_signal(self):
+        """좌/우 근육의 다음 신호 강도를 합산한 뒤 0으로 초기화합니다."""
+        following = self.SignalIntensity[self.NextSignalIntensityIndex]
+        self.AccumulatedLeftMusclesSignal = float(following[self._left_muscles].sum())
+        self.AccumulatedRightMusclesSignal = float(following[self._right_muscles].sum())
+        following[self._left_muscles] = 0.0
+        following[self._right_muscles] = 0.0
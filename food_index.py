@@ -0,0 +1,475 @@
+# ============================================================
+# food_index.py - 먹이 위치 공간 해시 (배열 저장)
+# ============================================================
+#
+# 먹이 위치를 numpy 배열에 저장하고, 일정 크기(cell_size)의 격자 칸 순서로
+# 정렬해 두어 칸 하나의 먹이가 배열의 연속 구간이 되도록 합니다.
+# 먹이가 수십만 개여도 벌레 주변 칸만 배열 연산으로 보면 되므로
+# 가장 가까운 먹이 / 반경 안의 먹이 조회가 먹이 수와 거의 무관합니다.
+#
+# - 정렬 구간 [0, sorted_size): 칸 순서로 정렬된 먹이 (칸 → 구간 사전)
+# - 꼬리 구간 [sorted_size, size): 마지막 정렬 이후 추가된 먹이 (조회 시 한 번에 검사)
+# - 삭제: 배열에서 빼지 않고 alive 표시만 끔 (tombstone, O(1))
+# - 정리(compact): 지워진 먹이나 꼬리 구간이 일정 비율을 넘으면
+#   살아있는 먹이만 모아 다시 칸 순서로 정렬 (전체 배열 연산 한 번)
+#
+# - nearest(x, y, max_distance): 안쪽 칸부터 바깥쪽으로 넓혀 가며 조회,
+#   더 바깥 칸에 더 가까운 먹이가 있을 수 없으면 바로 멈춤
+# - within(x, y, radius): 반경을 덮는 칸만 조회
+# - nearest_many / within_many: 벌레 여러 마리의 조회를 배열 연산 한 번으로 처리
+#   (칸 키를 정렬 배열로도 가지고 있어 searchsorted 로 칸 구간을 한꺼번에 찾음)
+#
+# 먹이 번호는 추가한 순서대로 증가하며 정리 후에도 바뀌지 않습니다.
+# 거리가 같으면 먼저 추가한 먹이를 고릅니다. (기존 리스트를 앞에서부터 훑던 방식과 같은 결과)
+# ============================================================
+
+import math
+
+import numpy as np
+
+# 격자 칸 (cx, cy) 를 정수 하나로 합칠 때 cy 에 더하는 값 (음수 칸 좌표 허용)
+_CELL_KEY_OFFSET = 1 << 31
+
+
+class FoodSpatialHash:
+    """
+    균일 격자 기반 먹이 공간 해시 (배열 저장, tombstone 삭제)
+
+    속성:
+        cell_size: 격자 칸 크기 (픽셀)
+        points: (capacity, 2) 먹이 위치 배열 (앞쪽 size 개만 사용)
+        ids: (capacity,) 먹이 번호
+        tags: (capacity,) 먹이 묶음 번호 (패치 번호 등, 없으면 -1)
+        alive: (capacity,) 삭제되지 않은 먹이 여부
+        size: 사용 중인 배열 칸 수 (지워진 먹이 포함)
+        sorted_size: 격자 칸 순서로 정렬된 앞쪽 구간 길이
+        count: 살아있는 먹이 수
+        compact_ratio: 지워진 먹이 / 꼬리 구간이 전체의 이 비율을 넘으면 정리
+    """
+
+    def __init__(self, cell_size=50, compact_ratio=0.25, min_compact_size=256):
+        """
+        Args:
+            cell_size: 격자 칸 크기 (픽셀, 자주 쓰는 조회 반경과 비슷하게)
+            compact_ratio: 정리 기준 비율
+            min_compact_size: 배열 칸이 이보다 적으면 정리하지 않음 (먹이가 적을 때 잦은 정렬 방지)
+        """
+        self.cell_size = cell_size
+        self.compact_ratio = compact_ratio
+        self.min_compact_size = min_compact_size
+        self._next_id = 0
+        self.clear()
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, food_id):
+        return food_id in self._slots
+
+    def __iter__(self):
+        """먹이 위치 (x, y) 를 추가한 순서대로 반환합니다."""
+        return iter(map(tuple, self.positions_array().tolist()))
+
+    def cell_of(self, x, y):
+        """좌표가 속한 격자 칸"""
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    def position(self, food_id):
+        """먹이 번호의 위치 (x, y) (없는 번호면 KeyError)"""
+        x, y = self.points[self._slots[food_id]].tolist()
+        return x, y
+
+    # ========================================
+    # 추가 / 삭제
+    # ========================================
+
+    def insert(self, x, y, tag=-1):
+        """
+        먹이를 추가합니다.
+
+        Returns:
+            int: 먹이 번호 (삭제할 때 사용)
+        """
+        return int(self.extend(((x, y),), tag)[0])
+
+    def extend(self, positions, tag=-1):
+        """
+        여러 먹이를 한 번에 추가합니다.
+
+        Args:
+            positions: [(x, y), ...] 또는 (N, 2) 배열
+            tag: 먹이 묶음 번호 (정수 하나 또는 먹이별 배열)
+
+        Returns:
+            (N,) 먹이 번호 배열
+        """
+        points = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        n = len(points)
+        start = self.size
+        self._reserve(start + n)
+        ids = np.arange(self._next_id, self._next_id + n, dtype=np.int64)
+        self._next_id += n
+        self.points[start:start + n] = points
+        self.ids[start:start + n] = ids
+        self.tags[start:start + n] = tag
+        self.alive[start:start + n] = True
+        self._slots.update(zip(ids.tolist(), range(start, start + n)))
+        self.size += n
+        self.count += n
+        self._maybe_compact()
+        return ids
+
+    def remove(self, food_id):
+        """먹이를 삭제합니다. (없는 번호면 KeyError)"""
+        slot = self._slots.pop(food_id)
+        self.alive[slot] = False
+        self.count -= 1
+        self._maybe_compact()
+
+    def clear(self):
+        """모든 먹이를 삭제합니다. (먹이 번호는 이어서 증가)"""
+        self.points = np.empty((0, 2), dtype=np.float64)
+        self.ids = np.empty(0, dtype=np.int64)
+        self.tags = np.empty(0, dtype=np.int64)
+        self.alive = np.empty(0, dtype=bool)
+        self.size = 0
+        self.sorted_size = 0
+        self.count = 0
+        self._slots = {}  # 먹이 번호 → 배열 칸
+        self._cells = {}  # 격자 칸 키 → 정렬 구간 (시작, 끝)
+        self._cell_table = (np.empty(0, dtype=np.int64),) * 3  # (정렬된 칸 키, 시작, 끝) - 여러 위치 조회용
+
+    def copy(self):
+        """
+        같은 먹이를 가진 독립적인 해시를 만듭니다. (World.fork 용)
+
+        배열은 ndarray.copy(), 칸/번호 사전은 얕은 복사로 만들어 먹이마다 객체를 복사하는 deepcopy 를 피합니다.
+        (_cell_table 은 compact() 에서 통째로 바뀌기만 하므로 공유)
+
+        Returns:
+            FoodSpatialHash: 같은 상태를 가진 해시
+        """
+        clone = object.__new__(FoodSpatialHash)
+        clone.__dict__.update(self.__dict__)
+        for name in ('points', 'ids', 'tags', 'alive'):
+            setattr(clone, name, getattr(self, name).copy())
+        clone._slots = dict(self._slots)
+        clone._cells = dict(self._cells)
+        return clone
+
+    def _reserve(self, capacity):
+        """배열 용량을 capacity 이상으로 늘립니다. (두 배씩 늘려 추가 비용을 상수 시간으로 유지)"""
+        if capacity <= len(self.alive):
+            return
+        new_capacity = max(capacity, 2 * len(self.alive), 64)
+        for name in ('points', 'ids', 'tags', 'alive'):
+            old = getattr(self, name)
+            grown = np.zeros((new_capacity,) + old.shape[1:], dtype=old.dtype)
+            grown[:self.size] = old[:self.size]
+            setattr(self, name, grown)
+
+    # ========================================
+    # 정리 (compaction)
+    # ========================================
+
+    def _maybe_compact(self):
+        """지워진 먹이나 정렬되지 않은 꼬리 구간이 많아지면 정리합니다."""
+        if self.size < self.min_compact_size:
+            return
+        limit = self.compact_ratio * self.size
+        if self.size - self.count > limit or self.size - self.sorted_size > limit:
+            self.compact()
+
+    def compact(self):
+        """지워진 먹이를 버리고 살아있는 먹이를 격자 칸 순서로 다시 정렬합니다."""
+        live = self._live_slots(0, self.size)
+        keys = self._cell_keys(self.points[live])
+        order = np.argsort(keys, kind='stable')
+        live, keys = live[order], keys[order]
+
+        n = len(live)
+        self.points[:n] = self.points[live]
+        self.ids[:n] = self.ids[live]
+        self.tags[:n] = self.tags[live]
+        self.alive[:n] = True
+        self.alive[n:self.size] = False
+        self.size = self.sorted_size = n
+        self._slots = dict(zip(self.ids[:n].tolist(), range(n)))
+
+        unique_keys, starts = np.unique(keys, return_index=True)
+        ends = np.append(starts[1:], n)
+        self._cells = dict(zip(unique_keys.tolist(), zip(starts.tolist(), ends.tolist())))
+        self._cell_table = (unique_keys, starts.astype(np.int64), ends.astype(np.int64))
+
+    def _cell_keys(self, points):
+        """(N, 2) 위치 → 격자 칸 키 (cx · 2³² + cy + 오프셋)"""
+        cells = np.floor(points / self.cell_size).astype(np.int64)
+        return (cells[:, 0] << 32) + (cells[:, 1] + _CELL_KEY_OFFSET)
+
+    # ========================================
+    # 조회
+    # ========================================
+
+    def nearest(self, x, y, max_distance=None):
+        """
+        가장 가까운 먹이를 찾습니다.
+
+        Args:
+            x, y: 기준 위치
+            max_distance: 최대 거리 (None 이면 제한 없음, 전체 먹이 검사)
+
+        Returns:
+            (먹이 번호, (fx, fy), 거리) 또는 None (범위 안에 먹이가 없음)
+        """
+        if max_distance is None:
+            return self._best(self._live_slots(0, self.size), x, y, math.inf)
+
+        cx, cy = self.cell_of(x, y)
+        size = self.cell_size
+        margin = min(x - cx * size, (cx + 1) * size - x, y - cy * size, (cy + 1) * size - y)
+        max_ring = int(math.ceil(max_distance / size))
+        best = self._best(self._tail_slots(), x, y, max_distance)
+        for ring in range(max_ring + 1):
+            # ring 번째 칸의 먹이는 기준 위치에서 최소 (칸 경계까지 거리 + (ring - 1) * cell_size) 떨어져 있음
+            if best is not None and best[2] < margin + (ring - 1) * size:
+                break
+            slots = self._cell_slots(self._ring_cells(cx, cy, ring))
+            best = self._better(best, self._best(slots, x, y, max_distance))
+        return best
+
+    def within(self, x, y, radius):
+        """
+        반경 안의 먹이를 모두 찾습니다.
+
+        Returns:
+            [(먹이 번호, (fx, fy), 거리), ...] (먹이 번호 순)
+        """
+        slots, distances = self._within_slots(x, y, radius)
+        order = np.argsort(self.ids[slots], kind='stable')
+        slots, distances = slots[order], distances[order]
+        return [(food_id, (fx, fy), distance) for food_id, (fx, fy), distance in zip(
+            self.ids[slots].tolist(), self.points[slots].tolist(), distances.tolist())]
+
+    def points_within(self, x, y, radius):
+        """반경 안의 먹이 위치 (N, 2) 배열 (순서 없음, 화면 갱신처럼 번호가 필요 없을 때)"""
+        slots, _ = self._within_slots(x, y, radius)
+        return self.points[slots]
+
+    def _within_slots(self, x, y, radius):
+        """반경 안 먹이의 배열 칸과 거리"""
+        x0, y0 = self.cell_of(x - radius, y - radius)
+        x1, y1 = self.cell_of(x + radius, y + radius)
+        cells = ((cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1))
+        slots = np.concatenate((self._cell_slots(cells), self._tail_slots()))
+        distances = np.hypot(self.points[slots, 0] - x, self.points[slots, 1] - y)
+        inside = distances <= radius
+        return slots[inside], distances[inside]
+
+    def _best(self, slots, x, y, max_distance):
+        """slots 중 max_distance 안에서 (거리, 먹이 번호) 가 가장 작은 먹이"""
+        if len(slots) == 0:
+            return None
+        distances = np.hypot(self.points[slots, 0] - x, self.points[slots, 1] - y)
+        nearest_distance = distances.min()
+        if nearest_distance > max_distance:
+            return None
+        ties = slots[distances == nearest_distance]
+        slot = ties[np.argmin(self.ids[ties])]
+        fx, fy = self.points[slot].tolist()
+        return int(self.ids[slot]), (fx, fy), float(nearest_distance)
+
+    @staticmethod
+    def _better(a, b):
+        """두 nearest 결과 중 (거리, 먹이 번호) 가 작은 쪽"""
+        if a is None:
+            return b
+        if b is None:
+            return a
+        return b if (b[2], b[0]) < (a[2], a[0]) else a
+
+    def _cell_slots(self, cells):
+        """격자 칸들의 정렬 구간에서 살아있는 먹이의 배열 칸"""
+        ranges = [self._cells.get((cx << 32) + cy + _CELL_KEY_OFFSET) for cx, cy in cells]
+        ranges = [r for r in ranges if r is not None]
+        if not ranges:
+            return np.empty(0, dtype=np.int64)
+        slots = np.concatenate([np.arange(start, end) for start, end in ranges])
+        return slots[self.alive[slots]]
+
+    def _tail_slots(self):
+        """정렬 이후 추가된 꼬리 구간에서 살아있는 먹이의 배열 칸"""
+        return self._live_slots(self.sorted_size, self.size)
+
+    def _live_slots(self, start, end):
+        """배열 칸 [start, end) 중 살아있는 먹이의 배열 칸"""
+        return start + np.flatnonzero(self.alive[start:end])
+
+    @staticmethod
+    def _ring_cells(cx, cy, ring):
+        """(cx, cy) 에서 체비쇼프 거리가 정확히 ring 인 칸들"""
+        if ring == 0:
+            yield cx, cy
+            return
+        for dx in range(-ring, ring + 1):
+            yield cx + dx, cy - ring
+            yield cx + dx, cy + ring
+        for dy in range(-ring + 1, ring):
+            yield cx - ring, cy + dy
+            yield cx + ring, cy + dy
+
+    # ========================================
+    # 여러 위치 한 번에 조회
+    # ========================================
+
+    def nearest_many(self, xs, ys, max_distance):
+        """
+        여러 위치 각각의 가장 가까운 먹이를 한 번에 찾습니다. (위치마다 nearest() 를 부른 것과 같은 결과)
+
+        Args:
+            xs, ys: (Q,) 기준 위치 배열
+            max_distance: 최대 거리
+
+        Returns:
+            (ids, points, distances): (Q,) 먹이 번호 (없으면 -1), (Q, 2) 먹이 위치 (없으면 nan),
+            (Q,) 거리 (없으면 inf)
+        """
+        xs, ys = np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64)
+        n = len(xs)
+        best_distance = np.full(n, np.inf)
+        best_id = np.full(n, -1, dtype=np.int64)
+        best_slot = np.zeros(n, dtype=np.int64)
+        if self.count == 0:
+            return best_id, np.full((n, 2), np.nan), best_distance
+        self._sort_tail()
+
+        cx, cy = self._cells_of(xs, ys)
+        size = self.cell_size
+        margin = np.minimum(np.minimum(xs - cx * size, (cx + 1) * size - xs),
+                            np.minimum(ys - cy * size, (cy + 1) * size - ys))
+        max_ring = int(math.ceil(max_distance / size))
+        for ring in range(max_ring + 1):
+            # nearest() 와 같은 조기 종료: 더 바깥 칸에 더 가까운 먹이가 있을 수 없는 위치는 제외
+            active = np.flatnonzero(~(best_distance < margin + (ring - 1) * size))
+            if len(active) == 0:
+                break
+            queries, slots = self._pairs_in_cells(active, cx[active], cy[active], _ring_offsets(ring))
+            distances = np.hypot(self.points[slots, 0] - xs[queries], self.points[slots, 1] - ys[queries])
+            inside = distances <= max_distance
+            queries, slots, distances = queries[inside], slots[inside], distances[inside]
+            if len(queries) == 0:
+                continue
+
+            # 위치별 구간(queries 는 위치 번호 순)에서 (거리, 먹이 번호) 가 가장 작은 후보
+            starts = np.flatnonzero(np.r_[True, queries[1:] != queries[:-1]])
+            nearest = np.minimum.reduceat(distances, starts)
+            ids = self.ids[slots]
+            tied = distances == np.repeat(nearest, np.diff(np.r_[starts, len(queries)]))
+            nearest_id = np.minimum.reduceat(np.where(tied, ids, np.iinfo(np.int64).max), starts)
+            queries = queries[starts]
+
+            better = (nearest < best_distance[queries]) | (
+                (nearest == best_distance[queries]) & (nearest_id < best_id[queries]))
+            queries = queries[better]
+            best_distance[queries] = nearest[better]
+            best_id[queries] = nearest_id[better]
+            best_slot[queries] = self._slots_of(nearest_id[better])
+
+        found = best_id >= 0
+        points = np.full((n, 2), np.nan)
+        points[found] = self.points[best_slot[found]]
+        return best_id, points, best_distance
+
+    def within_many(self, xs, ys, radius):
+        """
+        여러 위치 각각의 반경 안 먹이를 한 번에 찾습니다.
+
+        Returns:
+            (queries, ids, distances): 위치 번호, 먹이 번호, 거리 배열 (위치 번호 → 먹이 번호 순)
+        """
+        xs, ys = np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64)
+        self._sort_tail()
+        cx, cy = self._cells_of(xs, ys)
+        reach = int(math.ceil(radius / self.cell_size))
+        offsets = np.array([(dx, dy) for dx in range(-reach, reach + 1) for dy in range(-reach, reach + 1)],
+                           dtype=np.int64)
+        # 반경을 덮는 사각형과 겹치는 칸만 조회
+        size = self.cell_size
+        near_x = ((cx[:, None] + offsets[:, 0] + 1) * size > (xs - radius)[:, None]) & (
+            (cx[:, None] + offsets[:, 0]) * size <= (xs + radius)[:, None])
+        near_y = ((cy[:, None] + offsets[:, 1] + 1) * size > (ys - radius)[:, None]) & (
+            (cy[:, None] + offsets[:, 1]) * size <= (ys + radius)[:, None])
+        queries, slots = self._pairs_in_cells(np.arange(len(xs)), cx, cy, offsets, near_x & near_y)
+        distances = np.hypot(self.points[slots, 0] - xs[queries], self.points[slots, 1] - ys[queries])
+        inside = distances <= radius
+        queries, ids, distances = queries[inside], self.ids[slots[inside]], distances[inside]
+        order = np.lexsort((ids, queries))
+        return queries[order], ids[order], distances[order]
+
+    def _sort_tail(self):
+        """여러 위치 조회 전에 꼬리 구간을 정렬 구간에 합칩니다. (꼬리를 위치마다 검사하지 않도록)"""
+        if self.sorted_size < self.size:
+            self.compact()
+
+    def _cells_of(self, xs, ys):
+        """(Q,) 위치 배열이 속한 격자 칸 (cx, cy) 배열"""
+        return (np.floor(xs / self.cell_size).astype(np.int64),
+                np.floor(ys / self.cell_size).astype(np.int64))
+
+    def _slots_of(self, ids):
+        """먹이 번호 배열 → 배열 칸 배열"""
+        return np.fromiter((self._slots[food_id] for food_id in ids.tolist()), dtype=np.int64, count=len(ids))
+
+    def _pairs_in_cells(self, queries, cx, cy, offsets, mask=None):
+        """
+        위치마다 (cx, cy) + offsets 칸에 있는 살아있는 먹이를 (위치 번호, 배열 칸) 쌍으로 모읍니다.
+
+        Args:
+            queries: (Q,) 위치 번호
+            cx, cy: (Q,) 위치의 격자 칸
+            offsets: (K, 2) 조회할 칸의 상대 위치
+            mask: (Q, K) 조회할 칸 (None 이면 모두)
+        """
+        table_keys, table_starts, table_ends = self._cell_table
+        keys = (((cx[:, None] + offsets[:, 0]) << 32) + (cy[:, None] + offsets[:, 1] + _CELL_KEY_OFFSET)).ravel()
+        if len(table_keys) == 0 or len(keys) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        found = np.minimum(np.searchsorted(table_keys, keys), len(table_keys) - 1)
+        hit = table_keys[found] == keys
+        if mask is not None:
+            hit &= mask.ravel()
+        starts = table_starts[found[hit]]
+        lengths = table_ends[found[hit]] - starts
+        owners = np.repeat(queries, len(offsets))[hit]
+
+        slots = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        owners = np.repeat(owners, lengths)
+        alive = self.alive[slots]
+        return owners[alive], slots[alive]
+
+    # ========================================
+    # 배열로 내보내기
+    # ========================================
+
+    def _ordered_slots(self):
+        """살아있는 먹이의 배열 칸 (먹이 번호 순)"""
+        slots = self._live_slots(0, self.size)
+        return slots[np.argsort(self.ids[slots])]
+
+    def positions_array(self):
+        """(N, 2) 먹이 위치 배열 (추가한 순서)"""
+        return self.points[self._ordered_slots()]
+
+    def tags_array(self):
+        """(N,) 먹이 묶음 번호 배열 (positions_array() 와 같은 순서)"""
+        return self.tags[self._ordered_slots()]
+
+    def tag_counts(self, length):
+        """묶음 번호 0 ~ length-1 별 살아있는 먹이 수"""
+        tags = self.tags[self._live_slots(0, self.size)]
+        return np.bincount(tags[tags >= 0], minlength=length)[:length]
+
+
+def _ring_offsets(ring):
+    """체비쇼프 거리가 정확히 ring 인 칸의 상대 위치 (K, 2) 배열"""
+    cells = list(FoodSpatialHash._ring_cells(0, 0, ring))
+    return np.array(cells, dtype=np.int64).reshape(-1, 2)
@@ -0,0 +1,77 @@
+# ============================================================
+# food_overlay.py - 먹이 화면 레이어
+# ============================================================
+#
+# 먹이 원을 매 프레임 하나씩 그리면 먹이가 수만 개일 때 프레임마다 수백 ms 가 걸립니다.
+# 먹이를 투명한 서피스 한 장에 그려 두고, 먹이가 바뀐 곳만 다시 그립니다.
+#
+# - 먹이 원은 미리 그려 둔 스탬프 서피스를 blits() 로 한 번에 찍음
+#   (알파 채널 대신 컬러키를 써서 픽셀 혼합 계산 없이 복사만 함)
+# - add_points(points): 새 먹이 위치마다 스탬프를 찍음
+# - remove(x, y): 그 먹이의 사각 영역을 지우고, 영역에 걸친 다른 먹이만 다시 찍음
+# - rebuild(): 대량 배치 / 불러오기 후 전체를 다시 그림
+# - draw(screen): 서피스 한 장 blit
+# ============================================================
+
+import numpy as np
+import pygame
+
+# 투명으로 처리할 색 (먹이 색과 달라야 함)
+COLOR_KEY = (0, 0, 0)
+
+
+class FoodOverlay:
+    """
+    먹이 레이어 서피스
+
+    속성:
+        store: 먹이 위치를 가진 FoodSpatialHash
+        radius: 먹이 원 반지름 (픽셀)
+        color: 먹이 색
+        surface: (width, height) 서피스 (COLOR_KEY 픽셀은 투명)
+    """
+
+    def __init__(self, store, width, height, radius=10, color=(251, 192, 45)):
+        self.store = store
+        self.radius = radius
+        self.color = color
+        self.surface = pygame.Surface((width, height))
+        self.surface.set_colorkey(COLOR_KEY)
+
+        # 먹이 원 스탬프 (중심 (radius, radius) 에 그린 원 = 정수 위치에 직접 그린 원과 같은 픽셀)
+        self._stamp = pygame.Surface((2 * radius + 1, 2 * radius + 1))
+        self._stamp.fill(COLOR_KEY)
+        pygame.draw.circle(self._stamp, color, (radius, radius), radius)
+        self._stamp.set_colorkey(COLOR_KEY, pygame.RLEACCEL)
+        self.rebuild()
+
+    def rebuild(self):
+        """모든 먹이를 다시 그립니다."""
+        self.surface.fill(COLOR_KEY)
+        self.add_points(self.store.positions_array())
+
+    def remove(self, x, y):
+        """
+        (x, y) 의 먹이를 지웁니다. (store 에서 먼저 삭제한 뒤 호출)
+
+        지운 사각 영역에 걸친 이웃 먹이는 영역 안만 다시 그립니다.
+        """
+        r = self.radius
+        x, y = int(round(x)), int(round(y))
+        area = pygame.Rect(x - r, y - r, 2 * r + 1, 2 * r + 1)
+        self.surface.fill(COLOR_KEY, area)
+        self.surface.set_clip(area)
+        # 스탬프가 사각 영역과 겹치는 먹이: 가로/세로 거리 2r 이내 (반올림 여유 포함)
+        self.add_points(self.store.points_within(x, y, (2 * r + 1) * 1.5))
+        self.surface.set_clip(None)
+
+    def add_points(self, points):
+        """(N, 2) 먹이 위치마다 원을 그립니다."""
+        if len(points) == 0:
+            return
+        corners = np.round(np.asarray(points, dtype=np.float64)).astype(np.int64) - self.radius
+        self.surface.blits([(self._stamp, corner) for corner in map(tuple, corners.tolist())], doreturn=False)
+
+    def draw(self, screen):
+        """레이어를 화면에 그립니다."""
+        screen.blit(self.surface, (0, 0))
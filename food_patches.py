@@ -0,0 +1,179 @@
+# ============================================================
+# food_patches.py - 먹이 패치 대량 배치 / 재성장
+# ============================================================
+#
+# 먹이를 한 번에 수천 ~ 수십만 개씩 배치합니다. (위치는 (N, 2) 배열로 한 번에 생성)
+#
+# - gaussian: 중심 주변에 가우시안 분포로 뭉친 먹이 패치
+# - lawn:     사각형 영역에 고르게 깔린 먹이 (박테리아 잔디)
+#
+# 패치 정의는 (종류, 파라미터 사전) 이며, 같은 seed 면 항상 같은 위치가 만들어집니다.
+# FoodRegrowth 는 먹혀서 줄어든 패치를 원래 개수(capacity)까지 다시 채웁니다.
+#   매 초 부족한 먹이의 regrowth_rate 비율만큼 (푸아송 분포) 새로 생성
+#
+# 예:
+#   FOOD_PATCHES = [('gaussian', {'x': 200, 'y': 300, 'sigma': 40, 'count': 500}),
+#                   ('lawn', {'x0': 400, 'y0': 100, 'x1': 650, 'y1': 600, 'count': 100000})]
+# ============================================================
+
+import numpy as np
+
+PATCH_GAUSSIAN = 'gaussian'
+PATCH_LAWN = 'lawn'
+
+
+def gaussian_patch(rng, x, y, sigma, count, bounds=None):
+    """
+    (x, y) 주변에 표준편차 sigma(픽셀)로 뭉친 먹이 위치를 만듭니다.
+
+    Args:
+        rng: numpy Generator
+        x, y: 패치 중심
+        sigma: 퍼진 정도 (픽셀)
+        count: 먹이 수
+        bounds: (x0, y0, x1, y1) 영역 (밖으로 나간 위치는 가장자리로 자름, None 이면 자르지 않음)
+
+    Returns:
+        (count, 2) 위치 배열
+    """
+    points = rng.normal((x, y), sigma, (int(count), 2))
+    if bounds is not None:
+        x0, y0, x1, y1 = bounds
+        np.clip(points, (x0, y0), (x1, y1), out=points)
+    return points
+
+
+def uniform_lawn(rng, x0, y0, x1, y1, count, bounds=None):
+    """
+    사각형 (x0, y0) ~ (x1, y1) 에 고르게 깔린 먹이 위치를 만듭니다.
+
+    Returns:
+        (count, 2) 위치 배열
+    """
+    points = rng.uniform((x0, y0), (x1, y1), (int(count), 2))
+    if bounds is not None:
+        bx0, by0, bx1, by1 = bounds
+        np.clip(points, (bx0, by0), (bx1, by1), out=points)
+    return points
+
+
+# 이름 → 생성기
+PATCH_GENERATORS = {
+    PATCH_GAUSSIAN: gaussian_patch,
+    PATCH_LAWN: uniform_lawn,
+}
+
+
+def generate_patch(rng, kind, params, count=None, bounds=None):
+    """
+    패치 정의로 먹이 위치를 만듭니다.
+
+    Args:
+        rng: numpy Generator
+        kind: 'gaussian' / 'lawn'
+        params: 생성기 파라미터 사전 (count 포함)
+        count: None 이 아니면 params['count'] 대신 이 개수만 생성 (재성장용)
+        bounds: 위치 제한 영역
+
+    Raises:
+        ValueError: 알 수 없는 패치 종류
+    """
+    generator = PATCH_GENERATORS.get(kind)
+    if generator is None:
+        raise ValueError(f"알 수 없는 먹이 패치: {kind} (가능: {', '.join(PATCH_GENERATORS)})")
+    options = dict(params)
+    if count is not None:
+        options['count'] = count
+    return generator(rng, bounds=bounds, **options)
+
+
+class FoodRegrowth:
+    """
+    먹이 패치 배치와 재성장
+
+    패치 번호(0, 1, ...)를 먹이 묶음 번호(tag)로 저장해 두고, 패치별로 남은 먹이를 세어
+    원래 개수보다 부족하면 부족분에 비례해 새 먹이를 만듭니다.
+
+    속성:
+        patches: [(종류, 파라미터), ...]
+        capacity: (패치 수,) 패치별 원래 먹이 수
+        regrowth_rate: 초당 부족분 대비 재성장 비율 (0 이면 재성장 없음)
+        interval: 재성장 계산 간격 (초)
+        rng: numpy Generator (seed 로 재현 가능)
+    """
+
+    def __init__(self, patches, regrowth_rate=0.05, interval=1.0, seed=0, bounds=None):
+        """
+        Args:
+            patches: [(종류, 파라미터 사전), ...]
+            regrowth_rate: 재성장 비율 (1/초)
+            interval: 재성장 계산 간격 (초) - 남은 먹이 수를 셀 때 전체 배열을 한 번 훑음
+            seed: 난수 시드
+            bounds: (x0, y0, x1, y1) 먹이 배치 영역
+        """
+        self.patches = [(kind, dict(params)) for kind, params in patches]
+        self.capacity = np.array([int(params['count']) for _, params in self.patches], dtype=np.int64)
+        self.regrowth_rate = regrowth_rate
+        self.interval = interval
+        self.bounds = bounds
+        self.rng = np.random.default_rng(seed)
+        self._accumulated_time = 0.0
+
+    def place_all(self, add_points):
+        """
+        모든 패치를 원래 개수만큼 배치합니다.
+
+        Args:
+            add_points: 위치 배열과 묶음 번호를 받아 먹이를 추가하는 함수 (points, tag)
+
+        Returns:
+            int: 배치한 먹이 수
+        """
+        total = 0
+        for tag, (kind, params) in enumerate(self.patches):
+            points = generate_patch(self.rng, kind, params, bounds=self.bounds)
+            add_points(points, tag)
+            total += len(points)
+        return total
+
+    def advance(self, elapsed, store, add_points):
+        """
+        경과 시간만큼 재성장을 계산합니다. (interval 마다 한 번)
+
+        Args:
+            elapsed: 경과 시간 (초)
+            store: 남은 먹이 수를 셀 FoodSpatialHash
+            add_points: 새 먹이를 추가하는 함수 (points, tag)
+
+        Returns:
+            int: 새로 만든 먹이 수
+        """
+        if self.regrowth_rate <= 0 or not self.patches:
+            return 0
+        self._accumulated_time += elapsed
+        if self._accumulated_time < self.interval:
+            return 0
+        period, self._accumulated_time = self._accumulated_time, 0.0
+
+        missing = np.maximum(self.capacity - store.tag_counts(len(self.patches)), 0)
+        expected = missing * min(self.regrowth_rate * period, 1.0)
+        counts = np.minimum(self.rng.poisson(expected), missing)
+        total = 0
+        for tag in np.flatnonzero(counts):
+            kind, params = self.patches[tag]
+            add_points(generate_patch(self.rng, kind, params, int(counts[tag]), self.bounds), int(tag))
+            total += int(counts[tag])
+        return total
+
+    # ========================================
+    # 체크포인트
+    # ========================================
+
+    def get_state(self):
+        """JSON 으로 저장할 수 있는 재성장 상태 (난수 상태 포함)"""
+        return {'rng': self.rng.bit_generator.state, 'accumulated_time': self._accumulated_time}
+
+    def set_state(self, state):
+        """get_state() 로 저장한 상태를 복원합니다."""
+        self.rng.bit_generator.state = state['rng']
+        self._accumulated_time = state['accumulated_time']
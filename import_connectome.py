@@ -0,0 +1,188 @@
+# ============================================================
+# import_connectome.py - 엑셀 원본에서 컴파일된 커넥톰 생성
+# ============================================================
+#
+# old file/CElegansNeuronTables.xlsx 를 읽어 컴파일된 바이너리 커넥톰(.npz)을
+# 바로 생성합니다. (constants_*.py 파이썬 모듈을 거치지 않음)
+#
+# 시트 구성:
+# - Connectome: Origin, Target, Type(Send/GapJunction), Number of Connections, Neurotransmitter
+# - NeuronsToMuscle: Neuron, Muscle, Number of Connections, Neurotransmitter
+#
+# 가중치 공식 (data memo.txt 참고):
+#   가중치 = SEND 연결 수 + GapJunction 연결 수 * gap_factor
+#   gap_factor = 1.0 → constants_default.py 와 같은 값
+#   gap_factor = 0.3 → constants_chem_sensitive.py 와 같은 값
+#
+# 시냅스 종류(화학/전기)와 연결 수는 컴파일 결과에 그대로 보존됩니다.
+# 발화 뉴런 순서는 constants_default.py / constants_chem_sensitive.py 테이블과 같은
+# 이름순으로 맞춥니다. (같은 시드에서 RandExcite 가 같은 뉴런을 고르도록)
+# 입력 파일이 바뀌지 않았으면 다시 만들지 않습니다. (증분 빌드)
+#
+# 사용법:
+#   python import_connectome.py                       # connectome_default.npz 생성
+#   python import_connectome.py --gap-factor 0.3 -o connectome_chem_sensitive.npz
+# ============================================================
+
+import argparse
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from connectome import (
+    BASE_DIR,
+    DEFAULT_NEURON_LIST_FILE,
+    DEFAULT_READOUT_SPEC_FILE,
+    SYNAPSE_CHEMICAL,
+    SYNAPSE_GAP,
+    compile_edges,
+    load_readout_spec,
+    read_neuron_list,
+)
+
+DEFAULT_XLSX_FILE = os.path.join(BASE_DIR, 'old file', 'CElegansNeuronTables.xlsx')
+DEFAULT_OUTPUT_FILE = os.path.join(BASE_DIR, 'connectome_default.npz')
+
+# 엑셀의 Type 열 값 → 시냅스 종류
+SYNAPSE_TYPES = {
+    'Send': SYNAPSE_CHEMICAL,
+    'GapJunction': SYNAPSE_GAP,
+}
+
+
+def read_xlsx_edges(xlsx_path=DEFAULT_XLSX_FILE, gap_factor=1.0):
+    """
+    엑셀 파일에서 시냅스 목록을 읽습니다.
+
+    Args:
+        xlsx_path: CElegansNeuronTables.xlsx 경로
+        gap_factor: GapJunction 연결 수에 곱할 가중치 배율
+
+    Returns:
+        [(pre, post, weight, kind, count), ...]
+
+    Raises:
+        ValueError: 알 수 없는 시냅스 종류가 있는 경우
+    """
+    try:
+        import openpyxl
+    except ImportError as e:
+        raise ImportError("엑셀 파일을 읽으려면 openpyxl 패키지가 필요합니다: pip install openpyxl") from e
+
+    workbook = openpyxl.load_workbook(xlsx_path, read_only=True, data_only=True)
+    try:
+        edges = []
+
+        # 뉴런 → 뉴런 연결 (화학 시냅스 / 전기 시냅스)
+        rows = workbook['Connectome'].iter_rows(min_row=2, values_only=True)
+        for row in rows:
+            if not row or row[0] is None:
+                continue
+            origin, target, synapse_type, count = row[0], row[1], row[2], row[3]
+            if synapse_type not in SYNAPSE_TYPES:
+                raise ValueError(f"알 수 없는 시냅스 종류: {synapse_type!r} ({origin} → {target})")
+            kind = SYNAPSE_TYPES[synapse_type]
+            factor = gap_factor if kind == SYNAPSE_GAP else 1.0
+            edges.append((str(origin).strip(), str(target).strip(), count * factor, kind, int(count)))
+
+        # 뉴런 → 근육 연결 (화학 시냅스)
+        rows = workbook['NeuronsToMuscle'].iter_rows(min_row=2, values_only=True)
+        for row in rows:
+            if not row or row[0] is None:
+                continue
+            neuron, muscle, count = row[0], row[1], row[2]
+            edges.append((str(neuron).strip(), str(muscle).strip(), float(count), SYNAPSE_CHEMICAL, int(count)))
+    finally:
+        workbook.close()
+
+    return edges
+
+
+def input_digest(xlsx_path, neuron_list_path, readout_spec_path, gap_factor):
+    """입력 파일 내용과 옵션으로 다이제스트(SHA-256)를 계산합니다."""
+    digest = hashlib.sha256()
+    for path in (xlsx_path, neuron_list_path, readout_spec_path):
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    digest.update(repr(float(gap_factor)).encode())
+    return digest.hexdigest()
+
+
+def read_output_metadata(output_path):
+    """기존 출력 파일의 메타데이터를 읽습니다. (없거나 읽을 수 없으면 None)"""
+    if not os.path.exists(output_path):
+        return None
+    try:
+        with np.load(output_path, allow_pickle=False) as archive:
+            return json.loads(str(archive['metadata_json']))
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def import_connectome(xlsx_path=DEFAULT_XLSX_FILE, output_path=DEFAULT_OUTPUT_FILE, gap_factor=1.0,
+                      neuron_list_path=DEFAULT_NEURON_LIST_FILE, readout_spec_path=DEFAULT_READOUT_SPEC_FILE,
+                      force=False):
+    """
+    엑셀 파일을 컴파일된 커넥톰으로 변환합니다. 입력이 바뀌지 않았으면 건너뜁니다.
+
+    Args:
+        xlsx_path: 원본 엑셀 파일 경로
+        output_path: 출력 .npz 파일 경로
+        gap_factor: GapJunction 가중치 배율
+        neuron_list_path: 뉴런 목록 파일 경로
+        readout_spec_path: readout 명세 파일 경로
+        force: True 면 입력이 같아도 다시 생성
+
+    Returns:
+        bool: 새로 생성했으면 True, 최신 상태라 건너뛰었으면 False
+    """
+    digest = input_digest(xlsx_path, neuron_list_path, readout_spec_path, gap_factor)
+    existing = read_output_metadata(output_path)
+    if not force and existing is not None and existing.get('input_digest') == digest:
+        return False
+
+    edges = read_xlsx_edges(xlsx_path, gap_factor)
+    # 엑셀의 등장 순서 대신 constants_*.py 가중치 테이블과 같은 이름순 (compile_connectome 의 source_names 와 일치)
+    source_names = sorted({pre for pre, _post, _weight, _kind, _count in edges})
+    compiled = compile_edges(
+        edges,
+        read_neuron_list(neuron_list_path),
+        load_readout_spec(readout_spec_path),
+        source_names=source_names,
+        metadata={
+            'source': os.path.basename(xlsx_path),
+            'gap_factor': gap_factor,
+            'input_digest': digest,
+        },
+    )
+
+    # 쓰는 도중 중단되어도 기존 파일이 깨지지 않도록 임시 파일에 쓴 뒤 교체
+    temp_path = output_path + '.tmp'
+    compiled.save(temp_path)
+    os.replace(temp_path, output_path)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CElegansNeuronTables.xlsx → 컴파일된 커넥톰(.npz)")
+    parser.add_argument('xlsx', nargs='?', default=DEFAULT_XLSX_FILE, help="원본 엑셀 파일")
+    parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT_FILE, help="출력 .npz 파일")
+    parser.add_argument('--gap-factor', type=float, default=1.0, help="GapJunction 가중치 배율 (화학 민감형: 0.3)")
+    parser.add_argument('--neuron-list', default=DEFAULT_NEURON_LIST_FILE, help="뉴런 목록 파일")
+    parser.add_argument('--readout-spec', default=DEFAULT_READOUT_SPEC_FILE, help="readout 명세 파일")
+    parser.add_argument('--force', action='store_true', help="입력이 바뀌지 않아도 다시 생성")
+    args = parser.parse_args()
+
+    built = import_connectome(args.xlsx, args.output, args.gap_factor,
+                              args.neuron_list, args.readout_spec, args.force)
+    if built:
+        print(f"커넥톰 생성 완료: '{args.output}'")
+    else:
+        print(f"'{args.output}' 은(는) 최신 상태입니다. (다시 생성하려면 --force)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+# ============================================================
+# input_journal.py - 사용자 입력 기록 (재현 / 화면 없는 재생용)
+# ============================================================
+#
+# 실행 중 시뮬레이션 상태를 바꾸는 사용자 입력(먹이 클릭, 온도 브러쉬, 선호 온도,
+# 온도 지형 / 환경 / 체크포인트 불러오기, 분기, 시간 조작)을 시뮬레이션 스텝 번호와
+# 함께 한 줄씩 덧붙여 기록합니다. 시뮬레이션은 고정 스텝으로 진행하므로
+# 같은 난수 시드에서 같은 스텝에 같은 입력을 적용하면 결과가 비트 단위로 같습니다.
+#
+# 파일 형식 (JSON Lines, 한 줄에 하나):
+#   첫 줄: {"format": 1, "seeds": {...}, "config": {...}}   - 난수 시드와 시작 설정
+#   이후:  [스텝 번호, 시뮬레이션 시각(초), 종류, 인자...]  - 예: [1520, 25.333, "food", 210, 340]
+#   마지막: [스텝 번호, 시각, "end", 상태 요약(sha256)]     - 재생 결과 확인용
+#
+# - 입력마다 바로 flush 하므로 프로그램이 비정상 종료되어도 그때까지의 기록은 남음
+# - 재생은 main.py 의 REPLAY_JOURNAL (또는 python main.py --replay 파일) 로 화면 없이 최대 속도로 진행
+# - 파일을 불러오는 입력(체크포인트 / 온도 환경)은 파일 내용의 sha256 을 함께 기록하고,
+#   재생할 때 같은 파일이 아니면 재생하지 않음 (JournalFileMismatch)
+# - 파일 저장 입력도 기록하므로, 기록 중 저장한 파일을 다시 불러온 경우 재생 중에 같은 파일을 새로 만들어 씀
+# ============================================================
+
+import hashlib
+import json
+
+JOURNAL_FORMAT_VERSION = 1
+
+# 재생할 때 적용하지 않는 입력 (결과에 영향 없음, 기록에만 남김)
+TIME_CONTROL_KINDS = ('pause', 'warp', 'unbounded')
+
+
+class JournalFileMismatch(RuntimeError):
+    """재생 중 불러올 파일의 내용이 기록할 때와 다른 경우"""
+
+
+def file_digest(path):
+    """파일 내용의 sha256 (파일이 없으면 None)"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+class InputJournal:
+    """
+    입력 기록 파일 (덧붙이기 전용)
+
+    속성:
+        path: 기록 파일 경로
+        count: 기록한 입력 수
+    """
+
+    def __init__(self, path, seeds, config=None):
+        """
+        기록 파일을 새로 만들고 첫 줄(시드 / 설정)을 씁니다.
+
+        Args:
+            path: 기록 파일 경로 (있으면 덮어씀)
+            seeds: {이름: 난수 시드}
+            config: 재생할 때 같아야 하는 시작 설정 {이름: 값}
+        """
+        self.path = path
+        self.count = 0
+        self._file = open(path, 'w', encoding='utf-8')
+        self._write({'format': JOURNAL_FORMAT_VERSION, 'seeds': seeds, 'config': config or {}})
+
+    def _write(self, item):
+        self._file.write(json.dumps(item, ensure_ascii=False, separators=(',', ':')) + '\n')
+        self._file.flush()
+
+    def record(self, step, time, kind, *args):
+        """
+        입력 하나를 기록합니다.
+
+        Args:
+            step: 입력을 적용한 시점까지 진행한 시뮬레이션 스텝 수
+            time: 그때의 시뮬레이션 시각 (초, 읽기용)
+            kind: 입력 종류 ('food', 'brush', ...)
+            args: JSON 으로 저장 가능한 인자
+        """
+        self._write([step, round(time, 6), kind, *args])
+        self.count += 1
+
+    def close(self, step, time, digest=None):
+        """종료 줄(상태 요약 포함)을 쓰고 파일을 닫습니다."""
+        if self._file.closed:
+            return
+        self._write([step, round(time, 6), 'end'] + ([digest] if digest is not None else []))
+        self._file.close()
+
+
+def load_journal(path):
+    """
+    기록 파일을 읽습니다.
+
+    Returns:
+        (header, events): 첫 줄 사전, [(스텝, 시각, 종류, 인자 리스트), ...]
+        (마지막 줄이 잘린 경우 그 줄은 버림)
+
+    Raises:
+        ValueError: 형식 버전이 다른 경우
+    """
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    header = json.loads(lines[0])
+    if header.get('format') != JOURNAL_FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 입력 기록 형식입니다: {header.get('format')}")
+    events = []
+    for line in lines[1:]:
+        if not line.strip():
+            continue
+        try:
+            step, time, kind, *args = json.loads(line)
+        except ValueError:
+            break  # 기록 도중 끊긴 마지막 줄
+        events.append((step, time, kind, args))
+    return header, events
@@ -1,10 +1,35 @@
+import os
 import pygame
 import sys
 import random
 import math
 import csv
+import hashlib
+import json
+import tempfile
+import time
+import numpy as np
 from enum import Enum
-from brain import Brain
+from fast_brain import FastBrain
+from connectome import load_connectome
+from connectome_delta import load_variant
+import checkpoint
+from temperature_field import TemperatureField, LOOKUP_BILINEAR
+from temperature_overlay import TemperatureOverlay
+from temperature_dynamics import TemperatureDynamics
+import temperature_arena
+import temperature_landscape
+from stroke_script import StrokePlayer, StrokeRecorder, load_stroke_script
+from food_index import FoodSpatialHash
+from food_overlay import FoodOverlay
+from food_patches import FoodRegrowth
+from odour_field import OdourField
+from world import World, Worm, WorldParameters
+from simulation_clock import SimulationClock
+from input_journal import InputJournal, JournalFileMismatch, file_digest, load_journal, TIME_CONTROL_KINDS
+from brain_ensemble import BrainEnsemble
+from population import WormPopulation
+from worm_body import WormBody
 
 # ============================================================
 # Enum 정의
@@ -27,6 +52,31 @@ NEURON_PANEL_WIDTH = 700  # 오른쪽 뉴런 시각화 패널 너비
 # 먹이 시스템
 FOOD_SENSE_DISTANCE = 200  # 벌레가 먹이를 감지할 수 있는 최대 거리 (픽셀)
 FOOD_EAT_DISTANCE = 20     # 먹이를 섭취하는 최소 거리 (픽셀)
+FOOD_INDEX_CELL_SIZE = 50  # 먹이 공간 해시 격자 칸 크기 (픽셀)
+FOOD_RADIUS = 10           # 먹이 원 반지름 (화면 표시)
+
+# 먹이 패치 대량 배치 (food_patches.py) - 시작할 때 배치하고, 먹힌 만큼 다시 자람
+# 예: [('gaussian', {'x': 200, 'y': 300, 'sigma': 40, 'count': 500}),
+#      ('lawn', {'x0': 400, 'y0': 100, 'x1': 650, 'y1': 600, 'count': 100000})]
+FOOD_PATCHES = []
+FOOD_PATCH_SEED = 0            # 패치 배치 / 재성장 난수 시드
+FOOD_REGROWTH_RATE = 0.05      # 초당 부족한 먹이 대비 재성장 비율 (0 이면 재성장 없음)
+FOOD_REGROWTH_INTERVAL = 1.0   # 재성장 계산 간격 (초)
+FOOD_CLICK_PATCH = {'sigma': 30, 'count': 200}  # Shift + 클릭으로 놓는 가우시안 패치
+
+# 먹이 냄새 (False 면 기존처럼 감지 범위 안에 먹이가 있으면 고정 세기로 자극)
+FOOD_ODOUR_ENABLED = True
+ODOUR_FIELD_RESOLUTION = 10     # 냄새 필드 격자 간격 (픽셀)
+ODOUR_DIFFUSIVITY = 1000.0      # 냄새 확산 계수 (픽셀²/초)
+ODOUR_DECAY_RATE = 0.1          # 냄새 분해 속도 (1/초) - 퍼지는 거리 약 √(D/λ) = 100px
+ODOUR_EMISSION_RATE = 50.0      # 먹이 하나의 초당 냄새 방출량
+ODOUR_SUBSTEP_RATE = 50.0       # 냄새 계산 스텝 (Hz)
+ODOUR_MAX_SUBSTEPS = 8          # 한 프레임에 계산하는 최대 스텝 수
+ODOUR_DETECTION_THRESHOLD = 0.09  # 이 농도 이상이면 먹이 감각 뉴런 자극 (먹이 하나 기준 약 200px)
+FOOD_SENSE_CONCENTRATION_GAIN = 1.0  # 농도 1 당 먹이 감각 자극 세기
+FOOD_SENSE_GRADIENT_GAIN = 5.0       # 진행 방향으로 농도가 짙어지는 정도에 따른 추가 자극
+FOOD_SENSE_LOOKAHEAD_DISTANCE = 20.0  # 진행 방향 농도 기울기를 적용하는 거리 (픽셀)
+FOOD_SENSE_MAX_INTENSITY = 3.0       # 최대 자극 세기 (기존 고정 자극 = 1.0)
 
 # 배고픔 시스템 (하이브리드 AI의 k 값)
 HUNGRY_LEVEL_INITIAL_VALUE = 0.5  # 초기 배고픔 수치 (0.0=배부름, 1.0=매우배고픔)
@@ -41,7 +91,25 @@ TEMPERATURE_MAX = 80.0  # 최고 온도
 PREFERRED_TEMPERATURE_MIN = 8.0  # 벌레 선호 온도 최소값
 PREFERRED_TEMPERATURE_MAX = 25.0  # 벌레 선호 온도 최대값
 TEMPERATURE_GRID_SIZE = 30  # 온도 맵 그리드 셀 크기 (픽셀)
-TEMPERATURE_DETECTION_RANGE = 100  # 벌레의 온도 감지 범위 (고정값)
+TEMPERATURE_DETECTION_RANGE = 100  # 벌레의 온도 감지 범위 (고정값, 호환 모드에서 사용)
+TEMPERATURE_SATISFIED_THRESHOLD = 2.0  # 만족 상태 임계값 (±2°C 이내, 화면 표시용)
+TEMPERATURE_AVOIDANCE_THRESHOLD = 5.0  # 회피 상태 임계값 (5°C 초과, 화면 표시용)
+
+# AFD 온도 감각 뉴런 자극 (선호 온도와의 차이 + 진행 방향 온도 변화에 따른 연속 자극)
+AFD_DEVIATION_GAIN = 2.0        # 선호 온도와 1°C 차이당 자극 강도
+AFD_GRADIENT_GAIN = 4.0         # 선호 온도에서 1°C 멀어지는 변화당 추가 자극 (가까워지면 감소)
+AFD_LOOKAHEAD_DISTANCE = 20.0   # 진행 방향 공간 기울기를 적용하는 거리 (픽셀)
+AFD_MAX_STIMULUS = 10.0         # 최대 자극 강도
+TEMPERATURE_FIELD_RESOLUTION = 10  # 온도 필드 격자 간격 (픽셀)
+TEMPERATURE_LOOKUP_MODE = LOOKUP_BILINEAR  # 온도 조회 방식 ('nearest': 기존 가장 가까운 점 방식)
+
+# 온도 확산/이완 (False 면 칠한 온도가 그대로 유지됨)
+TEMPERATURE_DYNAMICS_ENABLED = False
+TEMPERATURE_DIFFUSIVITY = 200.0       # 열 확산 계수 (픽셀²/초)
+TEMPERATURE_RELAXATION_RATE = 0.02    # 기본 온도로 돌아가는 속도 (1/초)
+TEMPERATURE_SUBSTEP_RATE = 20.0       # 확산 계산 스텝 (Hz, 화면 프레임과 별개)
+TEMPERATURE_MAX_SUBSTEPS = 8          # 한 프레임에 계산하는 최대 스텝 수
+TEMPERATURE_SOURCES = []              # 고정 온도 열원 [(x, y, 온도, 반지름), ...] 예: [(350, 350, 35.0, 20)]
 
 # 브러쉬 설정 (디버깅 모드에서 온도 맵 페인팅)
 BRUSH_SIZE_MIN = 20  # 브러쉬 최소 크기
@@ -61,13 +129,72 @@ NEURON_OFFSET_X = 150  # 뉴런 표시 시작 X 오프셋
 # 타이머 설정
 BRAIN_UPDATE_INTERVAL = 500  # 뇌 업데이트 주기 (밀리초) - 0.5초마다 신경망 계산
 NEURON_RESET_TIME = 2000     # 뉴런 자극 리셋 시간 (밀리초) - 2초 후 자극 해제
-
-# 벌레 렌더링 설정
+SIMULATION_FRAME_RATE = 60   # 이동 속도 / 회전량(0.1 rad)이 맞춰진 기준 프레임 속도 (초당)
+
+# 시뮬레이션 시계 (simulation_clock.py) - Space: 일시정지, [ / ]: 배속, U: 무제한 실행
+SIMULATION_WARP = 1.0        # 시작 배속 (×0.1 ~ ×1000)
+SIMULATION_UNBOUNDED = False  # True: 실제 시간과 무관하게 최대 속도로 진행
+RENDER_FRAME_RATE = 60       # 화면 갱신 상한 (초당, 시뮬레이션 스텝과는 별개)
+
+# 사용자 입력 기록 / 재생 (input_journal.py)
+SIMULATION_SEED = None        # 파이썬 난수 시드 (None 이면 실행마다 새로 정해 입력 기록에 남김)
+INPUT_JOURNAL_FILE = "session.journal"  # 사용자 입력 기록 파일 (None 이면 기록하지 않음)
+REPLAY_JOURNAL = None         # 지정하면 이 기록을 화면 없이 최대 속도로 재생 (python main.py --replay 파일)
+REPLAY_CHECKPOINT_FILE = "replay_checkpoint.npz"    # 재생을 마친 상태 저장 파일
+REPLAY_VOLTAGE_FILE = "neuron_voltages_replay.csv"  # 재생 중 매 스텝 뉴런 전위 기록 (None 이면 기록하지 않음)
+
+# 커넥톰 데이터 (가중치 모듈 이름 또는 import_connectome.py 로 만든 .npz 경로)
+CONNECTOME_SOURCE = 'constants'
+CONNECTOME_DELTA = None  # 변형 델타 .npz 경로 (connectome_delta.py 로 생성, None 이면 기준 그대로)
+
+# 체크포인트 (F5: 저장, F9: 불러오기)
+CHECKPOINT_FILE = "checkpoint.npz"
+START_CHECKPOINT = None  # 시작 시 불러올 체크포인트 경로 (워밍업된 상태에서 실험 시작)
+# 분기(what-if) 탐색: F6 현재 상태에서 분기 생성, F7 다음 분기로 전환 (모든 분기가 나란히 진행)
+
+# 온도 환경(arena) (F2: 저장, F3: 불러오기 - 디버그 모드)
+ARENA_FILE = "arena.npz"
+START_ARENA = None  # 시작 시 불러올 온도 환경 경로 (temperature_arena.py 로 저장한 파일)
+# 시작 시 생성할 온도 지형 (temperature_landscape.py), 예: ('linear', {'low': 10.0, 'high': 30.0, 'angle': 90})
+# 디버그 모드에서 G 키로 생성기(linear → radial → stripes → noise)를 차례로 적용
+START_LANDSCAPE = None
+
+# 브러쉬 스크립트 (stroke_script.py) - 디버그 모드 R 키로 브러쉬 입력 기록 시작/저장
+STROKE_SCRIPT = None            # 재생할 브러쉬 스크립트 경로
+STROKE_SCRIPT_AT_LOAD = False   # True: 시작할 때 한 번에 모두 적용, False: 기록된 시간에 맞춰 재생
+STROKE_RECORD_FILE = "strokes.json"
+
+# 벌레 몸체 (worm_body.py) - 머리를 따라가는 점 배열, 시뮬레이션 스텝마다 이완
 WORM_BODY_WIDTH = 20  # 벌레 몸체 두께
-WORM_SEGMENT_COUNT = 20  # 벌레 몸체 세그먼트 개수
-WORM_FRAME_INTERVAL = 6  # 세그먼트 간 프레임 간격
+WORM_SEGMENT_COUNT = 20  # 벌레 몸체 점 개수
+WORM_SEGMENT_LENGTH = 8  # 이웃한 몸체 점 사이 거리 (픽셀)
+WORM_BODY_ITERATIONS = 2  # 스텝마다 반복하는 이완 횟수 (몸이 휘는 부드러움, 마디 길이는 항상 정확히 맞춤)
+
+# 벌레 무리 (population.py) - 주인공 벌레와 같은 먹이 / 온도 환경을 함께 쓰는 벌레들
+POPULATION_SIZE = 0          # 벌레 수 (0 이면 무리 없음, 수천 마리까지 배열 연산으로 계산)
+POPULATION_SEED = 0          # 시작 위치 / 방향 / 선호 온도 / 초기 흥분 난수 시드
+POPULATION_DOT_RADIUS = 3    # 무리 벌레 표시 점 반지름
+POPULATION_COLOR = (180, 180, 180)
+POPULATION_BODY_POINTS = 0   # 무리 벌레 몸체 점 수 (0 이면 몸체 없이 점으로만 표시)
+WORM_CONTACT_RADIUS = 20     # 무리 벌레끼리 머리가 이 거리 이내면 코 터치 자극 (픽셀, 0 이면 끔)
 
 
+# ============================================================
+# 난수 시드 / 입력 기록 재생 준비
+# ============================================================
+if len(sys.argv) == 3 and sys.argv[1] == '--replay':
+    REPLAY_JOURNAL = sys.argv[2]
+replay_header, replay_events = None, []
+if REPLAY_JOURNAL:
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')  # 창 없이 실행
+    replay_header, replay_events = load_journal(REPLAY_JOURNAL)
+    SIMULATION_SEED = replay_header['seeds']['random']
+    FOOD_PATCH_SEED = replay_header['seeds']['food_patch']
+    POPULATION_SEED = replay_header['seeds']['population']
+if SIMULATION_SEED is None:
+    SIMULATION_SEED = int.from_bytes(os.urandom(4), 'little')
+random.seed(SIMULATION_SEED)  # 초기 흥분, 선호 온도 등 파이썬 난수
+
 # ============================================================
 # 초기화
 # ============================================================
@@ -80,26 +207,53 @@ clock = pygame.time.Clock()
 # 전역 변수
 # ============================================================
 
-# 벌레 상태
-target_position = [WINDOW_WIDTH // 2 - NEURON_PANEL_WIDTH, WINDOW_HEIGHT // 2]
-facing_angle = 0
-target_angle = 0
-current_speed = 0
-target_speed = 0
-speed_change_rate = 0
-
-# 먹이
-food_positions = []
-
-# 배고픔
-hungry_value = HUNGRY_LEVEL_INITIAL_VALUE
-start_time = pygame.time.get_ticks()
+# 먹이 (공간 해시: 벌레 주변 칸만 조회)
+food_index = FoodSpatialHash(FOOD_INDEX_CELL_SIZE)
+food_overlay = FoodOverlay(food_index, WINDOW_WIDTH - NEURON_PANEL_WIDTH, WINDOW_HEIGHT, radius=FOOD_RADIUS)
+food_regrowth = FoodRegrowth(FOOD_PATCHES, regrowth_rate=FOOD_REGROWTH_RATE, interval=FOOD_REGROWTH_INTERVAL,
+                             seed=FOOD_PATCH_SEED, bounds=(0, 0, WINDOW_WIDTH - NEURON_PANEL_WIDTH, WINDOW_HEIGHT))
+odour_field = None
+if FOOD_ODOUR_ENABLED:
+    odour_field = OdourField(
+        WINDOW_WIDTH - NEURON_PANEL_WIDTH, WINDOW_HEIGHT,
+        resolution=ODOUR_FIELD_RESOLUTION,
+        diffusivity=ODOUR_DIFFUSIVITY,
+        decay_rate=ODOUR_DECAY_RATE,
+        emission_rate=ODOUR_EMISSION_RATE,
+        substep_rate=ODOUR_SUBSTEP_RATE,
+        max_substeps=ODOUR_MAX_SUBSTEPS,
+    )
 
 # 온도
-preferred_temperature = random.uniform(PREFERRED_TEMPERATURE_MIN, PREFERRED_TEMPERATURE_MAX)
-temperature_map = {}
-current_temperature_at_worm = DEFAULT_TEMPERATURE
-temp_reaction = "중립"
+temperature_field = TemperatureField(
+    WINDOW_WIDTH - NEURON_PANEL_WIDTH, WINDOW_HEIGHT,
+    resolution=TEMPERATURE_FIELD_RESOLUTION,
+    default_temperature=DEFAULT_TEMPERATURE,
+    lookup_mode=TEMPERATURE_LOOKUP_MODE,
+    detection_range=TEMPERATURE_DETECTION_RANGE,
+    min_temperature=TEMPERATURE_MIN,
+    max_temperature=TEMPERATURE_MAX,
+)
+temperature_dynamics = None
+if TEMPERATURE_DYNAMICS_ENABLED:
+    temperature_dynamics = TemperatureDynamics(
+        temperature_field,
+        diffusivity=TEMPERATURE_DIFFUSIVITY,
+        relaxation_rate=TEMPERATURE_RELAXATION_RATE,
+        substep_rate=TEMPERATURE_SUBSTEP_RATE,
+        max_substeps=TEMPERATURE_MAX_SUBSTEPS,
+    )
+    for source_x, source_y, source_temperature, source_radius in TEMPERATURE_SOURCES:
+        temperature_dynamics.add_source(source_x, source_y, source_temperature, source_radius)
+temperature_overlay = TemperatureOverlay(
+    temperature_field,
+    WINDOW_WIDTH - NEURON_PANEL_WIDTH,  # 뉴런 패널을 제외한 영역만 표시
+    WINDOW_HEIGHT,
+    cell_size=TEMPERATURE_GRID_SIZE,
+    min_temperature=TEMPERATURE_MIN,
+    default_temperature=DEFAULT_TEMPERATURE,
+    max_temperature=TEMPERATURE_MAX,
+)
 
 # 브러쉬
 brush_mode = BrushMode.HEAT  # 초기 브러쉬 모드
@@ -111,190 +265,132 @@ debug_mode = False
 input_mode = False
 input_text = ""
 mouse_pressed = False
+last_brush_position = None  # 이전 프레임의 브러쉬 위치 (획 보간용)
 keys_pressed = set()
 
-# 타이머
-last_brain_update = 0
-last_touch_time = 0
-last_food_sense_time = 0
-
 # ============================================================
 # 뇌 객체 생성
 # ============================================================
-brain = Brain()
+if CONNECTOME_DELTA:
+    brain = FastBrain(load_variant(CONNECTOME_SOURCE, CONNECTOME_DELTA))  # 배열 기반 엔진 (변형 커넥톰)
+else:
+    brain = FastBrain(load_connectome(CONNECTOME_SOURCE))  # 배열 기반 엔진
 brain.setup()
 brain.RandExcite()
 
 # ============================================================
-# 뉴런 전위값 기록용 변수
+# 시뮬레이션 모델 (world.py) - 벌레 / 배고픔 / 먹이 / 온도 상태와 진행
 # ============================================================
-neuron_voltage_history = []  # 각 프레임의 모든 뉴런 전위값을 저장
-frame_count = 0  # 프레임 카운터
+world = World(
+    WINDOW_WIDTH - NEURON_PANEL_WIDTH, WINDOW_HEIGHT,
+    temperature_field, food_index,
+    params=WorldParameters(
+        food_sense_distance=FOOD_SENSE_DISTANCE,
+        food_eat_distance=FOOD_EAT_DISTANCE,
+        odour_detection_threshold=ODOUR_DETECTION_THRESHOLD,
+        food_sense_concentration_gain=FOOD_SENSE_CONCENTRATION_GAIN,
+        food_sense_gradient_gain=FOOD_SENSE_GRADIENT_GAIN,
+        food_sense_lookahead_distance=FOOD_SENSE_LOOKAHEAD_DISTANCE,
+        food_sense_max_intensity=FOOD_SENSE_MAX_INTENSITY,
+        hunger_initial_value=HUNGRY_LEVEL_INITIAL_VALUE,
+        hunger_increase_interval=HUNGRY_LEVEL_INCREASE_INTERVAL / 1000,
+        hunger_increase_amount=HUNGRY_LEVEL_INCREASE_AMOUNT,
+        hunger_decrease_on_eat=HUNGRY_LEVEL_DECREASE_ON_EAT,
+        afd_deviation_gain=AFD_DEVIATION_GAIN,
+        afd_gradient_gain=AFD_GRADIENT_GAIN,
+        afd_lookahead_distance=AFD_LOOKAHEAD_DISTANCE,
+        afd_max_stimulus=AFD_MAX_STIMULUS,
+        temperature_satisfied_threshold=TEMPERATURE_SATISFIED_THRESHOLD,
+        temperature_avoidance_threshold=TEMPERATURE_AVOIDANCE_THRESHOLD,
+        brain_update_interval=BRAIN_UPDATE_INTERVAL / 1000,
+        neuron_reset_time=NEURON_RESET_TIME / 1000,
+        frame_rate=SIMULATION_FRAME_RATE,
+        food_click_patch=FOOD_CLICK_PATCH,
+        worm_contact_radius=WORM_CONTACT_RADIUS,
+    ),
+    temperature_dynamics=temperature_dynamics,
+    food_regrowth=food_regrowth,
+    odour_field=odour_field,
+)
+world.food_observers.append(food_overlay)  # 먹이 레이어는 먹이가 바뀔 때만 다시 그림
+sim_clock = SimulationClock(world, warp=SIMULATION_WARP, step=1 / SIMULATION_FRAME_RATE)
+sim_clock.unbounded = SIMULATION_UNBOUNDED
+worm = world.add_worm(Worm(
+    brain, WINDOW_WIDTH // 2 - NEURON_PANEL_WIDTH, WINDOW_HEIGHT // 2,
+    preferred_temperature=random.uniform(PREFERRED_TEMPERATURE_MIN, PREFERRED_TEMPERATURE_MAX),
+    temperature=DEFAULT_TEMPERATURE,
+    hungry_value=HUNGRY_LEVEL_INITIAL_VALUE,
+    body=WormBody.straight([WINDOW_WIDTH // 2 - NEURON_PANEL_WIDTH, WINDOW_HEIGHT // 2], 0.0,
+                           WORM_SEGMENT_COUNT, WORM_SEGMENT_LENGTH, WORM_BODY_ITERATIONS),
+))
+
+# 벌레 무리: 신경망은 BrainEnsemble 하나에 모아 한 번에 계산
+population = None
+if POPULATION_SIZE > 0:
+    population_rng = np.random.default_rng(POPULATION_SEED)
+    population_brains = BrainEnsemble(POPULATION_SIZE, brain.connectome)
+    population_brains.setup()
+    population_brains.rand_excite(population_rng)
+    population_positions = population_rng.uniform((0, 0), (world.width, world.height), size=(POPULATION_SIZE, 2))
+    population_preferred = population_rng.uniform(PREFERRED_TEMPERATURE_MIN, PREFERRED_TEMPERATURE_MAX,
+                                                  POPULATION_SIZE)
+    population_angles = population_rng.uniform(0, 2 * math.pi, POPULATION_SIZE)
+    population = world.add_population(WormPopulation(
+        population_brains,
+        population_positions,
+        preferred_temperature=population_preferred,
+        temperature=DEFAULT_TEMPERATURE,
+        hungry_value=HUNGRY_LEVEL_INITIAL_VALUE,
+        facing_angle=population_angles,
+        brain_update_interval=BRAIN_UPDATE_INTERVAL / 1000,
+        rng=population_rng,
+        body=(WormBody.straight(population_positions, population_angles, POPULATION_BODY_POINTS,
+                                WORM_SEGMENT_LENGTH, WORM_BODY_ITERATIONS)
+              if POPULATION_BODY_POINTS >= 2 else None),
+    ))
 
 # ============================================================
-# IK(벌레 본체) 클래스
+# 뉴런 전위값 기록용 변수
 # ============================================================
-class InverseKinematicsSegment:
-    """
-    역운동학(Inverse Kinematics) 세그먼트 클래스
-    
-    벌레의 각 몸체 세그먼트를 표현하며, 스프링-댐퍼 시스템을 사용하여
-    자연스러운 움직임을 구현합니다.
-    """
-    def __init__(self, length, head_point, tail_point):
-        """
-        Args:
-            length: 세그먼트의 길이
-            head_point: 머리 좌표 [x, y]
-            tail_point: 꼬리 좌표 [x, y]
-        """
-        self.length = length
-        self.head_point = head_point
-        self.tail_point = tail_point
-
-    def update(self):
-        """
-        스프링-댐퍼 시스템을 사용하여 세그먼트의 위치를 업데이트
-        
-        물리 시뮬레이션:
-        - 목표 길이와 현재 길이의 차이에 비례하는 힘 계산
-        - 탄성(elasticity)과 감쇠(damping)를 적용하여 자연스러운 움직임 구현
-        """
-        # 머리와 꼬리 사이의 벡터 계산
-        dx = self.head_point[0] - self.tail_point[0]
-        dy = self.head_point[1] - self.tail_point[1]
-        distance = math.sqrt(dx * dx + dy * dy) if (dx != 0 or dy != 0) else 1
-        
-        # 스프링 힘 계산 (목표 길이와 현재 길이의 차이)
-        force = 0.5 - (self.length / distance) * 0.5
-        elasticity = 0.998  # 탄성 계수
-        force *= 0.99  # 감쇠 계수
-        
-        # 힘을 x, y 성분으로 분해
-        fx = force * dx
-        fy = force * dy
-        
-        # 꼬리와 머리에 힘 적용 (작용-반작용 법칙)
-        self.tail_point[0] += fx * elasticity * 2.0
-        self.tail_point[1] += fy * elasticity * 2.0
-        self.head_point[0] -= fx * (1.0 - elasticity) * 2.0
-        self.head_point[1] -= fy * (1.0 - elasticity) * 2.0
-
-class InverseKinematicsChain:
-    """
-    역운동학 체인 클래스 - 벌레의 전체 몸체를 구성하는 세그먼트 체인
-    
-    여러 InverseKinematicsSegment를 연결하여 벌레의 부드러운 움직임을 구현합니다.
-    첫 번째 세그먼트가 목표 지점을 따라가면, 나머지 세그먼트들이 순차적으로 따라갑니다.
-    """
-    def __init__(self, number_of_segments, segment_length):
-        """
-        Args:
-            number_of_segments: 세그먼트 개수
-            segment_length: 각 세그먼트의 길이
-        """
-        self.segments = []
-        # 무작위 시작 위치 생성
-        current_point = [random.randint(0, WINDOW_WIDTH // 2), random.randint(0, WINDOW_HEIGHT)]
-        
-        # 세그먼트 체인 생성
-        for _ in range(number_of_segments):
-            head = current_point[:]
-            tail = [head[0] + segment_length, head[1] + segment_length]
-            self.segments.append(InverseKinematicsSegment(segment_length, head, tail))
-            current_point = tail
-
-    def update(self, target_point):
-        """
-        목표 지점을 향해 체인 업데이트
-        
-        Args:
-            target_point: 첫 번째 세그먼트(머리)가 향할 목표 위치 [x, y]
-        """
-        # 첫 번째 세그먼트의 머리를 목표 지점으로 설정
-        self.segments[0].head_point = target_point[:]
-        
-        # 모든 세그먼트 업데이트 (물리 시뮬레이션)
-        for segment in self.segments:
-            segment.update()
+neuron_voltage_history = []  # 각 프레임의 모든 뉴런 전위값을 저장
+frame_count = 0  # 프레임 카운터
 
 # ----------------------------
 # 온도 관련 함수
 # ----------------------------
-def get_temperature_at_position(x, y):
-    """
-    특정 위치의 온도를 반환합니다.
-    
-    주변 온도 소스들의 영향을 거리 기반으로 보간하여 계산합니다.
-    브러쉬 크기 내에 있는 온도 포인트들의 영향을 받으며,
-    거리에 따라 가중치가 감소합니다.
-    
-    Args:
-        x, y: 온도를 조회할 위치 좌표
-        
-    Returns:
-        float: 해당 위치의 온도 (°C)
-    """
-    # 온도 맵이 비어있으면 기본 온도 반환
-    if len(temperature_map) == 0:
-        return DEFAULT_TEMPERATURE
-    
-    # 가장 가까운 온도 포인트 찾기
-    min_distance = float('inf')
-    nearest_temperature = DEFAULT_TEMPERATURE
-    
-    for (tx, ty), temperature in temperature_map.items():
-        distance = math.sqrt((x - tx)**2 + (y - ty)**2)
-        
-        # 브러쉬 크기 내에 있으면 해당 온도 적용
-        if distance < TEMPERATURE_DETECTION_RANGE:
-            # 거리에 따라 온도 보간 (가까울수록 강하게 영향)
-            weight = 1 - (distance / TEMPERATURE_DETECTION_RANGE)
-            if distance < min_distance:
-                min_distance = distance
-                nearest_temperature = DEFAULT_TEMPERATURE + (temperature - DEFAULT_TEMPERATURE) * weight
-    
-    return nearest_temperature if min_distance < TEMPERATURE_DETECTION_RANGE else DEFAULT_TEMPERATURE
-
-def apply_temperature_brush(x, y, mode):
+def apply_temperature_brush(x, y, mode, previous_position=None, size=None, scale=None):
     """
     브러쉬를 사용하여 온도 맵을 수정합니다.
     
     디버그 모드에서 사용되는 온도 편집 도구입니다.
     HEAT/COOL 모드는 온도를 증가/감소시키고, ERASE 모드는 온도 데이터를 제거합니다.
+    미리 계산한 원형 스탬프 마스크를 온도 필드 배열에 한 번에 적용하며,
+    이전 마우스 위치가 주어지면 그 사이를 빈틈 없이 채웁니다.
     
     Args:
         x, y: 브러쉬 중심 좌표
         mode: 브러쉬 모드 (BrushMode.HEAT / BrushMode.COOL / BrushMode.ERASE)
+        previous_position: 이전 프레임의 마우스 위치 (None 이면 한 점만 적용)
+        size, scale: 브러쉬 크기 / 온도 변화량 (None 이면 현재 설정값)
     """
-    if mode == BrushMode.ERASE:
-        # 지우기 모드: 브러쉬 영역 내의 모든 온도 포인트 제거
-        to_remove = []
-        for (px, py) in temperature_map.keys():
-            distance = math.sqrt((x - px)**2 + (y - py)**2)
-            if distance <= brush_size:
-                to_remove.append((px, py))
-        
-        for pos in to_remove:
-            del temperature_map[pos]
+    size = brush_size if size is None else size
+    scale = temperature_scale if scale is None else scale
+    x0, y0 = previous_position if previous_position is not None else (x, y)
+    temperature_field.apply_stroke(x0, y0, x, y, mode.value, size, scale)
+    if stroke_recorder is not None:
+        stroke_recorder.record(world.time, mode.value, x, y, size, scale,
+                               continues=previous_position is not None)
+
+def toggle_stroke_recording():
+    """브러쉬 입력 기록을 시작하거나, 기록 중이면 멈추고 파일로 저장합니다. (R 키)"""
+    global stroke_recorder
+    if stroke_recorder is None:
+        stroke_recorder = StrokeRecorder()
+        print("브러쉬 입력 기록을 시작합니다.")
     else:
-        # 가열/냉각 모드: 브러쉬 영역 내의 포인트들에 온도 적용
-        step = 10  # 온도 맵 해상도 (픽셀 단위)
-        for dx in range(-brush_size, brush_size, step):
-            for dy in range(-brush_size, brush_size, step):
-                px, py = x + dx, y + dy
-                distance = math.sqrt(dx**2 + dy**2)
-                
-                if distance <= brush_size:
-                    current_temp = temperature_map.get((px, py), DEFAULT_TEMPERATURE)
-                    
-                    # 온도 변경 (최소/최대 범위 제한)
-                    if mode == BrushMode.HEAT:
-                        new_temp = min(current_temp + temperature_scale, TEMPERATURE_MAX)
-                    else:  # BrushMode.COOL
-                        new_temp = max(current_temp - temperature_scale, TEMPERATURE_MIN)
-                    
-                    temperature_map[(px, py)] = new_temp
+        stroke_recorder.to_script().save(STROKE_RECORD_FILE)
+        print(f"브러쉬 입력 {len(stroke_recorder.events)}개를 '{STROKE_RECORD_FILE}'에 저장했습니다.")
+        stroke_recorder = None
 
 def draw_temperature_map():
     """
@@ -306,61 +402,14 @@ def draw_temperature_map():
     - 뜨거운 온도: 빨간색 (TEMPERATURE_MAX)
     
     디버그 모드에서만 표시됩니다.
+    색상은 격자점 해상도로, 온도 숫자는 30px 칸 단위로 표시하며
+    오버레이는 temperature_overlay 에 유지되어 바뀐 범위만 다시 그립니다.
     """
-    if not debug_mode or len(temperature_map) == 0:
+    if not debug_mode or temperature_field.painted_count() == 0:
         return
     
-    # 반투명 온도 레이어 생성
-    temperature_surface = pygame.Surface((WINDOW_WIDTH - NEURON_PANEL_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
-    # SRCALPHA 플래그를 사용하여 투명도 지원
-    font = pygame.font.SysFont("malgungothic,arial", 10)
-    
-    # 온도 포인트를 그리드로 그룹화
-    temperature_grid = {}
-    
-    # 온도 맵의 각 포인트 처리
-    for (x, y), temperature in temperature_map.items():
-        if 0 <= x < WINDOW_WIDTH - NEURON_PANEL_WIDTH and 0 <= y < WINDOW_HEIGHT: # 뉴런 패널을 제외한 영역만 처리
-            # 그리드 셀 좌표 계산
-            grid_x = int(x / TEMPERATURE_GRID_SIZE) * TEMPERATURE_GRID_SIZE
-            grid_y = int(y / TEMPERATURE_GRID_SIZE) * TEMPERATURE_GRID_SIZE
-            
-            # 그리드 셀의 평균 온도 계산
-            if (grid_x, grid_y) not in temperature_grid:
-                temperature_grid[(grid_x, grid_y)] = []
-            temperature_grid[(grid_x, grid_y)].append(temperature)
-    # 그리드 셀별로 온도 표시
-    for (grid_x, grid_y), temperatures in temperature_grid.items():
-        average_temperature = sum(temperatures) / len(temperatures)
-        
-        # 온도에 따라 색상 결정
-        # 기본 온도(20도)를 중간으로 설정
-        # -100 ~ 20: 파랑 -> 흰색
-        # 20 ~ 100: 흰색 -> 빨강
-        if average_temperature < DEFAULT_TEMPERATURE:
-            # 차가움: 파랑 -> 흰색
-            temp_ratio = (average_temperature - TEMPERATURE_MIN) / (DEFAULT_TEMPERATURE - TEMPERATURE_MIN)
-            temp_ratio = max(0, min(1, temp_ratio))  # 0~1 사이로 제한
-            r = int(255 * temp_ratio)
-            g = int(255 * temp_ratio)
-            b = 255
-        else:
-            # 뜨거움: 흰색 -> 빨강
-            temp_ratio = (average_temperature - DEFAULT_TEMPERATURE) / (TEMPERATURE_MAX - DEFAULT_TEMPERATURE)
-            temp_ratio = max(0, min(1, temp_ratio))  # 0~1 사이로 제한
-            r = 255
-            g = int(255 * (1 - temp_ratio))
-            b = int(255 * (1 - temp_ratio))
-        
-        # 반투명 사각형 그리기
-        pygame.draw.rect(temperature_surface, (r, g, b, 80), 
-                        (grid_x, grid_y, TEMPERATURE_GRID_SIZE, TEMPERATURE_GRID_SIZE))
-        
-        # 온도 텍스트 표시 (흰색)
-        temp_text = font.render(f"{int(average_temperature)}°", True, (255, 255, 255))
-        temperature_surface.blit(temp_text, (grid_x + 3, grid_y + 8))
-    
-    screen.blit(temperature_surface, (0, 0))
+    # 유지되는 오버레이에서 바뀐 범위만 다시 그린 뒤 화면에 표시
+    temperature_overlay.draw(screen)
 
 def draw_brush_cursor(pos):
     """
@@ -399,19 +448,9 @@ def draw_brush_cursor(pos):
 # ----------------------------
 # 먹이 관련 함수
 # ----------------------------
-def add_food(position):
-    """
-    먹이를 추가합니다.
-    
-    Args:
-        position: 먹이 위치 [x, y]
-    """
-    food_positions.append(position)
-
 def draw_food():
-    """모든 먹이를 화면에 그립니다."""
-    for f in food_positions:
-        pygame.draw.circle(screen, (251, 192, 45), f, 10)
+    """모든 먹이를 화면에 그립니다. (미리 그려 둔 먹이 레이어)"""
+    food_overlay.draw(screen)
 
 # ----------------------------
 # 디버깅 모드 표시
@@ -425,23 +464,25 @@ def draw_debug_info():
     - 먹이 섭취 범위: 작은 노란색 원 (FOOD_EAT_DISTANCE)
     """
     if debug_mode:
+        head_x, head_y, facing_angle = sim_clock.worm_pose()  # 스텝 사이 보간한 자세
+
         # 벌레 머리 기준 먹이 탐지 범위 (반투명 녹색 원)
         debug_surface = pygame.Surface((FOOD_SENSE_DISTANCE * 2, FOOD_SENSE_DISTANCE * 2), pygame.SRCALPHA)
         pygame.draw.circle(debug_surface, (100, 255, 100, 50), (FOOD_SENSE_DISTANCE, FOOD_SENSE_DISTANCE), FOOD_SENSE_DISTANCE)
-        screen.blit(debug_surface, (target_position[0] - FOOD_SENSE_DISTANCE, target_position[1] - FOOD_SENSE_DISTANCE))
+        screen.blit(debug_surface, (head_x - FOOD_SENSE_DISTANCE, head_y - FOOD_SENSE_DISTANCE))
         
         # 먹이 먹는 범위 (작은 반투명 노란색 원)
         eat_surface = pygame.Surface((FOOD_EAT_DISTANCE * 2, FOOD_EAT_DISTANCE * 2), pygame.SRCALPHA)
         pygame.draw.circle(eat_surface, (255, 100, 100, 80), (FOOD_EAT_DISTANCE, FOOD_EAT_DISTANCE), FOOD_EAT_DISTANCE)
-        screen.blit(eat_surface, (target_position[0] - FOOD_EAT_DISTANCE, target_position[1] - FOOD_EAT_DISTANCE))
+        screen.blit(eat_surface, (head_x - FOOD_EAT_DISTANCE, head_y - FOOD_EAT_DISTANCE))
         
         # 머리가 이동하는 방향 화살표
         arrow_length = 50
-        arrow_end_x = target_position[0] + math.cos(facing_angle) * arrow_length
-        arrow_end_y = target_position[1] - math.sin(facing_angle) * arrow_length
+        arrow_end_x = head_x + math.cos(facing_angle) * arrow_length
+        arrow_end_y = head_y - math.sin(facing_angle) * arrow_length
         
         # 화살표 선
-        pygame.draw.line(screen, (255, 0, 0), target_position, (arrow_end_x, arrow_end_y), 3)
+        pygame.draw.line(screen, (255, 0, 0), (head_x, head_y), (arrow_end_x, arrow_end_y), 3)
         
         # 화살촉
         arrow_angle1 = facing_angle + math.pi * 0.75
@@ -521,15 +562,14 @@ def draw_adex_parameters():
 
 def draw_simulation_time():
     """
-    메인 화면 왼쪽 하단에 시뮬레이션 시간을 표시합니다.
+    메인 화면 왼쪽 하단에 시뮬레이션 시간과 배속(일시정지 / 무제한)을 표시합니다.
     항상 표시됩니다 (디버그 모드 여부 무관).
     """
     font = pygame.font.SysFont("malgungothic,arial", 16, bold=True)
-    current_time = pygame.time.get_ticks()
-    elapsed_seconds = current_time / 1000.0
+    elapsed_seconds = sim_clock.time
     
     # 시간 텍스트 생성
-    time_text = f"시뮬레이션 시간: {elapsed_seconds:.1f}초"
+    time_text = f"시뮬레이션 시간: {elapsed_seconds:.1f}초 ({sim_clock.describe()})"
     time_surf = font.render(time_text, True, (255, 255, 100))
     
     # 왼쪽 하단에 표시 (약간의 여백 포함)
@@ -554,52 +594,34 @@ def draw_simulation_time():
 def draw_worm():
     """
     벌레를 화면에 그립니다.
-    
-    벌레의 움직임 기록(head_path)을 사용하여 몸체를 렌더링합니다.
-    이전 위치들을 추적하여 자연스러운 꼬불꼬불한 몸체를 표현합니다.
-    
-    작동 방식:
-    1. 현재 머리 위치를 경로에 추가
-    2. 일정 간격(frame_interval)마다 샘플링하여 세그먼트 위치 계산
-    3. 세그먼트 간을 선으로 연결하여 몸체 렌더링
-    
-    전역 변수:
-        draw_worm.head_path: 벌레 머리의 이동 경로 [(x, y, angle), ...]
-    """
-    # 게임 속도에 따른 프레임 간격 조정
-    frame_interval = WORM_FRAME_INTERVAL
-
-    # 정적 변수 초기화 (함수 속성 사용)
-    if not hasattr(draw_worm, "head_path"):
-        draw_worm.head_path = []
 
-    # 현재 머리 위치를 경로에 추가
-    draw_worm.head_path.insert(0, (target_position[0], target_position[1], facing_angle))
-    
-    # 최대 경로 길이 제한 (메모리 절약)
-    max_path_length = WORM_SEGMENT_COUNT * frame_interval
-    if len(draw_worm.head_path) > max_path_length:
-        draw_worm.head_path = draw_worm.head_path[:max_path_length]
-
-    # 세그먼트 위치 계산 (일정 간격마다 샘플링)
-    segment_points = []
-    for i in range(WORM_SEGMENT_COUNT):
-        index = i * frame_interval
-        if index < len(draw_worm.head_path):
-            x, y, _ = draw_worm.head_path[index]
-        else:
-            # 경로가 짧으면 마지막 위치 사용
-            x, y, _ = draw_worm.head_path[-1]
-        segment_points.append((x, y))
+    몸체 점 배열(worm.body, 스텝 사이 보간)의 이웃한 점을 두꺼운 선으로 잇고,
+    각 점에 원을 그려 마디 사이를 부드럽게 연결합니다.
+    """
+    segment_points = [tuple(point) for point in sim_clock.worm_body_points().tolist()]
 
-    # 세그먼트 간을 선으로 연결하여 몸체 그리기
-    for i in range(len(segment_points) - 1):
-        pygame.draw.line(screen, (255, 255, 255), segment_points[i], segment_points[i + 1], WORM_BODY_WIDTH)
+    # 몸체 점 사이를 선으로 연결하여 몸체 그리기
+    pygame.draw.lines(screen, (255, 255, 255), False, segment_points, WORM_BODY_WIDTH)
 
-    # 각 세그먼트를 원으로 그려서 부드러운 연결 효과
+    # 각 점을 원으로 그려서 부드러운 연결 효과
     for p in segment_points:
         pygame.draw.circle(screen, (255, 255, 255), p, WORM_BODY_WIDTH // 2, 0)
 
+def draw_population():
+    """벌레 무리를 점으로 그립니다. (미리 그려 둔 점 스탬프를 blits() 로 한 번에 찍음)"""
+    if population is None:
+        return
+    if not hasattr(draw_population, "stamp"):
+        r = POPULATION_DOT_RADIUS
+        draw_population.stamp = pygame.Surface((2 * r + 1, 2 * r + 1))
+        draw_population.stamp.set_colorkey((0, 0, 0))
+        pygame.draw.circle(draw_population.stamp, POPULATION_COLOR, (r, r), r)
+    if population.body is not None:
+        for points in sim_clock.population_bodies().tolist():
+            pygame.draw.lines(screen, POPULATION_COLOR, False, points, POPULATION_DOT_RADIUS)
+    corners = np.round(sim_clock.population_positions()).astype(np.int64) - POPULATION_DOT_RADIUS
+    screen.blits([(draw_population.stamp, corner) for corner in map(tuple, corners.tolist())], doreturn=False)
+
 # ============================================================
 # 뉴런 활성화 시각화
 # ============================================================
@@ -671,13 +693,13 @@ def draw_brain_activity(brain, surface, start_x, start_y, width, height):
         current_y += 8  # 빈 줄
         
         # 배고픔 수치 표시
-        hungry_surf = font.render(f"배고픔 (k): {hungry_value:.2f}", True, (100, 255, 100))
+        hungry_surf = font.render(f"배고픔 (k): {worm.hungry_value:.2f}", True, (100, 255, 100))
         surface.blit(hungry_surf, (start_x + 8, current_y))
         current_y += 16
         
         # 이동 방향 벡터 표시
-        direction_x = math.cos(facing_angle)
-        direction_y = -math.sin(facing_angle)
+        direction_x = math.cos(worm.facing_angle)
+        direction_y = -math.sin(worm.facing_angle)
         dir_surf = font.render(f"방향 벡터: ({direction_x:.2f}, {direction_y:.2f})", True, (150, 200, 255))
         surface.blit(dir_surf, (start_x + 8, current_y))
         current_y += 16
@@ -692,6 +714,12 @@ def draw_brain_activity(brain, surface, start_x, start_y, width, height):
         surface.blit(sense_surf, (start_x + 8, current_y))
         current_y += 16
         
+        # 먹이 냄새 농도 / 먹이 감각 자극 세기
+        if odour_field is not None:
+            odour_surf = font.render(f"냄새 농도: {worm.odour_at_worm:.2f} (자극 {brain.FoodSenseIntensity:.2f})", True, (150, 255, 150))
+            surface.blit(odour_surf, (start_x + 8, current_y))
+            current_y += 16
+        
         # 온도 정보 표시
         current_y += 8  # 빈 줄
         temp_title_surf = font.render("=== 온도 정보 ===", True, (255, 255, 150))
@@ -699,11 +727,11 @@ def draw_brain_activity(brain, surface, start_x, start_y, width, height):
         current_y += 16
         
         # 벌레 위치의 현재 온도
-        current_temp_surf = font.render(f"벌레 위치 온도: {current_temperature_at_worm:.1f}°C", True, (255, 200, 100))
+        current_temp_surf = font.render(f"벌레 위치 온도: {worm.temperature_at_worm:.1f}°C", True, (255, 200, 100))
         surface.blit(current_temp_surf, (start_x + 8, current_y))
         current_y += 16
         
-        pref_temp_surf = font.render(f"선호 온도: {preferred_temperature:.1f}°C", True, (100, 255, 150))
+        pref_temp_surf = font.render(f"선호 온도: {worm.preferred_temperature:.1f}°C", True, (100, 255, 150))
         surface.blit(pref_temp_surf, (start_x + 8, current_y))
         current_y += 16
     
@@ -713,7 +741,7 @@ def draw_brain_activity(brain, surface, start_x, start_y, width, height):
         current_y += 16
         
         # 온도 차이
-        temperature_difference = abs(current_temperature_at_worm - preferred_temperature)
+        temperature_difference = abs(worm.temperature_at_worm - worm.preferred_temperature)
         diff_surf = font.render(f"온도 차이: {temperature_difference:.1f}°C", True, (200, 200, 200))
         surface.blit(diff_surf, (start_x + 8, current_y))
         current_y += 16
@@ -724,11 +752,16 @@ def draw_brain_activity(brain, surface, start_x, start_y, width, height):
             "중립": (200, 200, 200),  # 회색
             "회피": (255, 100, 100)   # 빨강
         }
-        reaction_color = reaction_colors.get(temp_reaction, (200, 200, 200))
-        reaction_surf = font.render(f"온도 반응: {temp_reaction}", True, reaction_color)
+        reaction_color = reaction_colors.get(worm.temperature_reaction, (200, 200, 200))
+        reaction_surf = font.render(f"온도 반응: {worm.temperature_reaction}", True, reaction_color)
         surface.blit(reaction_surf, (start_x + 8, current_y))
         current_y += 16
         
+        # AFD 뉴런 자극 강도
+        afd_surf = font.render(f"AFD 자극: {worm.afd_stimulus:.1f}", True, (200, 200, 200))
+        surface.blit(afd_surf, (start_x + 8, current_y))
+        current_y += 16
+        
         current_y += 8  # 빈 줄
         
         # 브러쉬 정보
@@ -762,9 +795,15 @@ def draw_brain_activity(brain, surface, start_x, start_y, width, height):
         current_y += 16
         
         # 온도 맵 포인트 수
-        temp_points_surf = font.render(f"온도 포인트: {len(temperature_map)}", True, (150, 150, 150))
+        temp_points_surf = font.render(f"온도 포인트: {temperature_field.painted_count()}", True, (150, 150, 150))
         surface.blit(temp_points_surf, (start_x + 8, current_y))
         current_y += 16
+
+        # 분기 정보 (F6: 분기, F7: 전환)
+        if simulation_branches:
+            branch_surf = font.render(f"분기: {current_branch + 1}/{len(simulation_branches)} (F6/F7)", True, (200, 180, 255))
+            surface.blit(branch_surf, (start_x + 8, current_y))
+            current_y += 16
     
     # ========================================
     # 모드 표시 (항상 표시)
@@ -813,239 +852,31 @@ def draw_brain_activity(brain, surface, start_x, start_y, width, height):
         name_surf = neuron_name_font.render(neuron, True, (230, 230, 230))
         surface.blit(name_surf, (cx - name_surf.get_width() // 2, cy - NEURON_CIRCLE_RADIUS - 12))
 
-# ----------------------------
-# 뇌 상태 업데이트
-# ----------------------------
-def update_brain():
-    """
-    뇌의 신경망을 업데이트하고 온도 자극을 처리합니다.
-    
-    이 함수는 다음을 수행합니다:
-    1. 벌레 위치의 온도를 감지
-    2. 온도 차이에 따라 AFD 온도 감각 뉴런을 자극
-       - 온도 차이 > 5°C: 강한 회피 반응 (신호 강도 +10)
-       - 온도 차이 < 2°C: 만족 반응 (신호 강도 +2)
-       - 그 외: 중립
-    3. 뇌 신경망 업데이트 (brain.update())
-    4. 근육 신호에 따라 이동 방향과 속도 계산
-    
-    전역 변수 수정:
-        target_angle: 뇌 신호에 따른 목표 이동 각도
-        target_speed: 근육 활성화에 따른 목표 속도
-        speed_change_rate: 속도 변화율
-        current_temperature_at_worm: 현재 벌레 위치의 온도
-        temp_reaction: 온도 반응 ("만족", "중립", "회피")
-    """
-    global target_angle, target_speed, speed_change_rate
-    global current_temperature_at_worm, temp_reaction
-    
-    # 1. 벌레 위치의 온도 확인
-    worm_temperature = get_temperature_at_position(target_position[0], target_position[1])
-    current_temperature_at_worm = worm_temperature
-    temperature_difference = abs(worm_temperature - preferred_temperature) # 선호 온도와 현재 온도 차이
-    
 
-    TEMPERATURE_SATISFIED_THRESHOLD = 2.0  # 만족 상태 임계값 (±2°C 이내)
-    TEMPERATURE_AVOIDANCE_THRESHOLD = 5.0  # 회피 상태 임계값 (5°C 초과)
-    TEMPERATURE_SATISFIED_STIMULUS = 2     # 만족 시 AFD 뉴런 자극 강도
-    TEMPERATURE_AVOIDANCE_STIMULUS = 10    # 회피 시 AFD 뉴런 자극 강도
-
-    # 2. AFD 온도 감각 뉴런 자극
-    stimulus = 0
-    if temperature_difference > TEMPERATURE_AVOIDANCE_THRESHOLD:
-        # 온도 차이가 크면 강하게 자극 (회피 반응)
-        stimulus = TEMPERATURE_AVOIDANCE_STIMULUS
-        temp_reaction = "회피"
-    elif temperature_difference < TEMPERATURE_SATISFIED_THRESHOLD:
-        # 선호 온도에 가까우면 약하게 자극 (만족 반응)
-        stimulus = TEMPERATURE_SATISFIED_STIMULUS
-        temp_reaction = "만족"
-    else:
-        temp_reaction = "중립"
-    brain.PostSynaptic['AFDL'][brain.NextSignalIntensityIndex] += stimulus
-    brain.PostSynaptic['AFDR'][brain.NextSignalIntensityIndex] += stimulus
-    
-    
-    
-    # 3. 뇌 신경망 업데이트 (302개 뉴런 시뮬레이션)
-    brain.update()
-    
-    # 4. 근육 신호에 따른 이동 방향과 속도 계산
-    SCALING_FACTOR = 20
-    # 좌우 근육 신호 차이 → 회전 각도
-    new_angle_offset = (brain.AccumulatedLeftMusclesSignal - brain.AccumulatedRightMusclesSignal) / SCALING_FACTOR
-    
-    # A: 기본 이동 각도 (뇌의 신호에 따른 방향)
-    brain_target_angle = facing_angle + new_angle_offset * math.pi
-    target_angle = brain_target_angle  # 일단 뇌의 신호로 설정 (먹이가 있으면 update()에서 하이브리드 AI로 수정됨)
-    
-    # 좌우 근육 신호 합계 → 이동 속도
-    target_speed = ((abs(brain.AccumulatedLeftMusclesSignal) + abs(brain.AccumulatedRightMusclesSignal)) / (SCALING_FACTOR * 5))
-    speed_change_rate = ((target_speed - current_speed) / (SCALING_FACTOR * 1.5))
-
-# ----------------------------
-# k 값 업데이트 (배고픔 증가)
-# ----------------------------
-def update_hungry_value():
-    """
-    시간 경과에 따라 배고픔 수치를 증가시킵니다.
-    
-    배고픔(hungry_value)은 하이브리드 AI의 k 값으로 사용됩니다:
-    - 0.0: 배부름 → 뇌 신호 100% 우선
-    - 1.0: 매우 배고픔 → 먹이 탐색 100% 우선
-    
-    증가율: 1초당 0.01 (HUNGRY_LEVEL_INCREASE_AMOUNT)
-    """
-    global hungry_value
-    current_time = pygame.time.get_ticks()
-    elapsed_time = current_time - start_time
-    # 경과 시간에 따라 배고픔 값 계산 (1초마다 0.01씩 증가)
-    seconds_passed = elapsed_time // HUNGRY_LEVEL_INCREASE_INTERVAL
-    hungry_value = min(1.0, HUNGRY_LEVEL_INITIAL_VALUE + seconds_passed * HUNGRY_LEVEL_INCREASE_AMOUNT)
-
-# ----------------------------
-# 배고픔 감소 (먹이를 먹었을 때)
-# ----------------------------
-def decrease_hunger():
-    """
-    먹이를 섭취했을 때 배고픔 수치를 감소시킵니다.
-    
-    감소량: 0.1 (HUNGRY_LEVEL_DECREASE_ON_EAT)
-    시작 시간을 재조정하여 지속적인 배고픔 증가 시스템과 동기화합니다.
-    """
-    global hungry_value, start_time
-    hungry_value = max(0.0, hungry_value - HUNGRY_LEVEL_DECREASE_ON_EAT)
-    
-    # 시작 시간을 재조정하여 감소된 배고픔 값을 반영
-    current_time = pygame.time.get_ticks()
-    
-    # hungry_value = 0.5 + seconds_passed * 0.01 공식에서 역산
-    if hungry_value >= HUNGRY_LEVEL_INITIAL_VALUE:
-        seconds_passed = (hungry_value - HUNGRY_LEVEL_INITIAL_VALUE) / HUNGRY_LEVEL_INCREASE_AMOUNT
-        start_time = current_time - int(seconds_passed * HUNGRY_LEVEL_INCREASE_INTERVAL)
-    else:
-        # hungry_value가 초기값 미만이면 시작 시간을 미래로 설정
-        seconds_to_reach_initial = (HUNGRY_LEVEL_INITIAL_VALUE - hungry_value) / HUNGRY_LEVEL_INCREASE_AMOUNT
-        start_time = current_time + int(seconds_to_reach_initial * HUNGRY_LEVEL_INCREASE_INTERVAL)
-
-# ----------------------------
-# 벌레 물리/이동 업데이트
-# ----------------------------
-def update():
+# ============================================================
+# CSV 저장 함수
+# ============================================================
+def record_neuron_voltages():
     """
-    벌레의 물리 시뮬레이션과 하이브리드 AI를 업데이트합니다.
-    
-    === 하이브리드 AI 공식 ===
-    최종 이동 방향 = (1 - hungry_value) × brain_signal + hungry_value × food_direction
-    
-    - brain_signal (A): C. elegans 뇌 신경망의 근육 신호에 따른 방향
-    - food_direction (B): 가장 가까운 먹이를 향한 방향
-    - hungry_value (k): 0.0~1.0 사이의 배고픔 수치
-    
-    배고픔이 낮으면 뇌 신호를 우선하고, 높으면 먹이 탐색을 우선합니다.
-    
-    추가 기능:
-    - 화면 경계 충돌 시 코 터치 뉴런 자극
-    - 먹이 섭취 범위 내에서 먹이 제거 및 배고픔 감소
+    현재 모든 뉴런(근육 제외)의 전위값을 neuron_voltage_history 에 한 줄 추가합니다.
+    (화면 실행: 매 프레임, 입력 기록 재생: 매 스텝)
     """
-    global current_speed, facing_angle, target_position, last_touch_time, last_food_sense_time, target_angle
-    
-    # 속도 업데이트
-    current_speed += speed_change_rate
-
-    # A: 기본 이동 각도 (target_angle은 update_brain()에서 이미 설정됨)
-    brain_target_angle = target_angle
+    global frame_count
+    frame_count += 1
+    # 근육을 제외한 뉴런만 필터링
+    muscle_prefixes = ['MDL', 'MDR', 'MVL', 'MVR']
+    neuron_names = sorted([n for n in brain.PostSynaptic.keys() 
+                          if not any(n.startswith(prefix) for prefix in muscle_prefixes)])
     
-    # B: 먹이를 향한 이동 각도 (초기값은 뇌의 각도)
-    food_target_angle = target_angle
+    # 현재 프레임의 모든 뉴런 전위값 수집
+    voltage_data = [frame_count, world.time * 1000]  # 프레임 번호와 시뮬레이션 시간(ms)
+    for neuron in neuron_names:
+        voltage = brain.PostSynaptic[neuron][brain.CurrentSignalIntensityIndex]
+        voltage_data.append(voltage)
     
-    # === 하이브리드 AI: 먹이 감지 및 방향 계산 ===
-    if len(food_positions) > 0:
-        # 가장 가까운 먹이 찾기
-        closest_food = None
-        min_distance = float('inf')
-        
-        for food in food_positions:
-            distance = math.hypot(target_position[0] - food[0], target_position[1] - food[1])
-            if distance < min_distance:
-                min_distance = distance
-                closest_food = food
-        
-        # 먹이가 감지 범위 내에 있으면 먹이 방향 계산
-        if closest_food and min_distance <= FOOD_SENSE_DISTANCE:
-            # 먹이 방향 벡터 계산
-            food_dx = closest_food[0] - target_position[0]
-            food_dy = closest_food[1] - target_position[1]
-            food_target_angle = math.atan2(-food_dy, food_dx)  # y축 반전 보정
-            
-            # === 하이브리드 AI 공식 적용 ===
-            # 최종 방향 = (1-k)A + kB
-            # A = 뇌 신호에 따른 방향
-            # B = 먹이를 향한 방향
-            # k = 배고픔 수치 (0.0~1.0)
-            target_angle = (1 - hungry_value) * brain_target_angle + hungry_value * food_target_angle
-
-    # 각도 차이 계산 및 부드러운 회전
-    angle_difference = facing_angle - target_angle
-    # 각도를 -π ~ π 범위로 정규화
-    if abs(angle_difference) > math.pi:
-        if facing_angle > target_angle:
-            angle_difference = -1 * (2 * math.pi - facing_angle + target_angle)
-        else:
-            angle_difference = 2 * math.pi - target_angle + facing_angle
-
-    # 부드러운 회전 적용
-    if angle_difference > 0:
-        facing_angle -= 0.1
-    elif angle_difference < 0:
-        facing_angle += 0.1
-
-    # 위치 업데이트
-    target_position[0] += math.cos(facing_angle) * current_speed
-    target_position[1] -= math.sin(facing_angle) * current_speed
-
-    # 화면 경계 충돌 검사 및 코 터치 뉴런 자극
-    if target_position[0] < 0:
-        target_position[0] = 0
-        brain.IsStimulatedNoseTouchNeurons = True
-        last_touch_time = pygame.time.get_ticks()
-    elif target_position[0] > WINDOW_WIDTH - NEURON_PANEL_WIDTH:
-        target_position[0] = WINDOW_WIDTH - NEURON_PANEL_WIDTH
-        brain.IsStimulatedNoseTouchNeurons = True
-        last_touch_time = pygame.time.get_ticks()
-
-    if target_position[1] < 0:
-        target_position[1] = 0
-        brain.IsStimulatedNoseTouchNeurons = True
-        last_touch_time = pygame.time.get_ticks()
-    elif target_position[1] > WINDOW_HEIGHT:
-        target_position[1] = WINDOW_HEIGHT
-        brain.IsStimulatedNoseTouchNeurons = True
-        last_touch_time = pygame.time.get_ticks()
-
-    # 먹이 감지 및 섭취
-    for f in food_positions[:]:
-        distance = math.hypot(target_position[0] - f[0], target_position[1] - f[1])
-        
-        # 먹이 감지 범위 내: 먹이 감각 뉴런 자극
-        if distance <= FOOD_SENSE_DISTANCE:
-            brain.IsStimulatedFoodSenseNeurons = True
-            last_food_sense_time = pygame.time.get_ticks()
-            
-            # 먹이 섭취 범위 내: 먹이 제거 및 배고픔 감소
-            if distance <= FOOD_EAT_DISTANCE:
-                food_positions.remove(f)
-                decrease_hunger()
-
-    # 벌레 몸체 체인 업데이트 (역운동학)
-    worm_chain.update(target_position)
-
-worm_chain = InverseKinematicsChain(200, 1)
+    neuron_voltage_history.append(voltage_data)
 
-# ============================================================
-# CSV 저장 함수
-# ============================================================
-def save_neuron_data_to_csv():
+def save_neuron_data_to_csv(filename="neuron_voltages.csv"):
     """
     기록된 모든 뉴런의 전위값을 CSV 파일로 저장합니다.
     """
@@ -1058,8 +889,6 @@ def save_neuron_data_to_csv():
     neuron_names = sorted([n for n in brain.PostSynaptic.keys() 
                           if not any(n.startswith(prefix) for prefix in muscle_prefixes)])
     
-    filename = "neuron_voltages.csv"
-    
     try:
         with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
             writer = csv.writer(csvfile)
@@ -1077,11 +906,425 @@ def save_neuron_data_to_csv():
     except Exception as e:
         print(f"CSV 파일 저장 중 오류 발생: {e}")
 
+# ============================================================
+# 체크포인트 저장/복원
+# ============================================================
+def capture_simulation():
+    """
+    현재 시뮬레이션의 전체 상태를 Checkpoint 로 모읍니다.
+
+    신경망, 난수 상태, 벌레 자세/몸체 점, 먹이, 온도 맵, 배고픔과 타이머를 포함합니다.
+    타이머는 시각 대신 "현재로부터 경과한 시간(밀리초)"으로 저장하여
+    다른 실행에서 불러와도 같은 상태가 되도록 합니다.
+    """
+    now = world.time
+    state = checkpoint.Checkpoint()
+    checkpoint.capture_brain(brain, state)
+    checkpoint.capture_random(state)
+    if population is not None:
+        checkpoint.capture_ensemble(population.brains, state, prefix='population.brain.')
+        for name, array in population.get_arrays(now).items():
+            state.arrays['population.' + name] = array
+
+    state.arrays['worm.body'] = worm.body.points.copy()
+    state.arrays['food.positions'] = food_index.positions_array()
+    state.arrays['food.tags'] = food_index.tags_array()
+    if odour_field is not None:
+        state.arrays['food.odour'] = odour_field.values.copy()
+    state.arrays['temperature.values'] = temperature_field.values.copy()
+    state.arrays['temperature.painted'] = temperature_field.painted.copy()
+    if temperature_dynamics is not None:
+        state.arrays['temperature.source_mask'] = temperature_dynamics.source_mask.copy()
+        state.arrays['temperature.source_values'] = temperature_dynamics.source_values.copy()
+
+    state.values.update({
+        'worm.target_position': list(worm.position),
+        'worm.facing_angle': worm.facing_angle,
+        'worm.target_angle': worm.target_angle,
+        'worm.current_speed': worm.current_speed,
+        'worm.target_speed': worm.target_speed,
+        'worm.speed_change_rate': worm.speed_change_rate,
+        'hunger.value': worm.hungry_value,
+        'hunger.elapsed': (now - worm.hunger_start_time) * 1000,
+        'temperature.preferred': worm.preferred_temperature,
+        'temperature.at_worm': worm.temperature_at_worm,
+        'temperature.reaction': worm.temperature_reaction,
+        'temperature.previous_at_worm': worm.previous_temperature,
+        'temperature.afd_stimulus': worm.afd_stimulus,
+        'timer.brain_update_age': (now - worm.last_brain_update) * 1000,
+        'timer.touch_age': (now - worm.last_touch_time) * 1000 if worm.last_touch_time is not None else None,
+        'timer.food_sense_age': ((now - worm.last_food_sense_time) * 1000
+                                 if worm.last_food_sense_time is not None else None),
+        'frame_count': frame_count,
+        'food.regrowth': food_regrowth.get_state(),
+        'food.patch_rng': world.patch_rng.bit_generator.state,
+    })
+    return state
+
+def restore_simulation(state):
+    """
+    capture_simulation() 으로 모은 상태를 복원합니다.
+
+    Args:
+        state: Checkpoint
+    """
+    global frame_count
+
+    now = world.time
+    checkpoint.restore_brain(brain, state)
+    checkpoint.restore_random(state)
+    if population is not None and 'population.positions' in state.arrays:
+        checkpoint.restore_ensemble(population.brains, state, prefix='population.brain.')
+        population.set_arrays({name[len('population.'):]: array for name, array in state.arrays.items()
+                               if name.startswith('population.')}, now)
+
+    world.reset_food(state.arrays['food.positions'], state.arrays.get('food.tags', -1))
+    if 'food.regrowth' in state.values:
+        food_regrowth.set_state(state.values['food.regrowth'])
+    if 'food.patch_rng' in state.values:
+        world.patch_rng.bit_generator.state = state.values['food.patch_rng']
+    if odour_field is not None and 'food.odour' in state.arrays:
+        odour_field.values[...] = state.arrays['food.odour']
+        odour_field.grid.mark_dirty()
+    temperature_field.values[...] = state.arrays['temperature.values']
+    temperature_field.painted[...] = state.arrays['temperature.painted']
+    temperature_field.mark_dirty()
+    if temperature_dynamics is not None and 'temperature.source_mask' in state.arrays:
+        temperature_dynamics.source_mask[...] = state.arrays['temperature.source_mask']
+        temperature_dynamics.source_values[...] = state.arrays['temperature.source_values']
+
+    values = state.values
+    worm.position = list(values['worm.target_position'])
+    worm.facing_angle = values['worm.facing_angle']
+    worm.target_angle = values['worm.target_angle']
+    worm.current_speed = values['worm.current_speed']
+    worm.target_speed = values['worm.target_speed']
+    worm.speed_change_rate = values['worm.speed_change_rate']
+    worm.hungry_value = values['hunger.value']
+    worm.hunger_start_time = now - values['hunger.elapsed'] / 1000
+    worm.preferred_temperature = values['temperature.preferred']
+    worm.temperature_at_worm = values['temperature.at_worm']
+    worm.temperature_reaction = values['temperature.reaction']
+    worm.previous_temperature = values.get('temperature.previous_at_worm')
+    worm.afd_stimulus = values.get('temperature.afd_stimulus', 0.0)
+    worm.last_brain_update = now - values['timer.brain_update_age'] / 1000
+    touch_age, food_sense_age = values['timer.touch_age'], values['timer.food_sense_age']
+    worm.last_touch_time = now - touch_age / 1000 if touch_age is not None else None
+    worm.last_food_sense_time = now - food_sense_age / 1000 if food_sense_age is not None else None
+    body = state.arrays.get('worm.body')
+    if body is not None and body.shape == worm.body.points.shape:
+        worm.body.points[...] = body
+    else:
+        worm.body.reset(worm.position, worm.facing_angle)  # 몸체가 없는 (이전 형식) 체크포인트
+    frame_count = values['frame_count']
+    sim_clock.reset_interpolation()  # 불러오기 전 자세와 보간하지 않음
+
+def activate_world(target):
+    """
+    화면에 보여 주고 입력을 받을 World 를 바꿉니다. (분기 전환)
+
+    main.py 의 전역 이름(world, worm, brain, 먹이 / 온도 / 냄새 객체)과 화면 레이어를 target 으로 옮기고,
+    나머지 분기는 시계의 background_worlds 로 계속 함께 진행합니다.
+    """
+    global world, worm, brain, population
+    global food_index, food_regrowth, odour_field, temperature_field, temperature_dynamics
+    if food_overlay in world.food_observers:
+        world.food_observers.remove(food_overlay)
+    world = target
+    worm = world.worms[0]
+    brain = worm.brain
+    population = world.populations[0] if world.populations else None
+    food_index = world.food
+    food_regrowth = world.food_regrowth
+    odour_field = world.odour_field
+    temperature_field = world.temperature_field
+    temperature_dynamics = world.temperature_dynamics
+
+    world.food_observers.append(food_overlay)
+    food_overlay.store = food_index
+    food_overlay.rebuild()
+    temperature_overlay.field = temperature_field
+    temperature_overlay.invalidate()
+    if stroke_player is not None:
+        stroke_player.field = temperature_field  # 남은 브러쉬 스크립트는 보여 주는 분기에 적용
+    sim_clock.world = world
+    sim_clock.background_worlds = [branch for branch in simulation_branches if branch is not world]
+    sim_clock.reset_interpolation()
+
+def fork_simulation():
+    """
+    현재 시뮬레이션을 분기합니다. (F6)
+
+    World.fork() 로 같은 상태의 새 World 를 만들어 전환합니다. 신경망은 커넥톰을 공유하고 상태 배열만 복사합니다.
+    이전 분기도 화면 밖에서 같은 스텝으로 계속 진행하므로, 먹이 위치나 온도 브러쉬를 다르게 적용한
+    여러 미래를 같은 시각에서 나란히 비교할 수 있습니다.
+    """
+    global current_branch
+    if not simulation_branches:
+        simulation_branches.append(world)
+    simulation_branches.append(world.fork())
+    current_branch = len(simulation_branches) - 1
+    activate_world(simulation_branches[current_branch])
+
+def switch_simulation_branch():
+    """
+    다음 분기로 전환합니다. (F7)
+
+    모든 분기는 함께 진행 중이므로 보여 주는 World 만 바뀝니다.
+    """
+    global current_branch
+    if len(simulation_branches) < 2:
+        return
+    current_branch = (current_branch + 1) % len(simulation_branches)
+    activate_world(simulation_branches[current_branch])
+
+# ----------------------------
+# 온도 환경(arena) 저장 / 불러오기
+# ----------------------------
+def save_arena_file(path):
+    """현재 온도 필드, 열원, 먹이 위치를 온도 환경 파일로 저장합니다."""
+    temperature_arena.save_arena(path, temperature_field, temperature_dynamics, food_index.positions_array())
+
+def load_arena_file(path):
+    """
+    온도 환경 파일을 불러와 실행 중인 시뮬레이션에 적용합니다.
+    
+    온도 필드는 제자리 복사되므로 실행 중에도 바로 환경을 바꿀 수 있습니다.
+    파일에 먹이 위치가 있으면 먹이도 바뀝니다.
+    """
+    arena = temperature_arena.load_arena(path)
+    temperature_arena.apply_arena(arena, temperature_field, temperature_dynamics)
+    if arena.food_positions is not None:
+        world.reset_food(arena.food_positions)
+
+def apply_next_landscape():
+    """다음 온도 지형 생성기를 기본 파라미터로 적용합니다. (G 키)"""
+    global landscape_index
+    names = list(temperature_landscape.LANDSCAPES)
+    name = names[landscape_index % len(names)]
+    landscape_index += 1
+    temperature_landscape.generate(temperature_field, name)
+    print(f"온도 지형 '{name}'을 생성했습니다.")
+
+landscape_index = 0
+
+# 분기 World 목록 (World.fork(), 보여 주지 않는 분기도 같은 스텝으로 함께 진행)
+simulation_branches = []
+current_branch = 0
+
+if START_ARENA:
+    load_arena_file(START_ARENA)
+
+if FOOD_PATCHES:
+    food_regrowth.place_all(world.add_food_points)
+
+if START_LANDSCAPE:
+    temperature_landscape.generate(temperature_field, START_LANDSCAPE[0], **START_LANDSCAPE[1])
+
+# 브러쉬 스크립트 기록 / 재생
+stroke_recorder = None
+stroke_player = None
+if STROKE_SCRIPT:
+    stroke_player = StrokePlayer(load_stroke_script(STROKE_SCRIPT), temperature_field)
+    if STROKE_SCRIPT_AT_LOAD:
+        stroke_player.apply_all()
+    else:
+        # 예약된 브러쉬 스크립트 이벤트는 매 스텝 직전에 적용 (화면 프레임 속도와 무관)
+        sim_clock.before_step.append(lambda: stroke_player.finished() or stroke_player.advance(world.time))
+
+if START_CHECKPOINT:
+    restore_simulation(checkpoint.load_checkpoint(START_CHECKPOINT))
+
+# ----------------------------
+# 사용자 입력 기록 / 재생 (input_journal.py)
+# ----------------------------
+def journal_config():
+    """재생할 때 기록할 때와 같아야 하는 시작 설정"""
+    config = {
+        'step': sim_clock.step,
+        'connectome_source': CONNECTOME_SOURCE,
+        'connectome_delta': CONNECTOME_DELTA,
+        'population_size': POPULATION_SIZE,
+        'population_body_points': POPULATION_BODY_POINTS,
+        'food_patches': FOOD_PATCHES,
+        'food_odour_enabled': FOOD_ODOUR_ENABLED,
+        'temperature_dynamics_enabled': TEMPERATURE_DYNAMICS_ENABLED,
+        'start_checkpoint': START_CHECKPOINT,
+        'start_arena': START_ARENA,
+        'start_landscape': START_LANDSCAPE,
+        'stroke_script': STROKE_SCRIPT,
+        'stroke_script_at_load': STROKE_SCRIPT_AT_LOAD,
+    }
+    for name in ('start_checkpoint', 'start_arena', 'stroke_script'):
+        if config[name]:
+            config[name + '_sha256'] = file_digest(config[name])
+    return json.loads(json.dumps(config))  # 튜플 → 리스트 (기록 파일과 같은 형태로 비교)
+
+# 재생 중 저장한 파일 {기록된 경로: 임시 폴더 안 경로} - 작업 폴더의 파일을 덮어쓰지 않음
+replay_directory = None
+replay_saved_files = {}
+
+def input_file_path(path, digest=None, saving=False):
+    """
+    입력 기록의 파일 경로를 실제로 읽고 쓸 경로로 바꿉니다.
+
+    기록 중에는 path 그대로 씁니다. 재생 중 저장은 임시 폴더에 하고, 불러오기는 재생 중 저장한 파일이
+    있으면 그것을, 없으면 path 의 파일 내용이 기록된 sha256(digest)과 같은지 확인한 뒤 씁니다.
+
+    Raises:
+        FileNotFoundError: 기록할 때 파일이 없어 불러오지 못한 경우 (재생에서도 같게 실패)
+        JournalFileMismatch: 재생 중 불러올 파일이 기록할 때와 다른 경우
+    """
+    if replay_directory is None:
+        return path
+    if saving:
+        replay_saved_files[path] = os.path.join(replay_directory, f"{len(replay_saved_files)}_{os.path.basename(path)}")
+        return replay_saved_files[path]
+    if path in replay_saved_files:
+        return replay_saved_files[path]
+    if digest is None:
+        raise FileNotFoundError(f"기록할 때 '{path}' 파일이 없었습니다")
+    if file_digest(path) != digest:
+        raise JournalFileMismatch(f"'{path}'의 내용이 기록할 때와 다릅니다")
+    return path
+
+def apply_input(kind, args):
+    """
+    기록 가능한 사용자 입력 하나를 시뮬레이션에 적용합니다. (실행 중 입력과 재생이 같은 함수를 사용)
+
+    Args:
+        kind: 입력 종류
+        args: 입력 인자 리스트
+    """
+    if kind == 'food':
+        world.add_food(*args)
+    elif kind == 'food_patch':
+        world.add_food_patch(*args)
+    elif kind == 'brush':
+        x, y, mode, previous_position, size, scale = args
+        apply_temperature_brush(x, y, BrushMode(mode),
+                                tuple(previous_position) if previous_position is not None else None, size, scale)
+    elif kind == 'preferred_temperature':
+        worm.preferred_temperature = args[0]
+    elif kind == 'landscape':
+        apply_next_landscape()
+    elif kind == 'fork':
+        fork_simulation()
+    elif kind == 'switch_branch':
+        switch_simulation_branch()
+    elif kind == 'save_checkpoint':
+        checkpoint.save_checkpoint(input_file_path(args[0], saving=True), capture_simulation())
+        print(f"체크포인트가 '{args[0]}'에 저장되었습니다.")
+    elif kind == 'load_checkpoint':
+        try:
+            restore_simulation(checkpoint.load_checkpoint(input_file_path(*args)))
+            print(f"체크포인트 '{args[0]}'를 불러왔습니다.")
+        except (OSError, ValueError, KeyError) as e:
+            print(f"체크포인트 불러오기 실패: {e}")
+    elif kind == 'save_arena':
+        save_arena_file(input_file_path(args[0], saving=True))
+        print(f"온도 환경이 '{args[0]}'에 저장되었습니다.")
+    elif kind == 'load_arena':
+        try:
+            load_arena_file(input_file_path(*args))
+            print(f"온도 환경 '{args[0]}'를 불러왔습니다.")
+        except (OSError, ValueError, KeyError) as e:
+            print(f"온도 환경 불러오기 실패: {e}")
+    else:
+        raise ValueError(f"알 수 없는 입력 종류입니다: {kind}")
+
+def record_input(kind, *args):
+    """사용자 입력을 현재 스텝 번호와 함께 입력 기록에 남깁니다."""
+    if input_journal is not None:
+        input_journal.record(sim_clock.step_count, world.time, kind, *args)
+
+def handle_input(kind, *args):
+    """사용자 입력을 기록한 뒤 적용합니다."""
+    record_input(kind, *args)
+    apply_input(kind, list(args))
+
+def state_digest():
+    """
+    화면과 무관한 시뮬레이션 전체 상태의 sha256 요약 (입력 기록 재생 결과 비교용)
+
+    capture_simulation() 의 배열과 값에서 그리기 전용 값(프레임 번호)을 뺀 것입니다.
+    """
+    state = capture_simulation()
+    digest = hashlib.sha256()
+    for name in sorted(state.arrays):
+        digest.update(name.encode())
+        digest.update(np.ascontiguousarray(state.arrays[name]).tobytes())
+    values = {name: value for name, value in state.values.items() if name != 'frame_count'}
+    values['clock.step_count'] = sim_clock.step_count
+    values['clock.time'] = world.time
+    digest.update(json.dumps(values, sort_keys=True).encode())
+    return digest.hexdigest()
+
+def replay_session():
+    """
+    REPLAY_JOURNAL 의 입력을 기록된 스텝에 맞춰 적용하며 화면 없이 최대 속도로 재생합니다.
+
+    재생 중 매 스텝 뉴런 전위를 기록하고(REPLAY_VOLTAGE_FILE), 끝난 상태를 저장한 뒤(REPLAY_CHECKPOINT_FILE)
+    기록 종료 시점의 상태 요약과 비교합니다.
+    시작 / 불러오기 파일의 내용이 기록할 때와 다르면 재생하지 않습니다.
+    """
+    global replay_directory
+    different = [name for name, value in journal_config().items() if replay_header['config'].get(name) != value]
+    changed_files = [name for name in different if name.endswith('_sha256')]
+    if changed_files:
+        print(f"재생 중단: 시작 파일의 내용이 기록할 때와 다릅니다 ({', '.join(changed_files)})")
+        return
+    if different:
+        print(f"경고: 기록할 때와 시작 설정이 다릅니다 ({', '.join(different)}) - 결과가 다를 수 있습니다.")
+
+    if REPLAY_VOLTAGE_FILE:
+        sim_clock.after_step.append(record_neuron_voltages)
+    started = time.perf_counter()
+    recorded_digest = None
+    with tempfile.TemporaryDirectory(prefix='replay_') as replay_directory:
+        try:
+            for step, _, kind, args in replay_events:
+                sim_clock.run_to(step)
+                if kind == 'end':
+                    recorded_digest = args[0] if args else None
+                    break
+                if kind not in TIME_CONTROL_KINDS:
+                    apply_input(kind, args)
+        except JournalFileMismatch as e:
+            print(f"재생 중단 ({sim_clock.step_count} 스텝): {e}")
+            return
+        finally:
+            replay_directory = None
+    elapsed = time.perf_counter() - started
+    print(f"재생 완료: {sim_clock.step_count} 스텝, 시뮬레이션 {world.time:.1f}초를 {elapsed:.1f}초에 진행")
+
+    if REPLAY_VOLTAGE_FILE:
+        save_neuron_data_to_csv(REPLAY_VOLTAGE_FILE)
+    checkpoint.save_checkpoint(REPLAY_CHECKPOINT_FILE, capture_simulation())
+    print(f"재생 후 상태를 '{REPLAY_CHECKPOINT_FILE}'에 저장했습니다.")
+    if recorded_digest is None:
+        print("기록에 종료 상태 요약이 없어 결과를 비교하지 않았습니다. (비정상 종료된 기록)")
+    elif recorded_digest == state_digest():
+        print("재생 결과가 기록한 실행과 같습니다.")
+    else:
+        print("경고: 재생 결과가 기록한 실행과 다릅니다.")
+
+input_journal = None
+if REPLAY_JOURNAL:
+    replay_session()
+    pygame.quit()
+    sys.exit()
+elif INPUT_JOURNAL_FILE:
+    input_journal = InputJournal(
+        INPUT_JOURNAL_FILE,
+        seeds={'random': SIMULATION_SEED, 'food_patch': FOOD_PATCH_SEED, 'population': POPULATION_SEED},
+        config=journal_config(),
+    )
+
 # ============================================================
 # 메인 게임 루프
 # ============================================================
 while True:
-    current_time = pygame.time.get_ticks()
     # ========================================
     # 이벤트 처리
     # ========================================
@@ -1089,6 +1332,8 @@ while True:
         # 창 닫기
         if event.type == pygame.QUIT:
             print("시뮬레이터 종료 중...")
+            if input_journal is not None:
+                input_journal.close(sim_clock.step_count, world.time, state_digest())
             save_neuron_data_to_csv()
             pygame.quit()
             sys.exit()
@@ -1099,8 +1344,11 @@ while True:
             # 뉴런 패널 영역 제외
             if mx < WINDOW_WIDTH - NEURON_PANEL_WIDTH:
                 if not debug_mode:
-                    # 일반 모드: 클릭으로 먹이 추가
-                    add_food([mx, my])
+                    # 일반 모드: 클릭으로 먹이 추가 (Shift + 클릭: 먹이 패치)
+                    if pygame.key.get_mods() & pygame.KMOD_SHIFT:
+                        handle_input('food_patch', mx, my)
+                    else:
+                        handle_input('food', mx, my)
                 elif debug_mode and event.button == 1:
                     # 디버그 모드: 왼쪽 버튼으로 온도 브러쉬 적용
                     mouse_pressed = True
@@ -1120,7 +1368,7 @@ while True:
                         new_temp = float(input_text)
                         # 유효 범위 검사 (8~25°C)
                         if PREFERRED_TEMPERATURE_MIN <= new_temp <= PREFERRED_TEMPERATURE_MAX:
-                            preferred_temperature = new_temp
+                            handle_input('preferred_temperature', new_temp)
                         input_text = ""
                         input_mode = False
                     except ValueError:
@@ -1144,6 +1392,35 @@ while True:
                     debug_mode = False  # 일반 모드 전환
                 elif event.key == pygame.K_2:
                     debug_mode = True  # 디버그 모드 전환
+                elif event.key == pygame.K_SPACE:
+                    sim_clock.toggle_pause()  # Space: 일시정지 / 재개
+                    record_input('pause', sim_clock.paused)
+                elif event.key == pygame.K_RIGHTBRACKET:
+                    sim_clock.faster()  # ]: 배속 올리기
+                    record_input('warp', sim_clock.warp)
+                elif event.key == pygame.K_LEFTBRACKET:
+                    sim_clock.slower()  # [: 배속 내리기
+                    record_input('warp', sim_clock.warp)
+                elif event.key == pygame.K_u:
+                    sim_clock.toggle_unbounded()  # U: 무제한 실행 켜기/끄기
+                    record_input('unbounded', sim_clock.unbounded)
+                elif event.key == pygame.K_F5:
+                    handle_input('save_checkpoint', CHECKPOINT_FILE)  # F5: 체크포인트 저장
+                elif event.key == pygame.K_F9:
+                    # F9: 체크포인트 불러오기 (재생 확인용으로 파일 내용의 sha256 도 기록)
+                    handle_input('load_checkpoint', CHECKPOINT_FILE, file_digest(CHECKPOINT_FILE))
+                elif event.key == pygame.K_F6:
+                    handle_input('fork')  # F6: 현재 상태에서 분기 생성
+                elif event.key == pygame.K_F7:
+                    handle_input('switch_branch')  # F7: 다음 분기로 전환
+                elif event.key == pygame.K_F2 and debug_mode:
+                    handle_input('save_arena', ARENA_FILE)  # F2: 온도 환경 저장
+                elif event.key == pygame.K_F3 and debug_mode:
+                    handle_input('load_arena', ARENA_FILE, file_digest(ARENA_FILE))  # F3: 온도 환경 불러오기
+                elif event.key == pygame.K_r and debug_mode:
+                    toggle_stroke_recording()  # R: 브러쉬 입력 기록 시작/저장
+                elif event.key == pygame.K_g and debug_mode:
+                    handle_input('landscape')  # G: 온도 지형 생성
                 elif event.key == pygame.K_p and debug_mode:
                     # P: 선호 온도 설정 모드 진입
                     input_mode = True
@@ -1173,7 +1450,14 @@ while True:
     if debug_mode and mouse_pressed:
         mx, my = pygame.mouse.get_pos()
         if mx < WINDOW_WIDTH - NEURON_PANEL_WIDTH:
-            apply_temperature_brush(mx, my, brush_mode)
+            handle_input('brush', mx, my, brush_mode.value,
+                         list(last_brush_position) if last_brush_position is not None else None,
+                         brush_size, temperature_scale)
+            last_brush_position = (mx, my)
+        else:
+            last_brush_position = None
+    else:
+        last_brush_position = None
 
     # ========================================
     # 화면 지우기
@@ -1184,22 +1468,17 @@ while True:
     # 게임 로직 업데이트
     # ========================================
     
-    # 배고픔 수치 업데이트 (시간 경과에 따라 증가)
-    update_hungry_value()
-    
-    # 뇌 신경망 업데이트 (500ms마다)
-    if current_time - last_brain_update >= BRAIN_UPDATE_INTERVAL:
-        update_brain()
-        last_brain_update = current_time
-    
-    # 벌레 이동 및 물리 시뮬레이션 업데이트
-    update()
+    # 지난 프레임 경과 시간 × 배속만큼 고정 스텝(1/60초)으로 시뮬레이션 진행 (일시정지 중에는 진행하지 않음)
+    # 그리기가 느려 프레임이 늦어지면 한 프레임에 여러 스텝을 진행하므로 시뮬레이션 결과는 같음
+    # (배고픔, 뇌 업데이트, 이동/감각/섭취, 몸체, 온도 확산, 먹이 재성장, 냄새 확산, 자극 해제)
+    sim_clock.advance(clock.get_time() / 1000)
     
     # ========================================
     # 렌더링
     # ========================================
     draw_temperature_map()  # 온도 맵 시각화 (디버그 모드)
     draw_food()  # 먹이 그리기
+    draw_population()  # 벌레 무리 그리기
     draw_worm()  # 벌레 그리기
     draw_debug_info()  # 디버그 정보 (감지 범위 등)
     draw_adex_parameters()  # AdEx 모델 파라미터 표시 (디버그 모드에서만)
@@ -1243,32 +1522,9 @@ while True:
         screen.blit(hint_surf, hint_rect)
 
     pygame.display.flip()
-    clock.tick(60)
+    clock.tick(RENDER_FRAME_RATE)
 
-    # JavaScript처럼 2초 후에 뉴런 자극 리셋
-    brain.IsStimulatedHungerNeurons = True
-    
-    # 터치 자극은 2초 후 리셋
-    if last_touch_time > 0 and current_time - last_touch_time >= NEURON_RESET_TIME:
-        brain.IsStimulatedNoseTouchNeurons = False
-    
-    # 음식 감지 자극은 2초 후 리셋
-    if last_food_sense_time > 0 and current_time - last_food_sense_time >= NEURON_RESET_TIME:
-        brain.IsStimulatedFoodSenseNeurons = False
-    
     # ========================================
     # 뉴런 전위값 기록
     # ========================================
-    frame_count += 1
-    # 근육을 제외한 뉴런만 필터링
-    muscle_prefixes = ['MDL', 'MDR', 'MVL', 'MVR']
-    neuron_names = sorted([n for n in brain.PostSynaptic.keys() 
-                          if not any(n.startswith(prefix) for prefix in muscle_prefixes)])
-    
-    # 현재 프레임의 모든 뉴런 전위값 수집
-    voltage_data = [frame_count, current_time]  # 프레임 번호와 시간(ms)
-    for neuron in neuron_names:
-        voltage = brain.PostSynaptic[neuron][brain.CurrentSignalIntensityIndex]
-        voltage_data.append(voltage)
-    
-    neuron_voltage_history.append(voltage_data)
+    record_neuron_voltages()
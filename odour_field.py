@@ -0,0 +1,201 @@
+# ============================================================
+# odour_field.py - 먹이 냄새 농도 필드
+# ============================================================
+#
+# 먹이 하나하나가 냄새를 내뿜고, 냄새가 격자 위에서 퍼지며(확산)
+# 점점 사라지는(분해) 농도 필드입니다.
+#
+#   dC/dt = D ∇²C − λ C + S
+#
+# - S: 먹이가 있는 격자점의 방출량 (먹이 추가/삭제 시 해당 격자점만 갱신, O(1))
+# - 스텝 계산은 열 확산과 같은 5점 스텐실 배열 연산 한 번 (먹이 수와 무관)
+# - 고정 간격(substep_rate)의 작은 스텝으로 나누어 계산 (프레임 속도와 무관)
+# - 조회: 농도 / 농도 기울기의 쌍선형 보간 (O(1))
+#
+# 농도 값 자체는 단위가 없는 상대값이며, 먹이 감각 뉴런(ADF/ASG/ASI/ASJ)의
+# 자극 세기를 정하는 데 사용합니다.
+# ============================================================
+
+import numpy as np
+
+from temperature_dynamics import neumann_laplacian
+from temperature_field import TemperatureField
+
+
+class OdourField:
+    """
+    먹이 냄새 농도 필드
+
+    속성:
+        grid: 농도를 담는 격자 (TemperatureField 의 격자/보간/기울기 계산을 그대로 사용, 기본값 0)
+        values: (rows, cols) 냄새 농도 (grid.values 와 같은 배열)
+        emission: (rows, cols) 격자점별 초당 방출량
+        source_count: (rows, cols) 격자점별 냄새 원천(먹이) 수
+        diffusivity: 확산 계수 D (픽셀²/초)
+        decay_rate: 분해 속도 λ (1/초)
+        emission_rate: 먹이 하나의 초당 방출량
+    """
+
+    def __init__(self, width, height, resolution=10, origin=(0, 0), diffusivity=1000.0,
+                 decay_rate=0.1, emission_rate=50.0, substep_rate=50.0, max_substeps=8):
+        """
+        Args:
+            width, height: 필드 영역 크기 (픽셀)
+            resolution: 격자 간격 (픽셀)
+            origin: 영역 왼쪽 위 좌표
+            diffusivity: 확산 계수 (픽셀²/초)
+            decay_rate: 분해 속도 (1/초) - 냄새가 퍼지는 거리는 약 √(D/λ) 픽셀
+            emission_rate: 먹이 하나의 초당 방출량
+            substep_rate: 초당 스텝 수 (Hz)
+            max_substeps: 한 번에 계산하는 최대 스텝 수 (넘는 시간은 버림)
+
+        Raises:
+            ValueError: 스텝 간격에 비해 확산 계수나 분해 속도가 너무 커서 계산이 불안정한 경우
+        """
+        self.grid = TemperatureField(width, height, resolution=resolution, default_temperature=0.0, origin=origin)
+        self.values = self.grid.values
+        self.diffusivity = diffusivity
+        self.decay_rate = decay_rate
+        self.emission_rate = emission_rate
+        self.substep_rate = substep_rate
+        self.max_substeps = max_substeps
+        self.check_stability()
+
+        self.emission = np.zeros(self.values.shape, dtype=np.float64)
+        self.source_count = np.zeros(self.values.shape, dtype=np.int64)
+
+        self._accumulated_time = 0.0
+        self._laplacian = np.empty_like(self.values)
+
+    def check_stability(self):
+        """
+        명시적 오일러 방법의 안정 조건을 검사합니다.
+
+        Raises:
+            ValueError: D·Δt/h² > 1/4 또는 λ·Δt > 1 인 경우
+        """
+        dt = 1.0 / self.substep_rate
+        resolution = self.grid.resolution
+        diffusion_number = self.diffusivity * dt / resolution ** 2
+        if diffusion_number > 0.25:
+            raise ValueError(
+                f"냄새 확산 계산이 불안정합니다 (D·Δt/h² = {diffusion_number:.3f} > 0.25): "
+                f"substep_rate 를 {self.diffusivity * 4 / resolution ** 2:.1f} Hz 이상으로 설정하세요")
+        if self.decay_rate * dt > 1.0:
+            raise ValueError(f"분해 속도가 스텝 간격에 비해 너무 큽니다 (λ·Δt = {self.decay_rate * dt:.3f} > 1)")
+
+    # ========================================
+    # 냄새 원천 (먹이)
+    # ========================================
+
+    def add_source(self, x, y):
+        """(x, y) 에 가장 가까운 격자점에 먹이 하나만큼의 방출량을 더합니다. (영역 밖은 무시)"""
+        node = self.grid.nearest_node(x, y)
+        if node is None:
+            return
+        self.source_count[node] += 1
+        self.emission[node] += self.emission_rate
+
+    def remove_source(self, x, y):
+        """add_source(x, y) 로 더한 방출량을 뺍니다."""
+        node = self.grid.nearest_node(x, y)
+        if node is None or self.source_count[node] == 0:
+            return
+        self.source_count[node] -= 1
+        if self.source_count[node] == 0:
+            self.emission[node] = 0.0  # 빼기를 반복해 남는 반올림 오차 제거
+        else:
+            self.emission[node] -= self.emission_rate
+
+    def add_sources(self, positions):
+        """
+        여러 먹이의 방출량을 한 번에 더합니다. (먹이 하나씩 add_source() 한 것과 같음)
+
+        Args:
+            positions: (N, 2) 먹이 위치 배열
+        """
+        points = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        gy, gx = self.grid.to_grid(points[:, 0], points[:, 1])
+        i, j = np.round(gy).astype(np.int64), np.round(gx).astype(np.int64)
+        inside = (i >= 0) & (i < self.grid.rows) & (j >= 0) & (j < self.grid.cols)
+        counts = np.zeros_like(self.source_count)
+        np.add.at(counts, (i[inside], j[inside]), 1)
+        self.source_count += counts
+        self.emission += counts * self.emission_rate
+
+    def set_sources(self, positions):
+        """기존 원천을 모두 지우고 positions((N, 2) 배열) 의 먹이로 다시 만듭니다."""
+        self.clear_sources()
+        self.add_sources(positions)
+
+    def clear_sources(self):
+        """모든 냄새 원천을 제거합니다. (이미 퍼진 냄새는 분해될 때까지 남음)"""
+        self.emission.fill(0.0)
+        self.source_count.fill(0)
+
+    def clear(self):
+        """냄새 농도를 모두 0 으로 만듭니다. (원천은 유지)"""
+        self.values.fill(0.0)
+        self.grid.mark_dirty()
+
+    # ========================================
+    # 조회
+    # ========================================
+
+    def concentration_at(self, x, y):
+        """특정 위치의 냄새 농도 (쌍선형 보간)"""
+        return self.grid.sample(x, y)
+
+    def gradient_at(self, x, y):
+        """특정 위치의 냄새 농도 기울기 (dC/dx, dC/dy, 1/픽셀)"""
+        return self.grid.gradient_at(x, y)
+
+    def concentration_many(self, xs, ys):
+        """여러 위치의 냄새 농도 배열"""
+        return self.grid._interpolate_many(self.values, xs, ys)
+
+    def gradient_many(self, xs, ys):
+        """여러 위치의 냄새 농도 기울기 배열 (dC/dx, dC/dy)"""
+        return self.grid.gradient_many(xs, ys)
+
+    # ========================================
+    # 시간 진행
+    # ========================================
+
+    def advance(self, elapsed):
+        """
+        경과 시간만큼 스텝을 계산합니다. (남는 시간은 다음 호출로 넘김)
+
+        Args:
+            elapsed: 경과 시간 (초)
+
+        Returns:
+            int: 계산한 스텝 수
+        """
+        dt = 1.0 / self.substep_rate
+        self._accumulated_time += elapsed
+        steps = int(self._accumulated_time / dt)
+        if steps > self.max_substeps:
+            # 밀린 시간은 버려서 한 번의 비용을 일정하게 유지
+            steps = self.max_substeps
+            self._accumulated_time = 0.0
+        else:
+            self._accumulated_time -= steps * dt
+
+        for _ in range(steps):
+            self.step()
+        if steps:
+            self.grid.mark_dirty()
+        return steps
+
+    def step(self):
+        """스텐실 한 번으로 확산, 분해, 방출을 한 스텝 계산합니다."""
+        dt = 1.0 / self.substep_rate
+        values = self.values
+        laplacian = self._laplacian
+
+        neumann_laplacian(values, laplacian)
+        laplacian *= self.diffusivity * dt / self.grid.resolution ** 2
+        values += laplacian
+        values *= 1.0 - self.decay_rate * dt
+        values += self.emission * dt
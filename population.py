@@ -0,0 +1,337 @@
+# ============================================================
+# population.py - 벌레 무리 (구조체 배열 방식)
+# ============================================================
+#
+# 벌레 수백 ~ 수만 마리가 같은 World 의 먹이 / 온도 / 냄새를 함께 사용합니다.
+# 벌레 한 마리씩 Worm 객체로 만드는 대신 위치, 방향, 속도, 배고픔 등을
+# 벌레 수 길이의 배열로 가지고, 이동 / 감각 / 섭취를 배열 연산으로 한 번에 계산합니다.
+# 신경망은 BrainEnsemble 하나에 모두 들어 있습니다.
+#
+# world.py 의 Worm 한 마리 계산과 같은 규칙을 따릅니다:
+# - 하이브리드 AI: 방향 = (1 - hungry_value) × 뇌 신호 방향 + hungry_value × 가장 가까운 먹이 방향
+# - 벽에 닿으면 코 터치 자극, 냄새 농도에 따른 먹이 감각 자극, 섭취 범위 안 먹이 섭취
+# - 다른 벌레 머리와 worm_contact_radius 이내로 가까워져도 코 터치 자극
+#   (매 스텝 셀 리스트를 새로 만들어 이웃 쌍만 비교하므로 비용이 벌레 수에 비례)
+# - 같은 먹이에 여러 마리가 닿으면 번호가 작은 벌레가 먹음
+#
+# 뇌 업데이트는 벌레마다 주기(brain_update_interval) 안에서 시작 시점을 고르게 나누어
+# 한 스텝에 전체의 일부만 계산하므로 프레임 비용이 한 번에 몰리지 않습니다.
+# ============================================================
+
+import numpy as np
+
+from cell_list import CellList
+
+# 체크포인트에 저장하는 벌레별 배열 속성
+POPULATION_ARRAY_ATTRIBUTES = (
+    'positions', 'facing_angle', 'target_angle', 'current_speed', 'target_speed', 'speed_change_rate',
+    'hungry_value', 'hunger_start_time', 'preferred_temperature', 'temperature_at_worm', 'previous_temperature',
+    'afd_stimulus', 'odour_at_worm', 'last_brain_update', 'last_touch_time', 'last_food_sense_time',
+)
+
+# 그중 시각 배열 (체크포인트에는 시각 대신 "현재로부터 경과한 시간(초)"으로 저장)
+POPULATION_TIME_ATTRIBUTES = ('hunger_start_time', 'last_brain_update', 'last_touch_time', 'last_food_sense_time')
+
+
+class WormPopulation:
+    """
+    벌레 무리 상태 (벌레별 값은 모두 (count,) 배열, 위치는 (count, 2))
+
+    속성:
+        brains: BrainEnsemble (벌레 i 의 신경망 = i 번째 행)
+        positions: (count, 2) 머리 위치
+        facing_angle / target_angle: 현재 / 목표 진행 각도 (라디안)
+        current_speed / target_speed / speed_change_rate: 이동 속도
+        hungry_value / hunger_start_time: 배고픔과 배고픔 계산 기준 시각 (초)
+        preferred_temperature / temperature_at_worm / previous_temperature: 온도 감각 (이전 온도가 없으면 nan)
+        afd_stimulus / odour_at_worm: 마지막 AFD 자극 세기 / 머리 위치 냄새 농도
+        last_brain_update: 마지막 뇌 업데이트 시각 (초)
+        last_touch_time / last_food_sense_time: 마지막 자극 시각 (초, 자극이 없었으면 nan)
+        body: (count, N, 2) 몸체 점 배열 WormBody (worm_body.py, 없으면 None) - 매 스텝 머리 위치를 따라감
+        contact_pairs: 마지막 스텝에 서로 닿은 벌레 번호 쌍 (i, j) 배열 (i < j)
+        contact_count: (count,) 마지막 스텝에 닿은 다른 벌레 수
+    """
+
+    def __init__(self, brains, positions, preferred_temperature, temperature=20.0, hungry_value=0.5,
+                 facing_angle=0.0, time=0.0, brain_update_interval=0.5, rng=None, body=None):
+        """
+        Args:
+            brains: BrainEnsemble (setup() / rand_excite() 를 마친 상태, count 가 벌레 수와 같아야 함)
+            positions: (count, 2) 시작 위치
+            preferred_temperature: 선호 온도 (값 하나 또는 (count,) 배열)
+            temperature: 처음 표시할 머리 위치 온도
+            hungry_value: 초기 배고픔 (WorldParameters.hunger_initial_value 와 같게 둠)
+            facing_angle: 시작 방향 (값 하나 또는 (count,) 배열)
+            time: 생성 시각 (초)
+            brain_update_interval: 뇌 업데이트 주기 (초) - 벌레별 첫 업데이트 시점을 이 안에서 나눔
+            rng: 첫 업데이트 시점을 고를 numpy Generator (None 이면 번호 순으로 고르게 나눔)
+            body: (count, N, 2) 몸체 WormBody (None 이면 몸체 없음)
+        """
+        positions = np.array(positions, dtype=np.float64).reshape(-1, 2)
+        count = len(positions)
+        if brains.count != count:
+            raise ValueError(f"신경망 수({brains.count})와 벌레 수({count})가 다릅니다")
+
+        def full(value):
+            return np.broadcast_to(np.asarray(value, dtype=np.float64), (count,)).copy()
+
+        self.brains = brains
+        self.positions = positions
+        self.facing_angle = full(facing_angle)
+        self.target_angle = self.facing_angle.copy()
+        self.current_speed = full(0.0)
+        self.target_speed = full(0.0)
+        self.speed_change_rate = full(0.0)
+        self.hungry_value = full(hungry_value)
+        self.hunger_start_time = full(time)
+        self.preferred_temperature = full(preferred_temperature)
+        self.temperature_at_worm = full(temperature)
+        self.previous_temperature = full(np.nan)
+        self.afd_stimulus = full(0.0)
+        self.odour_at_worm = full(0.0)
+        self.last_touch_time = full(np.nan)
+        self.last_food_sense_time = full(np.nan)
+        self.contact_pairs = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+        self.contact_count = np.zeros(count, dtype=np.int64)
+        if body is not None and body.points.shape[0] != count:
+            raise ValueError(f"몸체 수({body.points.shape[0]})와 벌레 수({count})가 다릅니다")
+        self.body = body
+        self._cell_list = None
+
+        # 뇌 업데이트 시작 시점을 주기 안에서 고르게 나눔 (한 스텝에 약 count × dt / 주기 마리씩)
+        if rng is None:
+            phase = np.arange(count) / max(count, 1)
+        else:
+            phase = rng.random(count)
+        self.last_brain_update = time - phase * brain_update_interval
+
+    def __len__(self):
+        return len(self.positions)
+
+    @property
+    def count(self):
+        """벌레 수"""
+        return len(self.positions)
+
+    def get_arrays(self, now):
+        """
+        체크포인트에 저장할 벌레별 배열 {이름: 배열 복사본}
+
+        시각 배열은 now 로부터 경과한 시간(초)으로 바꿔 저장합니다.
+        """
+        arrays = {name: getattr(self, name).copy() for name in POPULATION_ARRAY_ATTRIBUTES}
+        for name in POPULATION_TIME_ATTRIBUTES:
+            arrays[name] = now - arrays[name]
+        if self.body is not None:
+            arrays['body'] = self.body.points.copy()
+        return arrays
+
+    def set_arrays(self, arrays, now):
+        """
+        get_arrays() 로 저장한 배열을 제자리 복사로 복원합니다.
+
+        Raises:
+            ValueError: 저장된 벌레 수가 다른 경우
+        """
+        if len(arrays['positions']) != self.count:
+            raise ValueError(f"저장된 벌레 수가 다릅니다 (저장: {len(arrays['positions'])}, 현재: {self.count})")
+        for name in POPULATION_ARRAY_ATTRIBUTES:
+            getattr(self, name)[...] = arrays[name]
+        for name in POPULATION_TIME_ATTRIBUTES:
+            getattr(self, name)[...] = now - arrays[name]
+        if self.body is not None:
+            if 'body' in arrays and arrays['body'].shape == self.body.points.shape:
+                self.body.points[...] = arrays['body']
+            else:
+                self.body.reset(self.positions, self.facing_angle)
+
+    # ========================================
+    # 시간 진행 (World.step 에서 호출)
+    # ========================================
+
+    def step(self, world, frames):
+        """
+        배고픔 → 뇌 업데이트(주기가 된 벌레만) → 이동/감각/섭취 를 전체 벌레에 대해 계산합니다.
+
+        Args:
+            world: 먹이 / 온도 / 냄새를 가진 World
+            frames: 기준 스텝(1 / frame_rate 초) 단위 경과량
+        """
+        now = world.time
+        params = world.params
+        self.update_hunger(now, params)
+        due = np.flatnonzero(now - self.last_brain_update >= params.brain_update_interval)
+        if len(due):
+            self.update_brain(world, due)
+            self.last_brain_update[due] = now
+        self.move(world, frames)
+        if self.body is not None:
+            self.body.update(self.positions)
+
+    def update_hunger(self, now, params):
+        """시간 경과에 따라 배고픔을 올립니다. (Worm.update_hunger 의 배열 버전)"""
+        intervals_passed = (now - self.hunger_start_time) // params.hunger_increase_interval
+        np.minimum(1.0, params.hunger_initial_value + intervals_passed * params.hunger_increase_amount,
+                   out=self.hungry_value)
+
+    def decrease_hunger(self, worms, eaten, now, params):
+        """
+        먹이를 먹은 벌레의 배고픔을 먹은 개수만큼 내리고 기준 시각을 다시 정합니다.
+
+        Args:
+            worms: 먹이를 먹은 벌레 번호 배열
+            eaten: 벌레별 먹은 먹이 수
+        """
+        hungry = self.hungry_value[worms]
+        for round_number in range(int(eaten.max(initial=0))):
+            # 한 마리가 여러 개를 먹으면 Worm.decrease_hunger 를 여러 번 부른 것과 같게 하나씩 뺌
+            eating = eaten > round_number
+            hungry[eating] = np.maximum(0.0, hungry[eating] - params.hunger_decrease_on_eat)
+        self.hungry_value[worms] = hungry
+        intervals_passed = (hungry - params.hunger_initial_value) / params.hunger_increase_amount
+        self.hunger_start_time[worms] = now - intervals_passed * params.hunger_increase_interval
+
+    def update_brain(self, world, rows):
+        """
+        rows 벌레의 AFD 자극 → 신경망 업데이트 → 목표 방향/속도 계산 (World.update_brain 의 배열 버전)
+        """
+        params = world.params
+        brains = self.brains
+        xs, ys = self.positions[rows, 0], self.positions[rows, 1]
+        facing = self.facing_angle[rows]
+        temperature = world.temperature_field.temperature_many(xs, ys)
+        self.temperature_at_worm[rows] = temperature
+        deviation = temperature - self.preferred_temperature[rows]
+
+        previous = self.previous_temperature[rows]
+        temporal_change = np.where(np.isnan(previous), 0.0, temperature - previous)
+        self.previous_temperature[rows] = temperature
+        gradient_x, gradient_y = world.temperature_field.gradient_many(xs, ys)
+        spatial_change = (gradient_x * np.cos(facing) - gradient_y * np.sin(facing)) * params.afd_lookahead_distance
+
+        worsening = np.sign(deviation) * (temporal_change + spatial_change)
+        stimulus = params.afd_deviation_gain * np.abs(deviation) + params.afd_gradient_gain * worsening
+        stimulus = np.minimum(np.maximum(stimulus, 0.0), params.afd_max_stimulus)
+        self.afd_stimulus[rows] = stimulus
+        index = brains.connectome.index
+        brains.input[rows, index['AFDL']] += stimulus
+        brains.input[rows, index['AFDR']] += stimulus
+
+        brains.update(rows)
+
+        # 근육 신호 → 목표 방향 (좌우 차이) / 목표 속도 (좌우 합)
+        scaling_factor = 20
+        left, right = brains.left_muscle_signal[rows], brains.right_muscle_signal[rows]
+        self.target_angle[rows] = facing + (left - right) / scaling_factor * np.pi
+        target_speed = (np.abs(left) + np.abs(right)) / (scaling_factor * 5)
+        self.target_speed[rows] = target_speed
+        self.speed_change_rate[rows] = (target_speed - self.current_speed[rows]) / (scaling_factor * 1.5)
+
+    def move(self, world, frames=1.0):
+        """
+        전체 벌레의 하이브리드 AI 방향 결정, 이동, 벽 충돌, 먹이 감각, 섭취 (World.move 의 배열 버전)
+        """
+        params = world.params
+        positions = self.positions
+        self.current_speed += self.speed_change_rate * frames
+
+        # 감지 범위 안의 가장 가까운 먹이 방향과 뇌 신호 방향을 배고픔으로 섞음
+        food_ids, food_points, _ = world.food.nearest_many(positions[:, 0], positions[:, 1],
+                                                           params.food_sense_distance)
+        has_food = food_ids >= 0
+        if has_food.any():
+            food_target_angle = np.arctan2(-(food_points[has_food, 1] - positions[has_food, 1]),
+                                           food_points[has_food, 0] - positions[has_food, 0])
+            hungry = self.hungry_value[has_food]
+            self.target_angle[has_food] = (1 - hungry) * self.target_angle[has_food] + hungry * food_target_angle
+
+        # 각도 차이를 -π ~ π 범위로 정규화한 뒤 목표 쪽으로 회전
+        facing, target = self.facing_angle, self.target_angle
+        difference = facing - target
+        wrapped = np.abs(difference) > np.pi
+        difference = np.where(wrapped & (facing > target), -(2 * np.pi - facing + target),
+                              np.where(wrapped, 2 * np.pi - target + facing, difference))
+        facing -= 0.1 * frames * (difference > 0)
+        facing += 0.1 * frames * (difference < 0)
+
+        positions[:, 0] += np.cos(facing) * self.current_speed * frames
+        positions[:, 1] -= np.sin(facing) * self.current_speed * frames
+
+        # 영역 경계 충돌 / 다른 벌레와 접촉: 코 터치 뉴런 자극
+        outside = ((positions[:, 0] < 0) | (positions[:, 0] > world.width)
+                   | (positions[:, 1] < 0) | (positions[:, 1] > world.height))
+        np.clip(positions[:, 0], 0, world.width, out=positions[:, 0])
+        np.clip(positions[:, 1], 0, world.height, out=positions[:, 1])
+        self.find_contacts(params.worm_contact_radius)
+        self.touch(outside | (self.contact_count > 0), world.time)
+
+        self.sense_food(world)
+        self.eat(world)
+
+    def find_contacts(self, radius):
+        """
+        머리 사이 거리가 radius 이내인 벌레 쌍을 찾아 contact_pairs / contact_count 에 기록합니다.
+
+        Args:
+            radius: 접촉 거리 (픽셀, 0 이하면 접촉 없음)
+        """
+        if radius <= 0:
+            self.contact_pairs = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+            self.contact_count[:] = 0
+            return
+        if self._cell_list is None or self._cell_list.cell_size != radius:
+            self._cell_list = CellList(radius)
+        self._cell_list.rebuild(self.positions)
+        first, second, _ = self._cell_list.pairs(radius)
+        self.contact_pairs = (first, second)
+        self.contact_count[:] = np.bincount(first, minlength=self.count) + np.bincount(second, minlength=self.count)
+
+    def touch(self, touched, now):
+        """touched((count,) bool) 벌레의 코 터치 뉴런을 자극합니다."""
+        self.brains.nose_touch_stimulated[touched] = True
+        self.last_touch_time[touched] = now
+
+    def sense_food(self, world):
+        """먹이 감각 뉴런 자극 여부와 세기를 정합니다. (World.sense_food 의 배열 버전)"""
+        params = world.params
+        xs, ys = self.positions[:, 0], self.positions[:, 1]
+        if world.odour_field is None:
+            sensing = world.food.nearest_many(xs, ys, params.food_sense_distance)[0] >= 0
+            intensity = np.ones(np.count_nonzero(sensing))
+        else:
+            concentration = world.odour_field.concentration_many(xs, ys)
+            self.odour_at_worm[:] = concentration
+            sensing = concentration >= params.odour_detection_threshold
+            facing = self.facing_angle[sensing]
+            gradient_x, gradient_y = world.odour_field.gradient_many(xs[sensing], ys[sensing])
+            approaching = (gradient_x * np.cos(facing) - gradient_y * np.sin(facing)) * params.food_sense_lookahead_distance
+            intensity = (params.food_sense_concentration_gain * concentration[sensing]
+                         + params.food_sense_gradient_gain * np.maximum(approaching, 0.0))
+            intensity = np.minimum(intensity, params.food_sense_max_intensity)
+        self.brains.food_sense_stimulated[sensing] = True
+        self.brains.food_sense_intensity[sensing] = intensity
+        self.last_food_sense_time[sensing] = world.time
+
+    def eat(self, world):
+        """섭취 범위 안의 먹이를 제거하고 먹은 벌레의 배고픔을 내립니다."""
+        params = world.params
+        worms, food_ids, _ = world.food.within_many(self.positions[:, 0], self.positions[:, 1],
+                                                    params.food_eat_distance)
+        if len(food_ids) == 0:
+            return
+        # 같은 먹이에 여러 마리가 닿았으면 번호가 작은 벌레가 먹음 (worms 는 벌레 번호 순)
+        _, first = np.unique(food_ids, return_index=True)
+        first.sort()
+        worms, food_ids = worms[first], food_ids[first]
+        for food_id in food_ids.tolist():
+            world.remove_food(food_id)
+        eaters, eaten = np.unique(worms, return_counts=True)
+        self.decrease_hunger(eaters, eaten, world.time, params)
+
+    def reset_stimuli(self, world):
+        """배고픔 뉴런은 항상 자극하고, 코 터치 / 먹이 감각 자극은 neuron_reset_time 이 지나면 해제합니다."""
+        brains = self.brains
+        reset_time = world.params.neuron_reset_time
+        brains.hunger_stimulated[:] = True
+        brains.nose_touch_stimulated[world.time - self.last_touch_time >= reset_time] = False
+        brains.food_sense_stimulated[world.time - self.last_food_sense_time >= reset_time] = False
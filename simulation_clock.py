@@ -0,0 +1,262 @@
+# ============================================================
+# simulation_clock.py - 시뮬레이션 시계 (일시정지 / 배속 / 무제한 실행)
+# ============================================================
+#
+# 배고픔, 뇌 업데이트 주기, 코 터치 / 먹이 감각 타이머, 화면의 시뮬레이션 시간,
+# 브러쉬 스크립트 재생은 모두 World.time (시뮬레이션 초) 을 기준으로 합니다.
+# 이 시계는 화면 프레임의 실제 경과 시간을 받아 World 를 얼마나 진행할지 정합니다.
+#
+# - 일시정지: World 를 진행하지 않음 (화면은 계속 그림)
+# - 배속(warp): 실제 1초에 시뮬레이션 warp 초 진행 (×0.1 ~ ×1000)
+# - 무제한(unbounded): 실제 시간과 무관하게 한 프레임에 frame_budget 초 동안 최대한 진행
+#
+# 고정 스텝 누적 방식:
+# - 실제 경과 시간 × 배속을 accumulator 에 쌓고, step 초가 찰 때마다 World.step(step) 한 번
+#   → 모든 World.step() 의 크기가 같으므로 화면 프레임 속도와 무관하게 같은 결과
+#   (화면이 느리면 한 프레임에 여러 스텝, 빠르면 스텝 없이 그리기만 하는 프레임도 있음)
+# - 남은 accumulator / step (alpha, 0 ~ 1) 으로 직전 스텝과 마지막 스텝 사이의 자세를 보간해서 그림
+#   (직전 자세는 프레임의 마지막 스텝 직전에만 미리 할당한 버퍼에 복사)
+# - 창 이동 등으로 프레임이 길게 멈춘 경우 max_frame_time 까지만 반영
+# - 한 프레임에 max_steps_per_frame 스텝 또는 frame_budget 의 계산 시간을 넘으면 밀린 시간은 버림
+#   (높은 배속에서도 화면 / 입력이 멈추지 않음)
+#
+# 화면 없이 돌릴 때는 run_to(스텝 수) 로 시간 제한 없이 진행하거나, 시계 없이 world.step(dt) 를 반복 호출하면 됩니다.
+# ============================================================
+
+import time
+
+import numpy as np
+
+# 배속 범위와 단계 ([ / ] 키로 한 단계씩 변경)
+WARP_MIN = 0.1
+WARP_MAX = 1000.0
+WARP_STEPS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 50.0, 100.0, 200.0, 500.0, 1000.0)
+
+
+class SimulationClock:
+    """
+    World 진행 속도를 정하는 시계
+
+    속성:
+        world: 진행할 World (시뮬레이션 시각은 world.time 하나만 사용)
+        warp: 배속 (실제 1초당 시뮬레이션 초)
+        paused: 일시정지 여부
+        unbounded: 무제한 실행 여부 (배속 무시)
+        step: World.step() 한 번의 시뮬레이션 시간 (초, 고정)
+        step_count: 지금까지 진행한 스텝 수 (입력 기록 / 재생의 시점 기준)
+        before_step: 매 스텝 직전에 호출할 함수 목록 (예약된 브러쉬 스크립트 등 시각에 맞춰 적용할 것)
+        after_step: 매 스텝 직후에 호출할 함수 목록 (재생 중 뉴런 전위 기록 등)
+        background_worlds: 그리지 않고 world 와 같은 스텝으로 함께 진행하는 World 목록 (분기)
+        accumulator: 아직 진행하지 않은 시뮬레이션 시간 (초, step 미만)
+        alpha: 그리기 보간 비율 (0 = 직전 스텝 자세, 1 = 마지막 스텝 자세)
+        max_steps_per_frame: 한 프레임에 호출하는 최대 World.step() 수 (넘는 시간은 버림)
+        max_frame_time: 한 프레임에 반영하는 최대 실제 경과 시간 (초)
+        frame_budget: 한 프레임에 World 계산에 쓰는 최대 실제 시간 (초, 무제한 실행 시에는 이만큼 계속 계산)
+    """
+
+    def __init__(self, world, warp=1.0, step=1 / 60, max_steps_per_frame=2000, max_frame_time=0.25,
+                 frame_budget=1 / 30):
+        self.world = world
+        self.warp = 1.0
+        self.set_warp(warp)
+        self.paused = False
+        self.unbounded = False
+        self.step = step
+        self.step_count = 0
+        self.before_step = []
+        self.after_step = []
+        self.background_worlds = []
+        self.accumulator = 0.0
+        self.alpha = 1.0
+        self.max_steps_per_frame = max_steps_per_frame
+        self.max_frame_time = max_frame_time
+        self.frame_budget = frame_budget
+        # 마지막 스텝 직전 자세 버퍼 (구성이 바뀔 때만 새로 할당, 이후에는 제자리 복사)
+        self._previous_step = -1  # 버퍼에 기록한 자세 직후 스텝의 step_count (다른 스텝이 끼면 보간하지 않음)
+        self._pose_shapes = None
+        self._previous_worm_poses = np.empty((0, 3))       # (벌레 수, 3) x, y, 각도
+        self._previous_worm_bodies = []                    # [(점 수, 2) 또는 None, ...]
+        self._previous_population_positions = []          # [(N, 2), ...]
+        self._previous_population_bodies = []             # [(N, 점 수, 2) 또는 None, ...]
+
+    @property
+    def time(self):
+        """현재 시뮬레이션 시각 (초)"""
+        return self.world.time
+
+    # ========================================
+    # 조작
+    # ========================================
+
+    def set_warp(self, warp):
+        """배속을 WARP_MIN ~ WARP_MAX 범위로 정합니다."""
+        self.warp = min(max(float(warp), WARP_MIN), WARP_MAX)
+
+    def faster(self):
+        """배속을 한 단계 올립니다."""
+        self.set_warp(next((w for w in WARP_STEPS if w > self.warp * 1.0001), WARP_MAX))
+
+    def slower(self):
+        """배속을 한 단계 내립니다."""
+        self.set_warp(next((w for w in reversed(WARP_STEPS) if w < self.warp / 1.0001), WARP_MIN))
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+
+    def toggle_unbounded(self):
+        self.unbounded = not self.unbounded
+
+    def describe(self):
+        """화면 표시용 상태 문자열"""
+        if self.paused:
+            return "일시정지"
+        if self.unbounded:
+            return "무제한"
+        return f"×{self.warp:g}"
+
+    # ========================================
+    # 진행
+    # ========================================
+
+    def advance(self, real_dt):
+        """
+        실제 경과 시간 real_dt(초)에 맞춰 World 를 고정 스텝으로 진행합니다. (매 프레임 호출)
+
+        Returns:
+            이번 프레임에 호출한 World.step() 수
+        """
+        if self.paused:
+            return 0
+        if self.unbounded:
+            steps = self._run_steps(self.max_steps_per_frame, remember=False)  # 보간하지 않음 (alpha = 1)
+            self.accumulator = 0.0
+            self.alpha = 1.0
+            return steps
+
+        self.accumulator += min(real_dt, self.max_frame_time) * self.warp
+        steps = self._run_steps(min(int(self.accumulator / self.step), self.max_steps_per_frame))
+        self.accumulator -= steps * self.step
+        if self.accumulator >= self.step:
+            # 상한에 걸림: 밀린 시간은 버림 (다음 프레임에 몰아서 계산하지 않음)
+            self.accumulator %= self.step
+        self.alpha = self.accumulator / self.step
+        return steps
+
+    def _run_steps(self, count, remember=True):
+        """
+        World.step(step) 을 최대 count 번 (frame_budget 안에서) 호출하고 호출 수를 돌려줍니다.
+
+        remember 이면 이번 프레임의 마지막 스텝 직전에만 보간용 자세를 기록합니다.
+        (frame_budget 을 넘으면 다음 스텝을 마지막으로 하고 멈춤)
+        """
+        deadline = time.perf_counter() + self.frame_budget
+        for done in range(count):
+            last = done == count - 1 or time.perf_counter() >= deadline
+            if last and remember:
+                self._remember_poses()
+            self.step_once()
+            if last:
+                return done + 1
+        return count
+
+    def step_once(self):
+        """before_step 함수를 호출한 뒤 World (와 background_worlds) 를 한 스텝 진행하고 after_step 함수를 호출합니다."""
+        for callback in self.before_step:
+            callback()
+        self.world.step(self.step)
+        for world in self.background_worlds:
+            world.step(self.step)
+        self.step_count += 1
+        for callback in self.after_step:
+            callback()
+
+    def run_to(self, step_count):
+        """step_count 스텝이 될 때까지 시간 제한 없이 진행합니다. (화면 없는 재생)"""
+        while self.step_count < step_count:
+            self.step_once()
+
+    # ========================================
+    # 그리기 보간
+    # ========================================
+
+    def _remember_poses(self):
+        """다음 스텝 직전의 벌레 자세를 버퍼에 복사합니다. (벌레 / 무리 구성이 바뀌었을 때만 버퍼를 새로 할당)"""
+        world = self.world
+        shapes = (tuple(worm.body.points.shape if worm.body is not None else None for worm in world.worms),
+                  tuple((population.positions.shape,
+                         population.body.points.shape if population.body is not None else None)
+                        for population in world.populations))
+        if shapes != self._pose_shapes:
+            self._pose_shapes = shapes
+            self._previous_worm_poses = np.empty((len(world.worms), 3))
+            self._previous_worm_bodies = [np.empty(shape) if shape is not None else None for shape in shapes[0]]
+            self._previous_population_positions = [np.empty(shape) for shape, _ in shapes[1]]
+            self._previous_population_bodies = [np.empty(shape) if shape is not None else None
+                                                for _, shape in shapes[1]]
+
+        poses = self._previous_worm_poses
+        for index, worm in enumerate(world.worms):
+            poses[index, 0], poses[index, 1] = worm.position
+            poses[index, 2] = worm.facing_angle
+            if worm.body is not None:
+                self._previous_worm_bodies[index][...] = worm.body.points
+        for index, population in enumerate(world.populations):
+            self._previous_population_positions[index][...] = population.positions
+            if population.body is not None:
+                self._previous_population_bodies[index][...] = population.body.points
+        self._previous_step = self.step_count + 1
+
+    def reset_interpolation(self):
+        """보간 기록을 지웁니다. (체크포인트 복원 등으로 상태가 바뀐 직후 호출)"""
+        self._previous_step = -1
+
+    def _interpolating(self, index, buffers):
+        """buffers[index] 의 직전 자세와 보간해야 하는지 여부"""
+        return self._previous_step == self.step_count and self.alpha < 1.0 and index < len(buffers)
+
+    def worm_pose(self, index=0):
+        """
+        그리기용 벌레 자세 (x, y, 각도) - 직전 스텝과 마지막 스텝 사이를 alpha 로 보간
+
+        Args:
+            index: world.worms 안의 번호
+        """
+        worm = self.world.worms[index]
+        x, y, angle = worm.position[0], worm.position[1], worm.facing_angle
+        if not self._interpolating(index, self._previous_worm_poses):
+            return x, y, angle
+        previous_x, previous_y, previous_angle = self._previous_worm_poses[index].tolist()
+        t = self.alpha
+        return (previous_x + (x - previous_x) * t, previous_y + (y - previous_y) * t,
+                previous_angle + (angle - previous_angle) * t)
+
+    def worm_body_points(self, index=0):
+        """그리기용 벌레 몸체 (N, 2) 점 - worm_pose() 와 같은 보간"""
+        points = self.world.worms[index].body.points
+        if not self._interpolating(index, self._previous_worm_bodies):
+            return points
+        previous = self._previous_worm_bodies[index]
+        if previous is None or previous.shape != points.shape:
+            return points
+        return previous + (points - previous) * self.alpha
+
+    def population_bodies(self, index=0):
+        """그리기용 벌레 무리 (count, N, 2) 몸체 점 - worm_pose() 와 같은 보간"""
+        points = self.world.populations[index].body.points
+        if not self._interpolating(index, self._previous_population_bodies):
+            return points
+        previous = self._previous_population_bodies[index]
+        if previous is None or previous.shape != points.shape:
+            return points
+        return previous + (points - previous) * self.alpha
+
+    def population_positions(self, index=0):
+        """그리기용 벌레 무리 (N, 2) 위치 - worm_pose() 와 같은 보간"""
+        positions = self.world.populations[index].positions
+        if not self._interpolating(index, self._previous_population_positions):
+            return positions
+        previous = self._previous_population_positions[index]
+        if previous.shape != positions.shape:
+            return positions
+        return previous + (positions - previous) * self.alpha
+
@@ -0,0 +1,159 @@
+# ============================================================
+# stroke_script.py - 온도 브러쉬 스크립트 (기록 / 재생)
+# ============================================================
+#
+# 마우스로 칠하던 온도 브러쉬 입력을 시간이 붙은 이벤트 목록으로 저장하고,
+# GUI 없이 같은 순서로 다시 적용합니다.
+#
+# 이벤트 = (time, mode, x, y, brush_size, temperature_scale, stroke)
+# - time: 시뮬레이션 시작 후 경과 시간 (초)
+# - mode: 'heat' / 'cool' / 'erase'
+# - stroke: 같은 번호의 연속된 이벤트는 마우스 드래그 한 번 (이전 위치와 이어서 칠함)
+#           None 이면 그 위치에 한 번만 찍음
+#
+# 재생은 TemperatureField.apply_stroke() 를 마우스 입력과 똑같이 호출하므로
+# 직접 칠한 결과와 같은 온도 필드가 만들어집니다.
+#
+# 파일 형식 (JSON):
+#   {"format_version": 1, "columns": [...], "events": [[0.0, "heat", 100, 200, 50, 5.0, 0], ...]}
+# ============================================================
+
+import json
+
+STROKE_SCRIPT_FORMAT_VERSION = 1
+STROKE_COLUMNS = ['time', 'mode', 'x', 'y', 'brush_size', 'temperature_scale', 'stroke']
+
+
+class StrokeScript:
+    """
+    시간순 브러쉬 이벤트 목록
+
+    속성:
+        events: [(time, mode, x, y, brush_size, temperature_scale, stroke), ...] (시간순)
+    """
+
+    def __init__(self, events=None):
+        # 같은 시간의 이벤트는 기록된 순서를 유지 (정렬 안정성)
+        self.events = sorted((tuple(event) for event in events or []), key=lambda event: event[0])
+
+    def __len__(self):
+        return len(self.events)
+
+    def duration(self):
+        """마지막 이벤트 시간 (초)"""
+        return self.events[-1][0] if self.events else 0.0
+
+    def save(self, path):
+        """스크립트를 JSON 파일로 저장합니다."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'format_version': STROKE_SCRIPT_FORMAT_VERSION,
+                'columns': STROKE_COLUMNS,
+                'events': [list(event) for event in self.events],
+            }, f)
+
+
+def load_stroke_script(path):
+    """
+    JSON 파일에서 브러쉬 스크립트를 읽습니다.
+
+    stroke 열이 없는 이벤트(6개 값)는 한 번 찍는 이벤트로 읽습니다.
+
+    Raises:
+        ValueError: 지원하지 않는 포맷 버전이거나 이벤트 형식이 잘못된 경우
+    """
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    version = data.get('format_version')
+    if version != STROKE_SCRIPT_FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 브러쉬 스크립트 포맷 버전: {version}")
+
+    events = []
+    for number, event in enumerate(data['events']):
+        if len(event) == len(STROKE_COLUMNS) - 1:
+            event = list(event) + [None]
+        if len(event) != len(STROKE_COLUMNS):
+            raise ValueError(f"이벤트 {number}: 값이 {len(event)}개입니다 ({', '.join(STROKE_COLUMNS)})")
+        events.append(tuple(event))
+    return StrokeScript(events)
+
+
+class StrokeRecorder:
+    """
+    실제 브러쉬 입력을 스크립트로 기록
+
+    main.py 의 apply_temperature_brush() 호출마다 record() 를 부르면 됩니다.
+    """
+
+    def __init__(self):
+        self.events = []
+        self._stroke = -1
+
+    def record(self, time, mode, x, y, brush_size, temperature_scale, continues=False):
+        """
+        브러쉬 적용 한 번을 기록합니다.
+
+        Args:
+            time: 시뮬레이션 경과 시간 (초)
+            mode: 'heat' / 'cool' / 'erase'
+            x, y: 브러쉬 위치
+            brush_size: 브러쉬 반지름
+            temperature_scale: 온도 변화량
+            continues: 이전 기록과 같은 드래그이면 True (이전 위치와 이어서 칠함)
+        """
+        if not continues:
+            self._stroke += 1
+        self.events.append((time, mode, x, y, brush_size, temperature_scale, self._stroke))
+
+    def to_script(self):
+        """기록한 이벤트로 StrokeScript 를 만듭니다."""
+        return StrokeScript(self.events)
+
+
+class StrokePlayer:
+    """
+    브러쉬 스크립트를 온도 필드에 적용
+
+    - apply_all(): 모든 이벤트를 한 번에 적용 (불러올 때)
+    - advance(time): time 까지의 이벤트를 적용 (실행 중 예약 재생)
+    """
+
+    def __init__(self, script, field):
+        """
+        Args:
+            script: StrokeScript
+            field: TemperatureField (또는 TiledTemperatureField)
+        """
+        self.script = script
+        self.field = field
+        self.position = 0  # 다음에 적용할 이벤트 번호
+        self._last_points = {}  # stroke 번호 → 마지막 위치
+
+    def finished(self):
+        """모든 이벤트를 적용했으면 True"""
+        return self.position >= len(self.script.events)
+
+    def advance(self, time):
+        """
+        time(초) 까지 예약된 이벤트를 순서대로 적용합니다.
+
+        Returns:
+            int: 적용한 이벤트 수
+        """
+        events = self.script.events
+        start = self.position
+        while self.position < len(events) and events[self.position][0] <= time:
+            self._apply(events[self.position])
+            self.position += 1
+        return self.position - start
+
+    def apply_all(self):
+        """남은 이벤트를 시간과 관계없이 모두 적용합니다."""
+        return self.advance(float('inf'))
+
+    def _apply(self, event):
+        _, mode, x, y, brush_size, temperature_scale, stroke = event
+        x0, y0 = self._last_points.get(stroke, (x, y)) if stroke is not None else (x, y)
+        self.field.apply_stroke(x0, y0, x, y, mode, brush_size, temperature_scale)
+        if stroke is not None:
+            self._last_points[stroke] = (x, y)
@@ -0,0 +1,196 @@
+# ============================================================
+# temperature_arena.py - 온도 필드 / 실험 환경(arena) 저장과 불러오기
+# ============================================================
+#
+# 칠한 온도 필드와 실험 환경을 압축 바이너리 파일(.npz)로 저장합니다.
+# 같은 온도 환경을 여러 실험에서 GUI 조작 없이 그대로 재사용할 수 있고,
+# 실행 중에도 다른 환경으로 바로 바꿀 수 있습니다.
+#
+# 파일 구성:
+# - field.values / field.painted: 온도 격자 배열
+# - sources.mask / sources.values: 고정 온도 열원 (있는 경우)
+# - food.positions: 먹이 위치 (있는 경우)
+# - metadata_json: 격자 간격, 영역 크기/원점, 기본 온도, 온도 범위, 사용자 정보
+#
+# 사용법 (터미널):
+#   python temperature_arena.py arena.npz   # 저장된 환경 정보 출력
+# ============================================================
+
+import json
+import sys
+
+import numpy as np
+
+from temperature_field import TemperatureField
+
+ARENA_FORMAT_VERSION = 1
+
+# 격자 모양을 결정하는 메타데이터 (같아야 기존 필드에 바로 불러올 수 있음)
+GRID_METADATA_KEYS = ['width', 'height', 'resolution', 'origin']
+
+
+class Arena:
+    """
+    저장된 실험 환경
+
+    속성:
+        field: TemperatureField
+        source_mask, source_values: 고정 온도 열원 배열 (없으면 None)
+        food_positions: (N, 2) 먹이 위치 배열 (없으면 None)
+        metadata: 메타데이터 딕셔너리 (사용자 정보는 metadata['scenario'])
+    """
+
+    def __init__(self, field, source_mask=None, source_values=None, food_positions=None, metadata=None):
+        self.field = field
+        self.source_mask = source_mask
+        self.source_values = source_values
+        self.food_positions = food_positions
+        self.metadata = dict(metadata or {})
+
+
+def field_metadata(field):
+    """TemperatureField 를 다시 만드는 데 필요한 메타데이터"""
+    return {
+        'width': field.width,
+        'height': field.height,
+        'resolution': field.resolution,
+        'origin': [field.origin_x, field.origin_y],
+        'default_temperature': field.default_temperature,
+        'min_temperature': field.min_temperature,
+        'max_temperature': field.max_temperature,
+        'lookup_mode': field.lookup_mode,
+        'detection_range': field.detection_range,
+    }
+
+
+# ============================================================
+# 저장 / 로드
+# ============================================================
+
+def save_arena(path, field, dynamics=None, food_positions=None, scenario=None):
+    """
+    온도 필드(와 열원, 먹이 위치)를 압축 .npz 파일로 저장합니다.
+
+    Args:
+        path: 저장할 파일 경로
+        field: TemperatureField
+        dynamics: TemperatureDynamics (열원을 함께 저장, None 이면 생략)
+        food_positions: 먹이 위치 목록 [(x, y), ...] (None 이면 생략)
+        scenario: 함께 저장할 JSON 정보 (실험 이름, 설명 등)
+    """
+    arrays = {
+        'field.values': field.values,
+        'field.painted': field.painted,
+    }
+    if dynamics is not None and dynamics.source_mask.any():
+        arrays['sources.mask'] = dynamics.source_mask
+        arrays['sources.values'] = dynamics.source_values
+    if food_positions is not None:
+        arrays['food.positions'] = np.asarray(food_positions, dtype=np.float64).reshape(-1, 2)
+
+    metadata = field_metadata(field)
+    metadata['scenario'] = scenario or {}
+    with open(path, 'wb') as f:
+        np.savez_compressed(
+            f,
+            format_version=np.array(ARENA_FORMAT_VERSION),
+            metadata_json=np.array(json.dumps(metadata)),
+            **arrays,
+        )
+
+
+def load_arena(path):
+    """
+    save_arena() 로 저장한 파일을 읽어 새 TemperatureField 를 만듭니다.
+
+    Raises:
+        ValueError: 지원하지 않는 포맷 버전이거나 배열 크기가 메타데이터와 다른 경우
+    """
+    with np.load(path, allow_pickle=False) as archive:
+        version = int(archive['format_version'])
+        if version != ARENA_FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 arena 포맷 버전: {version}")
+        metadata = json.loads(str(archive['metadata_json']))
+        field = TemperatureField(
+            metadata['width'],
+            metadata['height'],
+            resolution=metadata['resolution'],
+            default_temperature=metadata['default_temperature'],
+            origin=tuple(metadata['origin']),
+            lookup_mode=metadata['lookup_mode'],
+            detection_range=metadata['detection_range'],
+            min_temperature=metadata['min_temperature'],
+            max_temperature=metadata['max_temperature'],
+        )
+        if archive['field.values'].shape != field.values.shape:
+            raise ValueError(f"온도 배열 크기 {archive['field.values'].shape} 가 "
+                             f"메타데이터의 격자 {field.values.shape} 와 다릅니다")
+        field.values[...] = archive['field.values']
+        field.painted[...] = archive['field.painted']
+
+        files = set(archive.files)
+        return Arena(
+            field,
+            source_mask=archive['sources.mask'] if 'sources.mask' in files else None,
+            source_values=archive['sources.values'] if 'sources.values' in files else None,
+            food_positions=archive['food.positions'] if 'food.positions' in files else None,
+            metadata=metadata,
+        )
+
+
+def apply_arena(arena, field, dynamics=None):
+    """
+    불러온 환경을 실행 중인 온도 필드에 제자리 복사합니다. (실행 중 환경 전환용)
+
+    기본 온도와 온도 범위도 환경의 값으로 바뀝니다. 열원이 없는 환경이면 기존 열원을 지웁니다.
+
+    Args:
+        arena: load_arena() 결과
+        field: 실행 중인 TemperatureField
+        dynamics: 실행 중인 TemperatureDynamics (None 이면 열원 무시)
+
+    Raises:
+        ValueError: 격자 모양(영역 크기, 격자 간격, 원점)이 다른 경우
+    """
+    current = field_metadata(field)
+    for key in GRID_METADATA_KEYS:
+        if arena.metadata[key] != current[key]:
+            raise ValueError(f"arena 의 {key} ({arena.metadata[key]}) 가 현재 필드 ({current[key]}) 와 다릅니다")
+
+    field.values[...] = arena.field.values
+    field.painted[...] = arena.field.painted
+    field.default_temperature = arena.field.default_temperature
+    field.min_temperature = arena.field.min_temperature
+    field.max_temperature = arena.field.max_temperature
+    field.mark_dirty()
+
+    if dynamics is not None:
+        dynamics.clear_sources()
+        if arena.source_mask is not None:
+            dynamics.source_mask[...] = arena.source_mask
+            dynamics.source_values[...] = arena.source_values
+
+
+def print_arena(arena):
+    """저장된 환경의 요약 정보를 출력합니다."""
+    metadata = arena.metadata
+    field = arena.field
+    print(f"영역: {metadata['width']}×{metadata['height']}px (원점 {tuple(metadata['origin'])}), "
+          f"격자 간격 {metadata['resolution']}px → {field.rows}×{field.cols} 격자점")
+    print(f"기본 온도: {metadata['default_temperature']}°C "
+          f"(범위 {metadata['min_temperature']} ~ {metadata['max_temperature']}°C)")
+    print(f"칠해진 격자점: {field.painted_count()} "
+          f"(온도 {field.values.min():.1f} ~ {field.values.max():.1f}°C)")
+    if arena.source_mask is not None:
+        print(f"열원 격자점: {int(arena.source_mask.sum())}")
+    if arena.food_positions is not None:
+        print(f"먹이: {len(arena.food_positions)}개")
+    if metadata.get('scenario'):
+        print(f"시나리오: {json.dumps(metadata['scenario'], ensure_ascii=False)}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        print("사용법: python temperature_arena.py <arena.npz>")
+        sys.exit(1)
+    print_arena(load_arena(sys.argv[1]))
@@ -0,0 +1,175 @@
+# ============================================================
+# temperature_dynamics.py - 온도 필드 열 확산 / 이완
+# ============================================================
+#
+# 칠해진 온도가 시간에 따라 주변으로 퍼지고(확산) 기본 온도로
+# 돌아가도록(이완) TemperatureField 의 격자를 갱신합니다.
+#
+#   dT/dt = D ∇²T − λ (T − T_default)
+#
+# - 5점 스텐실 라플라시안을 배열 연산으로 한 번에 계산 (가장자리는 단열)
+# - 고정 간격(substep_rate)의 작은 스텝으로 나누어 계산하므로
+#   화면 프레임 속도와 관계없이 같은 결과를 얻음
+# - 고정 온도 열원: 매 스텝 지정한 온도로 유지되는 격자점 (예: 35°C 히터)
+# - 비용: 스텝당 스텐실 1회, 호출당 최대 max_substeps 스텝
+# ============================================================
+
+import numpy as np
+
+from temperature_field import stroke_mask
+
+
+def neumann_laplacian(values, out):
+    """
+    5점 스텐실 라플라시안을 out 에 계산합니다. (격자 간격 1 기준)
+
+    가장자리는 바깥 이웃을 자기 자신으로 보아 출입이 없습니다. (단열 / 노이만 경계)
+    """
+    np.multiply(values, -4.0, out=out)
+    out[1:] += values[:-1]
+    out[:-1] += values[1:]
+    out[0] += values[0]
+    out[-1] += values[-1]
+    out[:, 1:] += values[:, :-1]
+    out[:, :-1] += values[:, 1:]
+    out[:, 0] += values[:, 0]
+    out[:, -1] += values[:, -1]
+    return out
+
+
+class TemperatureDynamics:
+    """
+    온도 필드의 열 확산 / 이완 계산기
+
+    속성:
+        field: 갱신할 TemperatureField
+        diffusivity: 열 확산 계수 D (픽셀²/초)
+        relaxation_rate: 기본 온도로 돌아가는 속도 λ (1/초)
+        substep_rate: 초당 스텝 수
+        max_substeps: advance() 한 번에 계산하는 최대 스텝 수
+        source_mask: (rows, cols) 고정 온도 열원 여부
+        source_values: (rows, cols) 열원 온도
+    """
+
+    def __init__(self, field, diffusivity=200.0, relaxation_rate=0.02, substep_rate=20.0, max_substeps=8):
+        """
+        Args:
+            field: TemperatureField
+            diffusivity: 열 확산 계수 (픽셀²/초)
+            relaxation_rate: 이완 속도 (1/초)
+            substep_rate: 초당 스텝 수 (Hz)
+            max_substeps: 한 번에 계산하는 최대 스텝 수 (넘는 시간은 버림)
+
+        Raises:
+            ValueError: 스텝 간격에 비해 확산 계수가 너무 커서 계산이 불안정한 경우
+        """
+        self.field = field
+        self.diffusivity = diffusivity
+        self.relaxation_rate = relaxation_rate
+        self.substep_rate = substep_rate
+        self.max_substeps = max_substeps
+        self.check_stability()
+
+        self.source_mask = np.zeros(field.values.shape, dtype=bool)
+        self.source_values = np.full(field.values.shape, field.default_temperature, dtype=np.float64)
+
+        self._accumulated_time = 0.0
+        self._laplacian = np.empty_like(field.values)
+
+    def check_stability(self):
+        """
+        명시적 오일러 방법의 안정 조건을 검사합니다.
+
+        Raises:
+            ValueError: D·Δt/h² > 1/4 또는 λ·Δt > 1 인 경우
+        """
+        dt = 1.0 / self.substep_rate
+        diffusion_number = self.diffusivity * dt / self.field.resolution ** 2
+        if diffusion_number > 0.25:
+            raise ValueError(
+                f"확산 계산이 불안정합니다 (D·Δt/h² = {diffusion_number:.3f} > 0.25): "
+                f"substep_rate 를 {self.diffusivity * 4 / self.field.resolution ** 2:.1f} Hz 이상으로 설정하세요")
+        if self.relaxation_rate * dt > 1.0:
+            raise ValueError(f"이완 속도가 스텝 간격에 비해 너무 큽니다 (λ·Δt = {self.relaxation_rate * dt:.3f} > 1)")
+
+    # ========================================
+    # 고정 온도 열원
+    # ========================================
+
+    def add_source(self, x, y, temperature, radius=0):
+        """
+        (x, y) 를 중심으로 반지름 radius(픽셀) 안의 격자점을 고정 온도 열원으로 만듭니다.
+
+        radius 가 0 이면 가장 가까운 격자점 하나만 열원이 됩니다.
+        """
+        region = self._stamp_region(x, y, radius)
+        if region is None:
+            return
+        (i0, i1, j0, j1), mask = region
+        self.source_mask[i0:i1, j0:j1] |= mask
+        self.source_values[i0:i1, j0:j1][mask] = temperature
+        self.field.values[i0:i1, j0:j1][mask] = temperature
+        self.field.painted[i0:i1, j0:j1] |= mask
+        self.field.mark_dirty(i0, i1, j0, j1)
+
+    def remove_source(self, x, y, radius=0):
+        """(x, y) 반지름 radius 안의 열원을 제거합니다. (온도는 이후 확산/이완으로 변함)"""
+        region = self._stamp_region(x, y, radius)
+        if region is None:
+            return
+        (i0, i1, j0, j1), mask = region
+        self.source_mask[i0:i1, j0:j1][mask] = False
+
+    def clear_sources(self):
+        """모든 열원을 제거합니다."""
+        self.source_mask.fill(False)
+
+    def _stamp_region(self, x, y, radius):
+        """(x, y) 에 반지름 radius 스탬프를 놓았을 때 필드 안에 들어가는 범위와 마스크"""
+        gy, gx = self.field.to_grid(x, y)
+        return stroke_mask(self.field.stamp_mask(radius), gy, gx, gy, gx, self.field.rows, self.field.cols)
+
+    # ========================================
+    # 시간 진행
+    # ========================================
+
+    def advance(self, elapsed):
+        """
+        경과 시간만큼 스텝을 계산합니다. (남는 시간은 다음 호출로 넘김)
+
+        Args:
+            elapsed: 경과 시간 (초)
+
+        Returns:
+            int: 계산한 스텝 수
+        """
+        dt = 1.0 / self.substep_rate
+        self._accumulated_time += elapsed
+        steps = int(self._accumulated_time / dt)
+        if steps > self.max_substeps:
+            # 밀린 시간은 버려서 한 번의 비용을 일정하게 유지
+            steps = self.max_substeps
+            self._accumulated_time = 0.0
+        else:
+            self._accumulated_time -= steps * dt
+
+        for _ in range(steps):
+            self.step()
+        if steps:
+            self.field.update_painted()
+            self.field.painted |= self.source_mask
+            self.field.mark_dirty()
+        return steps
+
+    def step(self):
+        """스텐실 한 번으로 확산과 이완을 한 스텝 계산합니다."""
+        dt = 1.0 / self.substep_rate
+        values = self.field.values
+        laplacian = self._laplacian
+
+        # 5점 스텐실 (가장자리는 열 출입 없음)
+        neumann_laplacian(values, laplacian)
+        laplacian *= self.diffusivity * dt / self.field.resolution ** 2
+        values += laplacian
+        values += (self.field.default_temperature - values) * (self.relaxation_rate * dt)
+        np.copyto(values, self.source_values, where=self.source_mask)
@@ -0,0 +1,470 @@
+# ============================================================
+# temperature_field.py - 격자 기반 온도 필드
+# ============================================================
+#
+# 시뮬레이션 영역 전체를 일정 간격(resolution)의 격자점으로 나누고
+# 각 격자점의 온도를 2차원 numpy 배열에 저장합니다.
+#
+# - 위치 조회: 주변 4개 격자점의 쌍선형 보간 (O(1))
+# - 호환 모드: 기존 온도 맵과 같은 "감지 범위 내 가장 가까운 칠해진 점" 방식
+# - painted: 사용자가 브러쉬로 칠한 격자점 (기존 temperature_map 의 키에 해당)
+# - 브러쉬: 미리 계산한 원형 스탬프 마스크를 배열 슬라이스에 한 번에 적용
+# - 변경 영역: 마지막 take_dirty() 이후 바뀐 격자점 범위 (화면 오버레이 갱신용)
+# - 기울기: 격자점별 온도 기울기 배열, 바뀐 범위만 다시 계산 (온도 주성 감각용)
+#
+# 배열 인덱스는 [행(y), 열(x)] 순서이며, 격자점 (i, j) 의 위치는
+# (origin_x + j * resolution, origin_y + i * resolution) 입니다.
+# ============================================================
+
+import math
+
+import numpy as np
+
+# 브러쉬 모드 (main.py 의 BrushMode 값과 같음)
+BRUSH_HEAT = 'heat'    # 가열
+BRUSH_COOL = 'cool'    # 냉각
+BRUSH_ERASE = 'erase'  # 지우기
+
+# 이 값보다 기본 온도와 차이가 작으면 칠해지지 않은 점으로 봄 (°C, update_painted 에서 사용)
+PAINTED_EPSILON = 0.05
+
+# 위치 조회 방식
+LOOKUP_BILINEAR = 'bilinear'  # 쌍선형 보간 (기본)
+LOOKUP_NEAREST = 'nearest'    # 기존 방식: 감지 범위 내 가장 가까운 칠해진 점
+
+
+# ============================================================
+# 브러쉬 계산 (격자 배열에 공통으로 사용)
+# ============================================================
+
+def disk_mask(radius, resolution):
+    """
+    반지름 radius(픽셀) 원 안에 들어가는 격자점 마스크
+
+    Returns:
+        (2r+1, 2r+1) bool 배열 (r = 반지름을 격자 간격으로 나눈 값), 중심이 [r, r]
+    """
+    reach = int(radius // resolution)
+    offsets = np.arange(-reach, reach + 1) * resolution
+    return offsets[:, None] ** 2 + offsets[None, :] ** 2 <= radius * radius
+
+
+def stroke_centers(gy0, gx0, gy1, gx1):
+    """
+    격자 좌표 (gy0, gx0) → (gy1, gx1) 선분을 따라 찍을 스탬프 중심을 계산합니다.
+
+    스탬프 중심은 격자 간격보다 촘촘하게 놓고 가장 가까운 격자점에 맞춥니다.
+
+    Returns:
+        (M, 2) 정수 격자점 (행, 열), 중복 없음
+    """
+    steps = int(math.ceil(max(abs(gx1 - gx0), abs(gy1 - gy0)))) + 1
+    t = np.linspace(0.0, 1.0, steps)
+    return np.unique(np.stack([np.rint(gy0 + (gy1 - gy0) * t), np.rint(gx0 + (gx1 - gx0) * t)], axis=1)
+                     .astype(np.int64), axis=0)
+
+
+def stamp_union(stamp, centers, i0, i1, j0, j1):
+    """
+    격자점 범위 [i0:i1, j0:j1] 안에서 centers 에 찍은 스탬프들의 합집합 마스크를 만듭니다.
+    (범위 밖으로 나간 부분은 잘라냄)
+    """
+    reach = stamp.shape[0] // 2
+    size = stamp.shape[0]
+    mask = np.zeros((i1 - i0, j1 - j0), dtype=bool)
+    for ci, cj in centers:
+        top, left = ci - reach - i0, cj - reach - j0
+        si0, sj0 = max(-top, 0), max(-left, 0)
+        si1, sj1 = min(size, mask.shape[0] - top), min(size, mask.shape[1] - left)
+        if si0 < si1 and sj0 < sj1:
+            mask[top + si0:top + si1, left + sj0:left + sj1] |= stamp[si0:si1, sj0:sj1]
+    return mask
+
+
+def stroke_mask(stamp, gy0, gx0, gy1, gx1, rows, cols):
+    """
+    격자 좌표 (gy0, gx0) → (gy1, gx1) 선분을 따라 스탬프를 찍은 합집합 마스크를 만듭니다.
+
+    Args:
+        stamp: disk_mask() 결과
+        gy0, gx0, gy1, gx1: 선분 양 끝 (격자 좌표, 실수)
+        rows, cols: 격자 크기 (이 범위로 자름)
+
+    Returns:
+        ((i0, i1, j0, j1), mask): 획을 덮는 격자점 범위와 그 범위의 bool 마스크
+        획이 격자 밖이면 None
+    """
+    reach = stamp.shape[0] // 2
+    centers = stroke_centers(gy0, gx0, gy1, gx1)
+
+    # 획 전체를 덮는 영역 (격자 범위로 자름)
+    i0 = max(int(centers[:, 0].min()) - reach, 0)
+    i1 = min(int(centers[:, 0].max()) + reach + 1, rows)
+    j0 = max(int(centers[:, 1].min()) - reach, 0)
+    j1 = min(int(centers[:, 1].max()) + reach + 1, cols)
+    if i0 >= i1 or j0 >= j1:
+        return None
+    return (i0, i1, j0, j1), stamp_union(stamp, centers, i0, i1, j0, j1)
+
+
+def apply_brush_mode(values, painted, mask, mode, amount, default_temperature, min_temperature, max_temperature):
+    """
+    values / painted 배열(같은 크기의 슬라이스)에서 mask 가 True 인 점에 브러쉬 모드를 적용합니다.
+
+    - BRUSH_HEAT / BRUSH_COOL: amount 만큼 증가/감소 (온도 범위로 제한), 칠해진 점으로 표시
+    - BRUSH_ERASE: 기본 온도로 되돌리고 칠해지지 않은 점으로 표시
+    """
+    if mode == BRUSH_ERASE:
+        values[mask] = default_temperature
+        painted[mask] = False
+    elif mode == BRUSH_HEAT:
+        values[mask] = np.minimum(values[mask] + amount, max_temperature)
+        painted[mask] = True
+    else:  # BRUSH_COOL
+        values[mask] = np.maximum(values[mask] - amount, min_temperature)
+        painted[mask] = True
+
+
+class TemperatureField:
+    """
+    격자 기반 온도 필드
+
+    속성:
+        values: (rows, cols) 온도 배열 (°C)
+        painted: (rows, cols) 칠해진 격자점 여부
+        gradient_x, gradient_y: (rows, cols) 격자점별 온도 기울기 (°C/픽셀, gradient_at() 호출 시 갱신)
+        resolution: 격자 간격 (픽셀)
+        default_temperature: 칠해지지 않은 곳의 온도
+        lookup_mode: 위치 조회 방식 (LOOKUP_BILINEAR / LOOKUP_NEAREST)
+        detection_range: 호환 모드의 감지 범위 (픽셀)
+        min_temperature, max_temperature: 브러쉬로 만들 수 있는 온도 범위
+    """
+
+    def __init__(self, width, height, resolution=10, default_temperature=20.0,
+                 origin=(0, 0), lookup_mode=LOOKUP_BILINEAR, detection_range=100,
+                 min_temperature=-40.0, max_temperature=80.0):
+        """
+        Args:
+            width, height: 필드 영역 크기 (픽셀)
+            resolution: 격자 간격 (픽셀)
+            default_temperature: 기본 온도 (°C)
+            origin: 영역 왼쪽 위 좌표
+            lookup_mode: 위치 조회 방식
+            detection_range: 호환 모드의 감지 범위 (픽셀)
+            min_temperature, max_temperature: 브러쉬 온도 제한 범위 (°C)
+        """
+        self.width = width
+        self.height = height
+        self.resolution = resolution
+        self.default_temperature = default_temperature
+        self.origin_x, self.origin_y = origin
+        self.lookup_mode = lookup_mode
+        self.detection_range = detection_range
+        self.min_temperature = min_temperature
+        self.max_temperature = max_temperature
+
+        self.cols = int(math.ceil(width / resolution)) + 1
+        self.rows = int(math.ceil(height / resolution)) + 1
+        self.values = np.full((self.rows, self.cols), default_temperature, dtype=np.float64)
+        self.painted = np.zeros((self.rows, self.cols), dtype=bool)
+
+        # 브러쉬 반지름(픽셀)별 원형 스탬프 마스크 캐시
+        self._stamp_cache = {}
+
+        # 변경된 격자점 범위 [i0, i1, j0, j1] (없으면 None)
+        self._dirty = [0, self.rows, 0, self.cols]
+
+        # 온도 기울기 (values 가 바뀐 범위만 다시 계산)
+        self.gradient_x = np.zeros((self.rows, self.cols), dtype=np.float64)
+        self.gradient_y = np.zeros((self.rows, self.cols), dtype=np.float64)
+        self._gradient_dirty = [0, self.rows, 0, self.cols]
+
+    # ========================================
+    # 좌표 변환
+    # ========================================
+
+    def to_grid(self, x, y):
+        """픽셀 좌표 → 격자 좌표 (실수)"""
+        return (y - self.origin_y) / self.resolution, (x - self.origin_x) / self.resolution
+
+    def nearest_node(self, x, y):
+        """픽셀 좌표에 가장 가까운 격자점 인덱스 (영역 밖이면 None)"""
+        gy, gx = self.to_grid(x, y)
+        i, j = int(round(gy)), int(round(gx))
+        if 0 <= i < self.rows and 0 <= j < self.cols:
+            return i, j
+        return None
+
+    def node_position(self, i, j):
+        """격자점 인덱스 → 픽셀 좌표"""
+        return self.origin_x + j * self.resolution, self.origin_y + i * self.resolution
+
+    # ========================================
+    # 조회
+    # ========================================
+
+    def temperature_at(self, x, y):
+        """
+        특정 위치의 온도를 반환합니다. (lookup_mode 에 따라 보간 방식 선택)
+
+        Args:
+            x, y: 조회할 위치 좌표 (픽셀)
+
+        Returns:
+            float: 해당 위치의 온도 (°C)
+        """
+        if self.lookup_mode == LOOKUP_NEAREST:
+            return self.sample_nearest(x, y)
+        return self.sample(x, y)
+
+    def sample(self, x, y):
+        """주변 4개 격자점의 쌍선형 보간으로 온도를 계산합니다. (영역 밖은 가장자리 값)"""
+        return self._interpolate(self.values, x, y)
+
+    def gradient_at(self, x, y):
+        """
+        특정 위치의 온도 기울기를 반환합니다. (기울기 배열의 쌍선형 보간, O(1))
+
+        온도 필드가 바뀐 뒤 처음 호출될 때 바뀐 범위의 기울기만 다시 계산합니다.
+        (lookup_mode 와 관계없이 격자 온도의 기울기)
+
+        Returns:
+            (dT/dx, dT/dy): °C/픽셀
+        """
+        if self._gradient_dirty is not None:
+            self.update_gradient()
+        return self._interpolate(self.gradient_x, x, y), self._interpolate(self.gradient_y, x, y)
+
+    def _interpolate(self, grid, x, y):
+        """격자 배열 grid 를 (x, y) 에서 쌍선형 보간합니다."""
+        gy, gx = self.to_grid(x, y)
+        gy = min(max(gy, 0.0), self.rows - 1.0)
+        gx = min(max(gx, 0.0), self.cols - 1.0)
+        i = min(int(gy), self.rows - 2)
+        j = min(int(gx), self.cols - 2)
+        ty = gy - i
+        tx = gx - j
+
+        v = grid
+        top = v[i, j] + (v[i, j + 1] - v[i, j]) * tx
+        bottom = v[i + 1, j] + (v[i + 1, j + 1] - v[i + 1, j]) * tx
+        return float(top + (bottom - top) * ty)
+
+    def temperature_many(self, xs, ys):
+        """여러 위치의 온도 배열 (위치마다 temperature_at() 을 부른 것과 같은 값)"""
+        if self.lookup_mode == LOOKUP_NEAREST:
+            return np.array([self.sample_nearest(x, y) for x, y in zip(xs.tolist(), ys.tolist())])
+        return self._interpolate_many(self.values, xs, ys)
+
+    def gradient_many(self, xs, ys):
+        """여러 위치의 온도 기울기 배열 (dT/dx, dT/dy)"""
+        if self._gradient_dirty is not None:
+            self.update_gradient()
+        return self._interpolate_many(self.gradient_x, xs, ys), self._interpolate_many(self.gradient_y, xs, ys)
+
+    def _interpolate_many(self, grid, xs, ys):
+        """_interpolate() 의 배열 버전"""
+        gy, gx = self.to_grid(np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64))
+        gy = np.clip(gy, 0.0, self.rows - 1.0)
+        gx = np.clip(gx, 0.0, self.cols - 1.0)
+        i = np.minimum(gy.astype(np.int64), self.rows - 2)
+        j = np.minimum(gx.astype(np.int64), self.cols - 2)
+        ty = gy - i
+        tx = gx - j
+
+        v = grid
+        top = v[i, j] + (v[i, j + 1] - v[i, j]) * tx
+        bottom = v[i + 1, j] + (v[i + 1, j + 1] - v[i + 1, j]) * tx
+        return top + (bottom - top) * ty
+
+    def sample_nearest(self, x, y):
+        """
+        기존 온도 맵과 같은 방식으로 온도를 계산합니다. (호환 모드)
+
+        감지 범위(detection_range) 안의 칠해진 격자점 중 가장 가까운 점을 찾아
+        거리에 따라 기본 온도와 선형 보간합니다. 범위 안에 칠해진 점이 없으면 기본 온도입니다.
+        """
+        reach = int(math.ceil(self.detection_range / self.resolution))
+        gy, gx = self.to_grid(x, y)
+        i0 = max(int(math.floor(gy)) - reach, 0)
+        i1 = min(int(math.ceil(gy)) + reach + 1, self.rows)
+        j0 = max(int(math.floor(gx)) - reach, 0)
+        j1 = min(int(math.ceil(gx)) + reach + 1, self.cols)
+        if i0 >= i1 or j0 >= j1:
+            return self.default_temperature
+
+        window = self.painted[i0:i1, j0:j1]
+        if not window.any():
+            return self.default_temperature
+
+        rows, cols = np.nonzero(window)
+        px = self.origin_x + (cols + j0) * self.resolution
+        py = self.origin_y + (rows + i0) * self.resolution
+        distances = np.hypot(px - x, py - y)
+        nearest = int(np.argmin(distances))
+        distance = distances[nearest]
+        if distance >= self.detection_range:
+            return self.default_temperature
+
+        temperature = self.values[rows[nearest] + i0, cols[nearest] + j0]
+        weight = 1 - distance / self.detection_range
+        return float(self.default_temperature + (temperature - self.default_temperature) * weight)
+
+    # ========================================
+    # 수정
+    # ========================================
+
+    def set_node(self, i, j, temperature):
+        """격자점 하나의 온도를 설정하고 칠해진 점으로 표시합니다."""
+        self.values[i, j] = temperature
+        self.painted[i, j] = True
+        self.mark_dirty(i, i + 1, j, j + 1)
+
+    def clear_node(self, i, j):
+        """격자점 하나를 기본 온도로 되돌립니다."""
+        self.values[i, j] = self.default_temperature
+        self.painted[i, j] = False
+        self.mark_dirty(i, i + 1, j, j + 1)
+
+    # ========================================
+    # 브러쉬
+    # ========================================
+
+    def stamp_mask(self, radius):
+        """
+        반지름 radius(픽셀) 원 안에 들어가는 격자점 마스크를 반환합니다. (캐시됨)
+
+        Returns:
+            (2r+1, 2r+1) bool 배열 (r = 반지름을 격자 간격으로 나눈 값), 중심이 [r, r]
+        """
+        mask = self._stamp_cache.get(radius)
+        if mask is None:
+            mask = disk_mask(radius, self.resolution)
+            self._stamp_cache[radius] = mask
+        return mask
+
+    def apply_brush(self, x, y, mode, radius, amount=0.0):
+        """
+        원형 브러쉬를 한 번 적용합니다.
+
+        Args:
+            x, y: 브러쉬 중심 (픽셀, 가장 가까운 격자점에 맞춤)
+            mode: BRUSH_HEAT / BRUSH_COOL / BRUSH_ERASE
+            radius: 브러쉬 반지름 (픽셀)
+            amount: 가열/냉각 온도 변화량 (°C)
+        """
+        self.apply_stroke(x, y, x, y, mode, radius, amount)
+
+    def apply_stroke(self, x0, y0, x1, y1, mode, radius, amount=0.0):
+        """
+        (x0, y0) → (x1, y1) 선분을 따라 브러쉬를 적용합니다.
+
+        마우스 샘플 사이를 격자 간격마다 스탬프로 채워 빈틈 없는 획을 만들고,
+        획이 덮는 격자점에는 변화량을 한 번만 적용합니다.
+        (한 프레임에 브러쉬를 한 번 적용하던 기존 방식과 같은 세기)
+
+        Args:
+            x0, y0: 이전 마우스 위치 (픽셀)
+            x1, y1: 현재 마우스 위치 (픽셀)
+            mode: BRUSH_HEAT / BRUSH_COOL / BRUSH_ERASE
+            radius: 브러쉬 반지름 (픽셀)
+            amount: 가열/냉각 온도 변화량 (°C)
+        """
+        gy0, gx0 = self.to_grid(x0, y0)
+        gy1, gx1 = self.to_grid(x1, y1)
+        region = stroke_mask(self.stamp_mask(radius), gy0, gx0, gy1, gx1, self.rows, self.cols)
+        if region is None:
+            return
+        (i0, i1, j0, j1), mask = region
+        apply_brush_mode(self.values[i0:i1, j0:j1], self.painted[i0:i1, j0:j1], mask, mode, amount,
+                         self.default_temperature, self.min_temperature, self.max_temperature)
+        self.mark_dirty(i0, i1, j0, j1)
+
+    def clear(self):
+        """필드 전체를 기본 온도로 되돌립니다."""
+        self.values.fill(self.default_temperature)
+        self.painted.fill(False)
+        self.mark_dirty()
+
+    def update_painted(self):
+        """
+        기본 온도와 다른 격자점을 칠해진 점으로 다시 표시합니다.
+
+        확산이나 지형 생성처럼 values 배열을 통째로 바꾼 뒤 호출합니다.
+        """
+        np.greater(np.abs(self.values - self.default_temperature), PAINTED_EPSILON, out=self.painted)
+
+    # ========================================
+    # 변경 영역
+    # ========================================
+
+    def mark_dirty(self, i0=0, i1=None, j0=0, j1=None):
+        """
+        격자점 범위 [i0:i1, j0:j1] 가 바뀌었다고 표시합니다. (인자가 없으면 전체)
+
+        values / painted 배열을 직접 수정한 경우에도 호출해야 오버레이가 갱신됩니다.
+        """
+        i1 = self.rows if i1 is None else i1
+        j1 = self.cols if j1 is None else j1
+        self._dirty = self._merge_range(self._dirty, i0, i1, j0, j1)
+        self._gradient_dirty = self._merge_range(self._gradient_dirty, i0, i1, j0, j1)
+
+    @staticmethod
+    def _merge_range(current, i0, i1, j0, j1):
+        """두 격자점 범위를 모두 포함하는 범위"""
+        if current is None:
+            return [i0, i1, j0, j1]
+        return [min(current[0], i0), max(current[1], i1), min(current[2], j0), max(current[3], j1)]
+
+    def update_gradient(self):
+        """
+        마지막 갱신 이후 바뀐 범위의 온도 기울기를 다시 계산합니다.
+
+        안쪽은 중앙 차분, 필드 가장자리는 한쪽 차분 (np.gradient 와 같음)
+        """
+        if self._gradient_dirty is None:
+            return
+        i0, i1, j0, j1 = self._gradient_dirty
+        self._gradient_dirty = None
+
+        # 바뀐 점의 이웃까지 기울기가 바뀜, 계산에는 한 칸 더 넓은 범위가 필요
+        u0, u1 = max(i0 - 1, 0), min(i1 + 1, self.rows)
+        v0, v1 = max(j0 - 1, 0), min(j1 + 1, self.cols)
+        w0, w1 = max(u0 - 1, 0), min(u1 + 1, self.rows)
+        z0, z1 = max(v0 - 1, 0), min(v1 + 1, self.cols)
+        window = self.values[w0:w1, z0:z1]
+        inner = (slice(u0 - w0, u1 - w0), slice(v0 - z0, v1 - z0))
+        if window.shape[0] > 1:
+            self.gradient_y[u0:u1, v0:v1] = np.gradient(window, self.resolution, axis=0)[inner]
+        if window.shape[1] > 1:
+            self.gradient_x[u0:u1, v0:v1] = np.gradient(window, self.resolution, axis=1)[inner]
+
+    def take_dirty(self):
+        """
+        마지막 호출 이후 바뀐 격자점 범위를 반환하고 초기화합니다.
+
+        Returns:
+            (i0, i1, j0, j1) 또는 None (바뀐 곳이 없음)
+        """
+        dirty, self._dirty = self._dirty, None
+        return None if dirty is None else tuple(dirty)
+
+    # ========================================
+    # 정보
+    # ========================================
+
+    def painted_count(self):
+        """칠해진 격자점 수"""
+        return int(np.count_nonzero(self.painted))
+
+    def painted_points(self):
+        """
+        칠해진 격자점 목록을 반환합니다.
+
+        Returns:
+            (xs, ys, temperatures): 픽셀 좌표 배열과 온도 배열
+        """
+        rows, cols = np.nonzero(self.painted)
+        xs = self.origin_x + cols * self.resolution
+        ys = self.origin_y + rows * self.resolution
+        return xs, ys, self.values[rows, cols]
@@ -0,0 +1,236 @@
+# ============================================================
+# temperature_landscape.py - 온도 지형 생성기
+# ============================================================
+#
+# 재현 가능한 실험을 위한 표준 온도 환경을 TemperatureField 에 직접 씁니다.
+# 모든 생성기는 격자 전체를 배열 연산으로 한 번에 계산합니다.
+#
+# - linear:  한 방향으로 온도가 선형으로 변하는 기울기
+# - radial:  가우시안 모양의 뜨거운/차가운 점
+# - stripes: 일정 간격의 줄무늬 (사인파 또는 계단)
+# - noise:   여러 크기를 겹친 값 노이즈 (seed 로 재현 가능)
+#
+# blend='replace' 는 기본 온도 위에 새로 만들고, blend='add' 는 현재 필드에 더합니다.
+# (예: 기울기 + 노이즈)
+#
+# 사용법 (터미널, GUI 없이 온도 환경 파일 생성):
+#   python temperature_landscape.py linear -o arena.npz
+#   python temperature_landscape.py noise -o arena.npz --set scale=120 --set seed=7
+#   python temperature_landscape.py linear noise -o arena.npz --set noise.amplitude=3
+# ============================================================
+
+import argparse
+import json
+import math
+
+import numpy as np
+
+from temperature_arena import save_arena
+from temperature_field import TemperatureField
+
+BLEND_REPLACE = 'replace'  # 기본 온도 위에 새로 생성
+BLEND_ADD = 'add'          # 현재 온도에 변화량을 더함
+
+
+def _node_coordinates(field):
+    """격자점의 픽셀 좌표 (ys: (rows, 1), xs: (1, cols)) - 브로드캐스팅용"""
+    xs = field.origin_x + np.arange(field.cols, dtype=np.float64) * field.resolution
+    ys = field.origin_y + np.arange(field.rows, dtype=np.float64) * field.resolution
+    return ys[:, None], xs[None, :]
+
+
+def _write(field, offset, blend):
+    """
+    기본 온도에 대한 온도 변화량(offset)을 필드에 씁니다.
+
+    온도 범위(min/max_temperature)로 자르고, 기본 온도와 다른 점을 칠해진 점으로 표시합니다.
+    """
+    if blend == BLEND_ADD:
+        field.values += offset
+    elif blend == BLEND_REPLACE:
+        np.add(offset, field.default_temperature, out=field.values)
+    else:
+        raise ValueError(f"알 수 없는 blend 방식: {blend}")
+    np.clip(field.values, field.min_temperature, field.max_temperature, out=field.values)
+    field.update_painted()
+    field.mark_dirty()
+
+
+# ============================================================
+# 생성기
+# ============================================================
+
+def linear_gradient(field, low=10.0, high=30.0, angle=0.0, blend=BLEND_REPLACE):
+    """
+    angle 방향으로 low → high 로 선형 변하는 온도 기울기를 만듭니다.
+
+    Args:
+        field: TemperatureField
+        low, high: 양 끝 온도 (°C, blend='add' 이면 기본 온도 기준 변화량)
+        angle: 온도가 높아지는 방향 (도, 0 = 오른쪽, 90 = 아래쪽)
+        blend: BLEND_REPLACE / BLEND_ADD
+    """
+    ys, xs = _node_coordinates(field)
+    dx, dy = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+    projection = xs * dx + ys * dy
+    start, end = projection.min(), projection.max()
+    ratio = (projection - start) / (end - start) if end > start else np.zeros_like(projection)
+    base = 0.0 if blend == BLEND_ADD else field.default_temperature
+    _write(field, low - base + (high - low) * ratio, blend)
+
+
+def radial_spots(field, spots=((350, 350, 35.0, 80),), blend=BLEND_REPLACE):
+    """
+    가우시안 모양의 뜨거운/차가운 점을 만듭니다. (여러 점은 변화량을 더함)
+
+    Args:
+        field: TemperatureField
+        spots: [(x, y, 중심 온도, 반지름), ...] - 반지름은 가우시안 표준편차 (픽셀)
+        blend: BLEND_REPLACE / BLEND_ADD
+    """
+    ys, xs = _node_coordinates(field)
+    offset = np.zeros((field.rows, field.cols), dtype=np.float64)
+    for x, y, temperature, radius in spots:
+        distance_squared = (xs - x) ** 2 + (ys - y) ** 2
+        offset += (temperature - field.default_temperature) * np.exp(-distance_squared / (2.0 * radius * radius))
+    _write(field, offset, blend)
+
+
+def stripes(field, low=15.0, high=25.0, period=140.0, angle=0.0, smooth=True, blend=BLEND_REPLACE):
+    """
+    일정 간격의 온도 줄무늬를 만듭니다.
+
+    Args:
+        field: TemperatureField
+        low, high: 줄무늬 온도 (°C)
+        period: 줄무늬 한 주기 길이 (픽셀)
+        angle: 줄무늬가 반복되는 방향 (도)
+        smooth: True 면 사인파, False 면 계단 모양
+        blend: BLEND_REPLACE / BLEND_ADD
+    """
+    ys, xs = _node_coordinates(field)
+    dx, dy = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+    wave = np.sin(2.0 * math.pi * (xs * dx + ys * dy) / period)
+    if not smooth:
+        wave = np.where(wave >= 0, 1.0, -1.0)
+    ratio = (wave + 1.0) * 0.5
+    base = 0.0 if blend == BLEND_ADD else field.default_temperature
+    _write(field, low - base + (high - low) * ratio, blend)
+
+
+def noise(field, amplitude=8.0, scale=160.0, octaves=3, seed=0, blend=BLEND_REPLACE):
+    """
+    값 노이즈로 불규칙한 온도 지형을 만듭니다.
+
+    scale 간격의 무작위 격자 값을 부드럽게 보간하고, 크기를 반씩 줄인 격자를
+    octaves 번 겹칩니다. 같은 seed 면 항상 같은 지형이 만들어집니다.
+
+    Args:
+        field: TemperatureField
+        amplitude: 기본 온도 대비 최대 온도 변화 (°C)
+        scale: 가장 큰 무늬 크기 (픽셀)
+        octaves: 겹치는 단계 수
+        seed: 난수 시드
+        blend: BLEND_REPLACE / BLEND_ADD
+    """
+    rng = np.random.default_rng(seed)
+    ys, xs = _node_coordinates(field)
+    offset = np.zeros((field.rows, field.cols), dtype=np.float64)
+    weight_sum = 0.0
+    for octave in range(octaves):
+        cell = scale / (2 ** octave)
+        weight = 0.5 ** octave
+        gy = (ys - field.origin_y) / cell
+        gx = (xs - field.origin_x) / cell
+        lattice = rng.uniform(-1.0, 1.0, (int(gy.max()) + 2, int(gx.max()) + 2))
+
+        iy, ix = gy.astype(np.int64), gx.astype(np.int64)
+        ty, tx = gy - iy, gx - ix
+        ty, tx = ty * ty * (3 - 2 * ty), tx * tx * (3 - 2 * tx)  # smoothstep
+
+        # 가로 방향 보간 후 세로 방향 보간 (분리 가능)
+        ix, tx = ix[0], tx[0]
+        rows = lattice[:, ix] + (lattice[:, ix + 1] - lattice[:, ix]) * tx
+        iy = iy[:, 0]
+        offset += weight * (rows[iy] + (rows[iy + 1] - rows[iy]) * ty)
+        weight_sum += weight
+    _write(field, offset * (amplitude / weight_sum), blend)
+
+
+# 이름 → 생성기 (디버그 UI / 명령행에서 선택)
+LANDSCAPES = {
+    'linear': linear_gradient,
+    'radial': radial_spots,
+    'stripes': stripes,
+    'noise': noise,
+}
+
+
+def generate(field, name, **params):
+    """
+    이름으로 생성기를 골라 필드에 온도 지형을 만듭니다.
+
+    Raises:
+        ValueError: 알 수 없는 생성기 이름
+    """
+    generator = LANDSCAPES.get(name)
+    if generator is None:
+        raise ValueError(f"알 수 없는 온도 지형: {name} (가능: {', '.join(LANDSCAPES)})")
+    generator(field, **params)
+
+
+# ============================================================
+# 명령행
+# ============================================================
+
+def parse_params(assignments, names):
+    """
+    --set 인자 목록을 생성기별 파라미터로 변환합니다.
+
+    'key=value' 는 모든 생성기에, 'name.key=value' 는 해당 생성기에만 적용합니다.
+    값은 JSON 으로 읽고, 실패하면 문자열로 씁니다.
+    """
+    params = {name: {} for name in names}
+    for assignment in assignments:
+        key, _, text = assignment.partition('=')
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError:
+            value = text
+        if isinstance(value, list):
+            value = [tuple(item) if isinstance(item, list) else item for item in value]
+        target, _, key = key.rpartition('.')
+        for name in ([target] if target else names):
+            params[name][key] = value
+    return params
+
+
+def main():
+    parser = argparse.ArgumentParser(description="온도 지형을 생성해 온도 환경 파일(.npz)로 저장합니다.")
+    parser.add_argument('landscapes', nargs='+', choices=list(LANDSCAPES),
+                        help="생성기 이름 (여러 개면 두 번째부터 blend=add 로 겹침)")
+    parser.add_argument('-o', '--output', required=True, help="저장할 .npz 경로")
+    parser.add_argument('--size', type=int, nargs=2, default=(700, 700), metavar=('WIDTH', 'HEIGHT'),
+                        help="영역 크기 (픽셀, 기본 700 700)")
+    parser.add_argument('--resolution', type=int, default=10, help="격자 간격 (픽셀, 기본 10)")
+    parser.add_argument('--default-temperature', type=float, default=20.0, help="기본 온도 (°C)")
+    parser.add_argument('--set', action='append', default=[], metavar='[NAME.]KEY=VALUE',
+                        help="생성기 파라미터 (예: --set angle=90, --set noise.seed=3)")
+    args = parser.parse_args()
+
+    field = TemperatureField(args.size[0], args.size[1], resolution=args.resolution,
+                             default_temperature=args.default_temperature)
+    params = parse_params(args.set, args.landscapes)
+    for order, name in enumerate(args.landscapes):
+        options = dict(params[name])
+        if order > 0:
+            options.setdefault('blend', BLEND_ADD)
+        generate(field, name, **options)
+
+    save_arena(args.output, field, scenario={'landscapes': args.landscapes, 'params': params})
+    print(f"'{args.output}' 저장: {field.rows}×{field.cols} 격자점, "
+          f"온도 {field.values.min():.1f} ~ {field.values.max():.1f}°C")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+# ============================================================
+# temperature_overlay.py - 온도 필드 화면 오버레이
+# ============================================================
+#
+# 디버그 모드에서 온도 필드를 반투명 색상과 온도 숫자로 표시합니다.
+#
+# - 색상: 격자점 하나당 한 픽셀인 작은 Surface 에 색상표(LUT)로 변환한 온도를
+#         surfarray 로 한 번에 쓰고, 격자 간격만큼 확대해서 표시 (격자 해상도 그대로)
+# - 숫자: cell_size 칸마다 칠해진 격자점의 평균 온도
+#
+# 매 프레임 전체를 다시 그리지 않고, 온도 필드에서 바뀐 범위(take_dirty)만 갱신합니다.
+# 온도 숫자는 정수 값별로 한 번만 렌더링한 이미지(glyph)를 재사용합니다.
+# ============================================================
+
+import numpy as np
+import pygame
+
+# 색상표 크기 (min ~ max 온도를 이 개수로 나눔)
+COLOR_TABLE_SIZE = 1024
+
+
+def build_color_table(min_temperature, default_temperature, max_temperature, size=COLOR_TABLE_SIZE):
+    """
+    온도 → 색상 변환표를 (size, 3) uint8 배열로 만듭니다.
+
+    - 차가움 (min ~ default): 파랑 → 흰색
+    - 뜨거움 (default ~ max): 흰색 → 빨강
+
+    색상표의 k 번째 색은 온도 min + (max - min) * k / (size - 1) 의 색입니다.
+    """
+    temperatures = np.linspace(min_temperature, max_temperature, size)
+    cold = np.clip((temperatures - min_temperature) / (default_temperature - min_temperature), 0, 1)
+    hot = np.clip((temperatures - default_temperature) / (max_temperature - default_temperature), 0, 1)
+    is_cold = temperatures < default_temperature
+
+    table = np.empty((size, 3), dtype=np.uint8)
+    table[:, 0] = np.where(is_cold, (255 * cold).astype(int), 255)
+    table[:, 1] = np.where(is_cold, (255 * cold).astype(int), (255 * (1 - hot)).astype(int))
+    table[:, 2] = np.where(is_cold, 255, (255 * (1 - hot)).astype(int))
+    return table
+
+
+class TemperatureOverlay:
+    """
+    온도 필드 오버레이
+
+    칠해진 격자점마다 격자 간격 크기의 색상 사각형을 표시하고,
+    칸(cell_size 픽셀)마다 그 안의 칠해진 격자점 평균 온도를 숫자로 표시합니다.
+
+    속성:
+        field: TemperatureField
+        color_surface: 격자점 하나당 한 픽셀인 색상 Surface
+        label_surface: 온도 숫자 Surface (화면 크기)
+        cell_size: 숫자 칸 크기 (픽셀)
+    """
+
+    def __init__(self, field, width, height, cell_size=30, min_temperature=-40.0,
+                 default_temperature=20.0, max_temperature=80.0, alpha=80, font=None):
+        """
+        Args:
+            field: 표시할 TemperatureField
+            width, height: 오버레이 영역 크기 (픽셀, 뉴런 패널 제외)
+            cell_size: 숫자 칸 크기 (픽셀)
+            min_temperature, default_temperature, max_temperature: 색상 범위 (°C)
+            alpha: 색상 투명도 (0~255)
+            font: 온도 숫자 폰트 (None 이면 기본 폰트)
+        """
+        self.field = field
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.min_temperature = min_temperature
+        self.default_temperature = default_temperature
+        self.max_temperature = max_temperature
+        self.alpha = alpha
+        self.font = font if font is not None else pygame.font.SysFont("malgungothic,arial", 10)
+
+        # 색상: 격자점 단위 Surface 와 확대한 결과 (바뀐 경우에만 다시 확대)
+        self.color_table = build_color_table(min_temperature, default_temperature, max_temperature)
+        self.color_surface = pygame.Surface((field.cols, field.rows), pygame.SRCALPHA)
+        self._scaled_surface = None
+        resolution = field.resolution
+        self._scaled_size = (field.cols * resolution, field.rows * resolution)
+        # 격자점이 확대한 사각형의 중앙에 오도록 반 칸 당겨서 표시
+        self._offset = (int(field.origin_x - resolution // 2), int(field.origin_y - resolution // 2))
+
+        # 숫자
+        self.label_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.bin_cols = -(-width // cell_size)
+        self.bin_rows = -(-height // cell_size)
+
+        # 칸별 격자점 범위: 격자점 위치가 [칸 시작, 칸 끝) 에 들어가는 인덱스
+        self._col_ranges = self._node_ranges(field.origin_x, field.cols, self.bin_cols, width)
+        self._row_ranges = self._node_ranges(field.origin_y, field.rows, self.bin_rows, height)
+
+        # 정수 온도별 숫자 렌더링 캐시
+        self._labels = {}
+
+    def _node_ranges(self, origin, count, bins, limit):
+        """칸 번호별 격자점 인덱스 범위 (start, end) 배열을 계산합니다."""
+        positions = origin + np.arange(count) * self.field.resolution
+        edges = np.minimum(np.arange(bins + 1) * self.cell_size, limit)
+        starts = np.searchsorted(positions, edges[:-1], side='left')
+        ends = np.searchsorted(positions, edges[1:], side='left')
+        return np.stack([starts, ends], axis=1)
+
+    def _label(self, value):
+        """정수 온도 숫자의 렌더링 결과 (캐시됨)"""
+        label = self._labels.get(value)
+        if label is None:
+            label = self.font.render(f"{value}°", True, (255, 255, 255))
+            self._labels[value] = label
+        return label
+
+    def invalidate(self):
+        """다음 update() 에서 전체 칸을 다시 그리도록 표시합니다."""
+        self.field.mark_dirty()
+
+    def update(self):
+        """
+        마지막 갱신 이후 바뀐 범위만 다시 그립니다.
+
+        Returns:
+            bool: 다시 그린 곳이 있으면 True
+        """
+        dirty = self.field.take_dirty()
+        if dirty is None:
+            return False
+        self._update_colors(*dirty)
+        self._update_labels(*dirty)
+        return True
+
+    def _update_colors(self, i0, i1, j0, j1):
+        """격자점 범위 [i0:i1, j0:j1] 의 색상을 색상표로 한 번에 변환해 씁니다."""
+        values = self.field.values[i0:i1, j0:j1]
+        span = self.max_temperature - self.min_temperature
+        index = np.rint((values - self.min_temperature) * ((len(self.color_table) - 1) / span))
+        index = np.clip(index, 0, len(self.color_table) - 1).astype(np.intp)
+
+        # surfarray 배열은 [x, y] 순서
+        pixels = pygame.surfarray.pixels3d(self.color_surface)
+        pixels[j0:j1, i0:i1] = self.color_table[index].transpose(1, 0, 2)
+        del pixels
+        alpha = pygame.surfarray.pixels_alpha(self.color_surface)
+        alpha[j0:j1, i0:i1] = self.field.painted[i0:i1, j0:j1].T * np.uint8(self.alpha)
+        del alpha
+
+        # 격자점 하나 → resolution × resolution 사각형 (최근접 확대)
+        self._scaled_surface = pygame.transform.scale(self.color_surface, self._scaled_size)
+
+    def _update_labels(self, i0, i1, j0, j1):
+        """격자점 범위 [i0:i1, j0:j1] 를 포함하는 칸의 온도 숫자를 다시 그립니다."""
+        # 바뀐 격자점 범위를 포함하는 칸 범위 (연속)
+        rows = np.flatnonzero((self._row_ranges[:, 0] < i1) & (self._row_ranges[:, 1] > i0))
+        cols = np.flatnonzero((self._col_ranges[:, 0] < j1) & (self._col_ranges[:, 1] > j0))
+        if len(rows) == 0 or len(cols) == 0:
+            return
+        row_ranges = self._row_ranges[rows]
+        col_ranges = self._col_ranges[cols]
+
+        # 칸별 칠해진 격자점 온도 합계와 개수 (reduceat 으로 한 번에)
+        r0, r1 = row_ranges[0, 0], row_ranges[-1, 1]
+        c0, c1 = col_ranges[0, 0], col_ranges[-1, 1]
+        painted = self.field.painted[r0:r1, c0:c1]
+        row_starts = row_ranges[:, 0] - r0
+        col_starts = col_ranges[:, 0] - c0
+        sums = np.add.reduceat(np.add.reduceat(np.where(painted, self.field.values[r0:r1, c0:c1], 0.0),
+                                               row_starts, axis=0), col_starts, axis=1)
+        counts = np.add.reduceat(np.add.reduceat(painted.astype(np.int64), row_starts, axis=0), col_starts, axis=1)
+        # 격자점이 없는 칸 (reduceat 은 빈 구간에 다음 값을 넣음)
+        counts[row_ranges[:, 0] == row_ranges[:, 1], :] = 0
+        counts[:, col_ranges[:, 0] == col_ranges[:, 1]] = 0
+
+        size = self.cell_size
+        self.label_surface.fill((0, 0, 0, 0), (cols[0] * size, rows[0] * size, len(cols) * size, len(rows) * size))
+        for k, l in zip(*np.nonzero(counts)):
+            average_temperature = sums[k, l] / counts[k, l]
+            position = (cols[l] * size + 3, rows[k] * size + 8)
+            self.label_surface.blit(self._label(int(average_temperature)), position)
+
+    def draw(self, screen):
+        """바뀐 범위를 갱신한 뒤 오버레이를 화면에 그립니다. (오버레이 영역 밖은 잘라냄)"""
+        self.update()
+        if self._scaled_surface is not None:
+            x, y = max(self._offset[0], 0), max(self._offset[1], 0)
+            area = pygame.Rect(x - self._offset[0], y - self._offset[1], self.width - x, self.height - y)
+            screen.blit(self._scaled_surface, (x, y), area)
+        screen.blit(self.label_surface, (0, 0))
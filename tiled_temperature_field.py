@@ -0,0 +1,321 @@
+# ============================================================
+# tiled_temperature_field.py - 타일 기반 대형 온도 필드
+# ============================================================
+#
+# 수천 마리 몸길이 크기의 넓은 실험 영역을 위한 온도 필드입니다.
+# TemperatureField 와 같은 격자(간격 resolution)를 쓰지만,
+# 전체 배열 대신 tile_size × tile_size 격자점 타일 단위로 나누어
+# 기본 온도와 다른 타일만 메모리에 둡니다. (메모리 ∝ 칠한 넓이)
+#
+# - 세밀한 단계: 칠해진 타일의 격자점 온도 (브러쉬로 수정)
+# - 거친 단계: 타일별 평균 온도 (멀리 있는 영역을 한 번에 볼 때 sample_coarse)
+# - 주변 캐시: 마지막으로 조회한 위치 주변 3×3 타일을 하나의 배열로 붙여 두고
+#              같은 영역 안의 조회는 배열 보간만으로 처리 (벌레 주변 조회용)
+#
+# 배열 기반 TemperatureField 의 오버레이/확산/arena 저장 기능은
+# 전체 배열을 전제로 하므로 이 필드에는 적용되지 않습니다.
+# ============================================================
+
+import math
+
+import numpy as np
+
+from temperature_field import disk_mask, stroke_centers, stamp_union, apply_brush_mode, BRUSH_ERASE
+
+
+class TemperatureTile:
+    """기본 온도와 다른 격자점이 있는 타일 하나"""
+
+    __slots__ = ('values', 'painted')
+
+    def __init__(self, size, default_temperature):
+        self.values = np.full((size, size), default_temperature, dtype=np.float64)
+        self.painted = np.zeros((size, size), dtype=bool)
+
+
+class TiledTemperatureField:
+    """
+    타일 기반 온도 필드
+
+    속성:
+        rows, cols: 전체 격자점 수 (배열로 할당하지 않음)
+        tile_size: 타일 한 변의 격자점 수
+        tiles: {(타일 행, 타일 열): TemperatureTile} - 칠해진 타일만 존재
+        tile_means: {(타일 행, 타일 열): 평균 온도} - 거친 단계
+    """
+
+    def __init__(self, width, height, resolution=10, default_temperature=20.0, origin=(0, 0),
+                 tile_size=64, min_temperature=-40.0, max_temperature=80.0):
+        """
+        Args:
+            width, height: 영역 크기 (픽셀)
+            resolution: 격자 간격 (픽셀)
+            default_temperature: 기본 온도 (°C)
+            origin: 영역 왼쪽 위 좌표
+            tile_size: 타일 한 변의 격자점 수
+            min_temperature, max_temperature: 브러쉬 온도 제한 범위 (°C)
+        """
+        self.width = width
+        self.height = height
+        self.resolution = resolution
+        self.default_temperature = default_temperature
+        self.origin_x, self.origin_y = origin
+        self.tile_size = tile_size
+        self.min_temperature = min_temperature
+        self.max_temperature = max_temperature
+
+        self.cols = int(math.ceil(width / resolution)) + 1
+        self.rows = int(math.ceil(height / resolution)) + 1
+        self.tiles = {}
+        self.tile_means = {}
+
+        self._stamp_cache = {}
+
+        # 주변 캐시: 3×3 타일을 붙인 배열과 그 범위, 만들 때의 필드 버전
+        self._version = 0
+        self._window_key = None
+        self._window_version = -1
+        self._window_origin = (0, 0)
+        self._window = None
+        self._window_gradient = None
+
+    # ========================================
+    # 좌표 변환
+    # ========================================
+
+    def to_grid(self, x, y):
+        """픽셀 좌표 → 격자 좌표 (실수)"""
+        return (y - self.origin_y) / self.resolution, (x - self.origin_x) / self.resolution
+
+    def tile_of(self, i, j):
+        """격자점 인덱스가 속한 타일 번호"""
+        return i // self.tile_size, j // self.tile_size
+
+    # ========================================
+    # 조회
+    # ========================================
+
+    def node_temperature(self, i, j):
+        """격자점 하나의 온도 (칠해지지 않은 타일은 기본 온도)"""
+        tile = self.tiles.get(self.tile_of(i, j))
+        if tile is None:
+            return self.default_temperature
+        return float(tile.values[i % self.tile_size, j % self.tile_size])
+
+    def temperature_at(self, x, y):
+        """특정 위치의 온도를 반환합니다. (쌍선형 보간, TemperatureField.temperature_at 과 같은 값)"""
+        return self.sample(x, y)
+
+    def sample(self, x, y):
+        """주변 4개 격자점의 쌍선형 보간으로 온도를 계산합니다. (영역 밖은 가장자리 값)"""
+        i, j, ty, tx = self._cell(x, y)
+        window = self._focus(i, j)
+        wi, wj = i - self._window_origin[0], j - self._window_origin[1]
+        return self._interpolate(window, wi, wj, ty, tx)
+
+    def gradient_at(self, x, y):
+        """
+        특정 위치의 온도 기울기를 반환합니다. (주변 캐시의 기울기 배열 보간)
+
+        Returns:
+            (dT/dx, dT/dy): °C/픽셀
+        """
+        i, j, ty, tx = self._cell(x, y)
+        self._focus(i, j)
+        if self._window_gradient is None:
+            gradient_y, gradient_x = np.gradient(self._window, self.resolution) \
+                if min(self._window.shape) > 1 else (np.zeros_like(self._window),) * 2
+            self._window_gradient = (gradient_x, gradient_y)
+        wi, wj = i - self._window_origin[0], j - self._window_origin[1]
+        gradient_x, gradient_y = self._window_gradient
+        return (self._interpolate(gradient_x, wi, wj, ty, tx),
+                self._interpolate(gradient_y, wi, wj, ty, tx))
+
+    def temperature_many(self, xs, ys):
+        """여러 위치의 온도 배열 (위치마다 주변 캐시를 쓰는 sample() 호출)"""
+        return np.array([self.sample(x, y) for x, y in zip(np.asarray(xs).tolist(), np.asarray(ys).tolist())])
+
+    def gradient_many(self, xs, ys):
+        """여러 위치의 온도 기울기 배열 (dT/dx, dT/dy)"""
+        gradients = [self.gradient_at(x, y) for x, y in zip(np.asarray(xs).tolist(), np.asarray(ys).tolist())]
+        gradients = np.array(gradients, dtype=np.float64).reshape(-1, 2)
+        return gradients[:, 0], gradients[:, 1]
+
+    def sample_coarse(self, x, y):
+        """
+        타일 평균 온도(거친 단계)를 타일 중심 사이에서 보간합니다.
+
+        멀리 있는 영역의 대략적인 온도를 격자점 접근 없이 O(1) 로 얻을 때 사용합니다.
+        """
+        gy, gx = self.to_grid(x, y)
+        ty = gy / self.tile_size - 0.5
+        tx = gx / self.tile_size - 0.5
+        i, j = int(math.floor(ty)), int(math.floor(tx))
+        fy, fx = ty - i, tx - j
+        mean = self.tile_means.get
+        default = self.default_temperature
+        top = mean((i, j), default) + (mean((i, j + 1), default) - mean((i, j), default)) * fx
+        bottom = mean((i + 1, j), default) + (mean((i + 1, j + 1), default) - mean((i + 1, j), default)) * fx
+        return top + (bottom - top) * fy
+
+    def _cell(self, x, y):
+        """위치를 포함하는 격자 칸의 왼쪽 위 격자점과 칸 안의 비율"""
+        gy, gx = self.to_grid(x, y)
+        gy = min(max(gy, 0.0), self.rows - 1.0)
+        gx = min(max(gx, 0.0), self.cols - 1.0)
+        i = min(int(gy), self.rows - 2)
+        j = min(int(gx), self.cols - 2)
+        return i, j, gy - i, gx - j
+
+    @staticmethod
+    def _interpolate(grid, i, j, ty, tx):
+        top = grid[i, j] + (grid[i, j + 1] - grid[i, j]) * tx
+        bottom = grid[i + 1, j] + (grid[i + 1, j + 1] - grid[i + 1, j]) * tx
+        return float(top + (bottom - top) * ty)
+
+    def _focus(self, i, j):
+        """
+        격자점 (i, j) 가 속한 타일 주변 3×3 타일을 붙인 배열을 반환합니다. (캐시됨)
+
+        같은 타일 안에서 필드가 바뀌지 않았으면 다시 만들지 않습니다.
+        """
+        key = self.tile_of(i, j)
+        if key == self._window_key and self._window_version == self._version:
+            return self._window
+
+        size = self.tile_size
+        i0, j0 = max((key[0] - 1) * size, 0), max((key[1] - 1) * size, 0)
+        i1, j1 = min((key[0] + 2) * size, self.rows), min((key[1] + 2) * size, self.cols)
+        window = np.full((i1 - i0, j1 - j0), self.default_temperature, dtype=np.float64)
+        for ti in range(key[0] - 1, key[0] + 2):
+            for tj in range(key[1] - 1, key[1] + 2):
+                tile = self.tiles.get((ti, tj))
+                if tile is None:
+                    continue
+                a0, b0 = max(ti * size, i0), max(tj * size, j0)
+                a1, b1 = min((ti + 1) * size, i1), min((tj + 1) * size, j1)
+                window[a0 - i0:a1 - i0, b0 - j0:b1 - j0] = \
+                    tile.values[a0 - ti * size:a1 - ti * size, b0 - tj * size:b1 - tj * size]
+
+        self._window = window
+        self._window_gradient = None
+        self._window_origin = (i0, j0)
+        self._window_key = key
+        self._window_version = self._version
+        return window
+
+    # ========================================
+    # 수정
+    # ========================================
+
+    def stamp_mask(self, radius):
+        """반지름 radius(픽셀) 원형 스탬프 마스크 (캐시됨)"""
+        mask = self._stamp_cache.get(radius)
+        if mask is None:
+            mask = disk_mask(radius, self.resolution)
+            self._stamp_cache[radius] = mask
+        return mask
+
+    def apply_brush(self, x, y, mode, radius, amount=0.0):
+        """원형 브러쉬를 한 번 적용합니다. (TemperatureField.apply_brush 와 같음)"""
+        self.apply_stroke(x, y, x, y, mode, radius, amount)
+
+    def apply_stroke(self, x0, y0, x1, y1, mode, radius, amount=0.0):
+        """
+        (x0, y0) → (x1, y1) 선분을 따라 브러쉬를 적용합니다. (TemperatureField.apply_stroke 와 같음)
+
+        필요한 타일만 새로 만들고, 지우기로 기본 상태가 된 타일은 메모리에서 제거합니다.
+        마스크는 획이 닿는 타일마다 따로 만들므로 긴 대각선 획도 타일 크기 배열만 할당합니다.
+        """
+        gy0, gx0 = self.to_grid(x0, y0)
+        gy1, gx1 = self.to_grid(x1, y1)
+        stamp = self.stamp_mask(radius)
+        reach = stamp.shape[0] // 2
+        size = self.tile_size
+
+        # 스탬프마다 닿는 타일을 모아 타일 크기 마스크만 만듦 (획 전체 범위의 마스크는 만들지 않음)
+        tile_centers = {}
+        for center in stroke_centers(gy0, gx0, gy1, gx1):
+            ci, cj = int(center[0]), int(center[1])
+            a0, a1 = max(ci - reach, 0), min(ci + reach + 1, self.rows)
+            b0, b1 = max(cj - reach, 0), min(cj + reach + 1, self.cols)
+            if a0 >= a1 or b0 >= b1:
+                continue
+            for ti in range(a0 // size, (a1 - 1) // size + 1):
+                for tj in range(b0 // size, (b1 - 1) // size + 1):
+                    tile_centers.setdefault((ti, tj), []).append(center)
+        if not tile_centers:
+            return
+
+        for (ti, tj), centers in tile_centers.items():
+            a0, a1 = ti * size, min((ti + 1) * size, self.rows)
+            b0, b1 = tj * size, min((tj + 1) * size, self.cols)
+            tile_mask = stamp_union(stamp, centers, a0, a1, b0, b1)
+            if not tile_mask.any():
+                continue
+            tile = self.tiles.get((ti, tj))
+            if tile is None:
+                if mode == BRUSH_ERASE:
+                    continue
+                tile = self.tiles[(ti, tj)] = TemperatureTile(size, self.default_temperature)
+            local = (slice(0, a1 - a0), slice(0, b1 - b0))
+            apply_brush_mode(tile.values[local], tile.painted[local], tile_mask, mode, amount,
+                             self.default_temperature, self.min_temperature, self.max_temperature)
+            self._tile_changed((ti, tj), tile)
+        self._version += 1
+
+    def set_node(self, i, j, temperature):
+        """격자점 하나의 온도를 설정하고 칠해진 점으로 표시합니다."""
+        key = self.tile_of(i, j)
+        tile = self.tiles.get(key)
+        if tile is None:
+            tile = self.tiles[key] = TemperatureTile(self.tile_size, self.default_temperature)
+        tile.values[i % self.tile_size, j % self.tile_size] = temperature
+        tile.painted[i % self.tile_size, j % self.tile_size] = True
+        self._tile_changed(key, tile)
+        self._version += 1
+
+    def clear_node(self, i, j):
+        """격자점 하나를 기본 온도로 되돌립니다."""
+        key = self.tile_of(i, j)
+        tile = self.tiles.get(key)
+        if tile is None:
+            return
+        tile.values[i % self.tile_size, j % self.tile_size] = self.default_temperature
+        tile.painted[i % self.tile_size, j % self.tile_size] = False
+        self._tile_changed(key, tile)
+        self._version += 1
+
+    def clear(self):
+        """필드 전체를 기본 온도로 되돌립니다. (모든 타일 해제)"""
+        self.tiles.clear()
+        self.tile_means.clear()
+        self._version += 1
+
+    def _tile_changed(self, key, tile):
+        """타일 평균을 갱신하고, 기본 상태로 돌아간 타일은 제거합니다."""
+        if not tile.painted.any() and (tile.values == self.default_temperature).all():
+            del self.tiles[key]
+            self.tile_means.pop(key, None)
+            return
+        # 영역 밖 격자점은 평균에서 제외
+        size = self.tile_size
+        rows = min(size, self.rows - key[0] * size)
+        cols = min(size, self.cols - key[1] * size)
+        self.tile_means[key] = float(tile.values[:rows, :cols].mean())
+
+    # ========================================
+    # 정보
+    # ========================================
+
+    def painted_count(self):
+        """칠해진 격자점 수"""
+        return sum(int(np.count_nonzero(tile.painted)) for tile in self.tiles.values())
+
+    def tile_count(self):
+        """메모리에 있는 타일 수"""
+        return len(self.tiles)
+
+    def memory_bytes(self):
+        """타일 배열이 차지하는 메모리 (바이트)"""
+        return sum(tile.values.nbytes + tile.painted.nbytes for tile in self.tiles.values())
@@ -0,0 +1,490 @@
+# ============================================================
+# world.py - 벌레 / 환경 시뮬레이션 모델 (pygame 없음)
+# ============================================================
+#
+# 벌레 상태, 배고픔, 먹이, 온도, 냄새를 하나의 World 객체에 모으고
+# step(dt) 한 번으로 dt 초만큼 진행합니다.
+#
+# - pygame 을 import 하지 않으므로 창 없이 여러 World 를 만들어 반복문에서 돌릴 수 있음
+# - 화면 그리기는 main.py 가 World 의 상태를 읽어서 따로 처리
+# - 먹이가 추가/삭제되면 food_observers 에 등록된 객체(예: FoodOverlay)에 알림
+#     observer.add_points(points) / observer.remove(x, y) / observer.rebuild()
+# - 모든 시각은 World.time (시뮬레이션 시작 후 경과 초) 기준
+# - fork() 로 같은 상태의 World 를 만들어 원래 World 와 나란히 진행 가능 (what-if 분기)
+#
+# 예 (화면 없이 1분 진행):
+#   world = World(700, 700, TemperatureField(700, 700), FoodSpatialHash())
+#   world.add_worm(Worm(brain, 350, 350, preferred_temperature=20.0))
+#   for _ in range(3600):
+#       world.step(1 / 60)
+# ============================================================
+
+import copy
+import math
+
+import numpy as np
+
+from food_patches import PATCH_GAUSSIAN, generate_patch
+
+
+class WorldParameters:
+    """
+    벌레 감각 / 배고픔 / 타이머 설정 (시간 단위: 초)
+
+    기본값은 main.py 의 상수 기본값과 같습니다.
+    """
+
+    __slots__ = (
+        'food_sense_distance', 'food_eat_distance',
+        'odour_detection_threshold', 'food_sense_concentration_gain', 'food_sense_gradient_gain',
+        'food_sense_lookahead_distance', 'food_sense_max_intensity',
+        'hunger_initial_value', 'hunger_increase_interval', 'hunger_increase_amount', 'hunger_decrease_on_eat',
+        'afd_deviation_gain', 'afd_gradient_gain', 'afd_lookahead_distance', 'afd_max_stimulus',
+        'temperature_satisfied_threshold', 'temperature_avoidance_threshold',
+        'brain_update_interval', 'neuron_reset_time', 'frame_rate', 'food_click_patch', 'worm_contact_radius',
+    )
+
+    def __init__(self, food_sense_distance=200, food_eat_distance=20,
+                 odour_detection_threshold=0.09, food_sense_concentration_gain=1.0, food_sense_gradient_gain=5.0,
+                 food_sense_lookahead_distance=20.0, food_sense_max_intensity=3.0,
+                 hunger_initial_value=0.5, hunger_increase_interval=1.0, hunger_increase_amount=0.01,
+                 hunger_decrease_on_eat=0.1,
+                 afd_deviation_gain=2.0, afd_gradient_gain=4.0, afd_lookahead_distance=20.0, afd_max_stimulus=10.0,
+                 temperature_satisfied_threshold=2.0, temperature_avoidance_threshold=5.0,
+                 brain_update_interval=0.5, neuron_reset_time=2.0, frame_rate=60.0,
+                 food_click_patch=None, worm_contact_radius=20.0):
+        """
+        Args:
+            food_sense_distance: 먹이 감지 최대 거리 (픽셀)
+            food_eat_distance: 먹이 섭취 거리 (픽셀)
+            odour_detection_threshold: 먹이 감각 뉴런을 자극하는 최소 냄새 농도
+            food_sense_*: 냄새 농도 / 진행 방향 농도 증가에 따른 자극 세기
+            hunger_*: 배고픔 초기값, 증가 간격(초)과 증가량, 먹이 하나당 감소량
+            afd_*: AFD 온도 감각 뉴런 자극 세기
+            temperature_*_threshold: 온도 반응(만족/회피) 판단 기준 (°C, 화면 표시용)
+            brain_update_interval: 뇌 업데이트 주기 (초)
+            neuron_reset_time: 코 터치 / 먹이 감각 자극 유지 시간 (초)
+            frame_rate: 이동 상수(회전 0.1 rad, 속도 px)가 맞춰진 기준 스텝 수 (초당)
+            food_click_patch: add_food_patch() 로 놓는 가우시안 패치 파라미터
+            worm_contact_radius: 벌레 무리에서 다른 벌레 머리와 이 거리 이내면 코 터치 자극 (픽셀, 0 이면 끔)
+        """
+        self.food_sense_distance = food_sense_distance
+        self.food_eat_distance = food_eat_distance
+        self.odour_detection_threshold = odour_detection_threshold
+        self.food_sense_concentration_gain = food_sense_concentration_gain
+        self.food_sense_gradient_gain = food_sense_gradient_gain
+        self.food_sense_lookahead_distance = food_sense_lookahead_distance
+        self.food_sense_max_intensity = food_sense_max_intensity
+        self.hunger_initial_value = hunger_initial_value
+        self.hunger_increase_interval = hunger_increase_interval
+        self.hunger_increase_amount = hunger_increase_amount
+        self.hunger_decrease_on_eat = hunger_decrease_on_eat
+        self.afd_deviation_gain = afd_deviation_gain
+        self.afd_gradient_gain = afd_gradient_gain
+        self.afd_lookahead_distance = afd_lookahead_distance
+        self.afd_max_stimulus = afd_max_stimulus
+        self.temperature_satisfied_threshold = temperature_satisfied_threshold
+        self.temperature_avoidance_threshold = temperature_avoidance_threshold
+        self.brain_update_interval = brain_update_interval
+        self.neuron_reset_time = neuron_reset_time
+        self.frame_rate = frame_rate
+        self.food_click_patch = food_click_patch if food_click_patch is not None else {'sigma': 30, 'count': 200}
+        self.worm_contact_radius = worm_contact_radius
+
+
+class Worm:
+    """
+    벌레 한 마리의 상태
+
+    속성:
+        brain: 신경망 (FastBrain / Brain)
+        position: 머리 위치 [x, y]
+        facing_angle: 현재 진행 각도 (라디안, 화면 위쪽이 +y 방향)
+        target_angle / target_speed / speed_change_rate: 뇌 업데이트에서 정한 목표 이동
+        hungry_value: 배고픔 (0.0=배부름, 1.0=매우 배고픔) - 하이브리드 AI 의 k 값
+        hunger_start_time: 배고픔 계산 기준 시각 (초)
+        preferred_temperature: 선호 온도 (°C)
+        temperature_at_worm / previous_temperature: 마지막 뇌 업데이트 때 / 그 이전의 머리 위치 온도
+        afd_stimulus: 마지막 AFD 뉴런 자극 세기
+        temperature_reaction: "만족" / "중립" / "회피"
+        odour_at_worm: 머리 위치의 냄새 농도
+        last_brain_update: 마지막 뇌 업데이트 시각 (초)
+        last_touch_time / last_food_sense_time: 마지막 자극 시각 (초, 자극이 없었으면 None)
+        body: 몸체 점 배열 WormBody (worm_body.py, 없으면 None) - 매 스텝 머리 위치를 따라감
+    """
+
+    __slots__ = (
+        'brain', 'position', 'facing_angle', 'target_angle', 'current_speed', 'target_speed', 'speed_change_rate',
+        'hungry_value', 'hunger_start_time', 'preferred_temperature', 'temperature_at_worm', 'previous_temperature',
+        'afd_stimulus', 'temperature_reaction', 'odour_at_worm',
+        'last_brain_update', 'last_touch_time', 'last_food_sense_time', 'body',
+    )
+
+    def __init__(self, brain, x, y, preferred_temperature, temperature=20.0, hungry_value=0.5, time=0.0,
+                 body=None):
+        """
+        Args:
+            brain: 신경망 (setup() 을 마친 상태)
+            x, y: 머리 위치
+            preferred_temperature: 선호 온도 (°C)
+            temperature: 처음 표시할 머리 위치 온도
+            hungry_value: 초기 배고픔 (WorldParameters.hunger_initial_value 와 같게 둠)
+            time: 생성 시각 (초)
+            body: WormBody (머리가 (x, y) 인 (N, 2) 몸체, None 이면 몸체 없음)
+        """
+        self.brain = brain
+        self.position = [x, y]
+        self.facing_angle = 0.0
+        self.target_angle = 0.0
+        self.current_speed = 0.0
+        self.target_speed = 0.0
+        self.speed_change_rate = 0.0
+        self.hungry_value = hungry_value
+        self.hunger_start_time = time
+        self.preferred_temperature = preferred_temperature
+        self.temperature_at_worm = temperature
+        self.previous_temperature = None
+        self.afd_stimulus = 0.0
+        self.temperature_reaction = "중립"
+        self.odour_at_worm = 0.0
+        self.last_brain_update = time
+        self.last_touch_time = None
+        self.last_food_sense_time = None
+        self.body = body
+
+    # ========================================
+    # 배고픔
+    # ========================================
+
+    def update_hunger(self, now, params):
+        """
+        시간 경과에 따라 배고픔을 올립니다. (hunger_increase_interval 마다 hunger_increase_amount)
+        """
+        intervals_passed = (now - self.hunger_start_time) // params.hunger_increase_interval
+        self.hungry_value = min(1.0, params.hunger_initial_value + intervals_passed * params.hunger_increase_amount)
+
+    def decrease_hunger(self, now, params):
+        """
+        먹이를 먹었을 때 배고픔을 내리고, 기준 시각을 감소된 값에 맞게 다시 정합니다.
+
+        hungry_value = 초기값 + 지난 간격 수 × 증가량 공식에서 기준 시각을 역산합니다.
+        (초기값 미만이면 기준 시각이 미래가 됨)
+        """
+        self.hungry_value = max(0.0, self.hungry_value - params.hunger_decrease_on_eat)
+        intervals_passed = (self.hungry_value - params.hunger_initial_value) / params.hunger_increase_amount
+        self.hunger_start_time = now - intervals_passed * params.hunger_increase_interval
+
+
+class World:
+    """
+    벌레와 환경(먹이, 온도, 냄새)을 담은 시뮬레이션
+
+    속성:
+        width, height: 벌레가 움직이는 영역 크기 (픽셀)
+        time: 시뮬레이션 경과 시간 (초)
+        worms: Worm 목록
+        populations: WormPopulation 목록 (벌레 무리, population.py)
+        params: WorldParameters
+        temperature_field: TemperatureField
+        temperature_dynamics: TemperatureDynamics (없으면 None)
+        food: 먹이 위치 저장소 (FoodSpatialHash)
+        food_regrowth: FoodRegrowth (없으면 None)
+        patch_rng: add_food_patch() 용 numpy Generator (food_regrowth 가 있으면 그 rng 를 함께 쓰고, 없으면 patch_seed 로 만듦)
+        odour_field: OdourField (없으면 None)
+        food_observers: 먹이 추가/삭제를 전달받는 객체 목록 (화면 레이어 등)
+    """
+
+    __slots__ = (
+        'width', 'height', 'time', 'worms', 'populations', 'params',
+        'temperature_field', 'temperature_dynamics', 'food', 'food_regrowth', 'patch_rng', 'odour_field',
+        'food_observers',
+    )
+
+    def __init__(self, width, height, temperature_field, food, params=None, temperature_dynamics=None,
+                 food_regrowth=None, odour_field=None, patch_seed=0):
+        self.width = width
+        self.height = height
+        self.time = 0.0
+        self.worms = []
+        self.populations = []
+        self.params = params if params is not None else WorldParameters()
+        self.temperature_field = temperature_field
+        self.temperature_dynamics = temperature_dynamics
+        self.food = food
+        self.food_regrowth = food_regrowth
+        self.patch_rng = food_regrowth.rng if food_regrowth is not None else np.random.default_rng(patch_seed)
+        self.odour_field = odour_field
+        self.food_observers = []
+
+    @property
+    def bounds(self):
+        """먹이 배치 영역 (x0, y0, x1, y1)"""
+        return (0, 0, self.width, self.height)
+
+    def add_worm(self, worm):
+        """벌레를 추가하고 돌려줍니다."""
+        self.worms.append(worm)
+        return worm
+
+    def add_population(self, population):
+        """벌레 무리(WormPopulation)를 추가하고 돌려줍니다."""
+        self.populations.append(population)
+        return population
+
+    def fork(self):
+        """
+        현재 상태에서 분기한 새 World 를 만듭니다. (what-if 분기, 원래 World 와 나란히 step() 가능)
+
+        신경망은 FastBrain.fork() / BrainEnsemble.fork() 로 커넥톰을 공유하고 상태 배열만 복사합니다.
+        먹이 해시는 FoodSpatialHash.copy() 로 배열과 사전만 복사합니다.
+        벌레, 온도 / 냄새 필드는 배열을 복사하고 params 는 공유합니다.
+        먹이 관찰자(화면 레이어)는 옮기지 않습니다.
+
+        Returns:
+            World: 같은 상태를 가진 독립적인 World
+        """
+        memo = {id(self.params): self.params, id(self.food_observers): [], id(self.food): self.food.copy()}
+        for worm in self.worms:
+            memo[id(worm.brain)] = worm.brain.fork()
+        for population in self.populations:
+            memo[id(population.brains)] = population.brains.fork()
+        return copy.deepcopy(self, memo)
+
+    # ========================================
+    # 먹이
+    # ========================================
+
+    def add_food(self, x, y):
+        """먹이 하나를 추가하고 먹이 번호를 돌려줍니다."""
+        food_id = self.food.insert(x, y)
+        for observer in self.food_observers:
+            observer.add_points([(x, y)])
+        if self.odour_field is not None:
+            self.odour_field.add_source(x, y)
+        return food_id
+
+    def add_food_points(self, points, tag=-1):
+        """
+        여러 먹이를 한 번에 추가합니다. (패치 배치 / 재성장)
+
+        Args:
+            points: (N, 2) 먹이 위치 배열
+            tag: 먹이 묶음 번호 (패치 번호, 없으면 -1)
+        """
+        ids = self.food.extend(points, tag)
+        for observer in self.food_observers:
+            observer.add_points(points)
+        if self.odour_field is not None:
+            self.odour_field.add_sources(points)
+        return ids
+
+    def add_food_patch(self, x, y):
+        """(x, y) 주변에 가우시안 먹이 패치(params.food_click_patch)를 놓습니다."""
+        params = dict(self.params.food_click_patch, x=x, y=y)
+        points = generate_patch(self.patch_rng, PATCH_GAUSSIAN, params, bounds=self.bounds)
+        return self.add_food_points(points)
+
+    def remove_food(self, food_id):
+        """먹이 번호로 먹이를 제거합니다. (냄새 원천도 함께 제거)"""
+        x, y = self.food.position(food_id)
+        self.food.remove(food_id)
+        for observer in self.food_observers:
+            observer.remove(x, y)
+        if self.odour_field is not None:
+            self.odour_field.remove_source(x, y)
+
+    def reset_food(self, positions, tags=-1):
+        """먹이를 모두 positions((N, 2) 배열) 로 바꿉니다. (체크포인트 / 온도 환경 불러오기)"""
+        self.food.clear()
+        self.food.extend(positions, tags)
+        for observer in self.food_observers:
+            observer.rebuild()
+        if self.odour_field is not None:
+            self.odour_field.set_sources(positions)
+
+    # ========================================
+    # 시간 진행
+    # ========================================
+
+    def step(self, dt):
+        """
+        dt 초만큼 시뮬레이션을 진행합니다.
+
+        순서: 배고픔 → 뇌 업데이트(주기마다) → 이동/감각/섭취 → 몸체 → 온도·먹이·냄새 필드 → 자극 해제
+        """
+        self.time += dt
+        now = self.time
+        params = self.params
+        frames = dt * params.frame_rate
+
+        for worm in self.worms:
+            worm.update_hunger(now, params)
+            if now - worm.last_brain_update >= params.brain_update_interval:
+                self.update_brain(worm)
+                worm.last_brain_update = now
+            self.move(worm, frames)
+            if worm.body is not None:
+                worm.body.update(worm.position)
+        for population in self.populations:
+            population.step(self, frames)
+
+        if self.temperature_dynamics is not None:
+            self.temperature_dynamics.advance(dt)
+        if self.food_regrowth is not None:
+            self.food_regrowth.advance(dt, self.food, self.add_food_points)
+        if self.odour_field is not None:
+            self.odour_field.advance(dt)
+
+        for worm in self.worms:
+            self.reset_stimuli(worm)
+        for population in self.populations:
+            population.reset_stimuli(self)
+
+    def update_brain(self, worm):
+        """
+        AFD 온도 감각 뉴런을 자극하고 뇌를 한 번 업데이트한 뒤, 근육 신호로 목표 방향/속도를 정합니다.
+
+        - 시간 변화: 이전 뇌 업데이트 이후 머리 위치 온도 변화
+        - 공간 변화: 머리 위치 온도 기울기 · 진행 방향 × afd_lookahead_distance
+        - 자극 = 선호 온도와의 차이 × afd_deviation_gain + 선호 온도에서 멀어지는 변화 × afd_gradient_gain
+        """
+        params = self.params
+        brain = worm.brain
+        head_x, head_y = worm.position
+        worm_temperature = self.temperature_field.temperature_at(head_x, head_y)
+        worm.temperature_at_worm = worm_temperature
+        temperature_deviation = worm_temperature - worm.preferred_temperature
+
+        temporal_change = 0.0 if worm.previous_temperature is None else worm_temperature - worm.previous_temperature
+        worm.previous_temperature = worm_temperature
+        gradient_x, gradient_y = self.temperature_field.gradient_at(head_x, head_y)
+        spatial_change = (gradient_x * math.cos(worm.facing_angle)
+                          - gradient_y * math.sin(worm.facing_angle)) * params.afd_lookahead_distance
+
+        # 선호 온도에서 멀어지는 변화량 (양수: 멀어짐, 음수: 가까워짐)
+        direction = (temperature_deviation > 0) - (temperature_deviation < 0)
+        worsening = direction * (temporal_change + spatial_change)
+
+        stimulus = params.afd_deviation_gain * abs(temperature_deviation) + params.afd_gradient_gain * worsening
+        stimulus = min(max(stimulus, 0.0), params.afd_max_stimulus)
+        worm.afd_stimulus = stimulus
+        if abs(temperature_deviation) > params.temperature_avoidance_threshold:
+            worm.temperature_reaction = "회피"
+        elif abs(temperature_deviation) < params.temperature_satisfied_threshold:
+            worm.temperature_reaction = "만족"
+        else:
+            worm.temperature_reaction = "중립"
+        brain.PostSynaptic['AFDL'][brain.NextSignalIntensityIndex] += stimulus
+        brain.PostSynaptic['AFDR'][brain.NextSignalIntensityIndex] += stimulus
+
+        brain.update()
+
+        # 근육 신호 → 목표 방향 (좌우 차이) / 목표 속도 (좌우 합)
+        scaling_factor = 20
+        new_angle_offset = (brain.AccumulatedLeftMusclesSignal - brain.AccumulatedRightMusclesSignal) / scaling_factor
+        worm.target_angle = worm.facing_angle + new_angle_offset * math.pi
+        worm.target_speed = ((abs(brain.AccumulatedLeftMusclesSignal) + abs(brain.AccumulatedRightMusclesSignal))
+                             / (scaling_factor * 5))
+        worm.speed_change_rate = (worm.target_speed - worm.current_speed) / (scaling_factor * 1.5)
+
+    def move(self, worm, frames=1.0):
+        """
+        하이브리드 AI 로 방향을 정하고 벌레를 이동시킨 뒤 벽 충돌, 먹이 감각, 섭취를 처리합니다.
+
+        최종 방향 = (1 - hungry_value) × 뇌 신호 방향 + hungry_value × 가장 가까운 먹이 방향
+        (감지 범위 안에 먹이가 없으면 뇌 신호 방향)
+
+        Args:
+            worm: Worm
+            frames: 기준 스텝(1 / frame_rate 초) 단위 경과량
+        """
+        params = self.params
+        position = worm.position
+        worm.current_speed += worm.speed_change_rate * frames
+
+        # 감지 범위 안의 가장 가까운 먹이 방향과 뇌 신호 방향을 배고픔으로 섞음
+        nearest_food = self.food.nearest(position[0], position[1], params.food_sense_distance)
+        if nearest_food is not None:
+            food_x, food_y = nearest_food[1]
+            food_target_angle = math.atan2(-(food_y - position[1]), food_x - position[0])  # y축 반전 보정
+            worm.target_angle = (1 - worm.hungry_value) * worm.target_angle + worm.hungry_value * food_target_angle
+
+        # 각도 차이를 -π ~ π 범위로 정규화한 뒤 목표 쪽으로 회전
+        facing_angle, target_angle = worm.facing_angle, worm.target_angle
+        angle_difference = facing_angle - target_angle
+        if abs(angle_difference) > math.pi:
+            if facing_angle > target_angle:
+                angle_difference = -1 * (2 * math.pi - facing_angle + target_angle)
+            else:
+                angle_difference = 2 * math.pi - target_angle + facing_angle
+        if angle_difference > 0:
+            worm.facing_angle -= 0.1 * frames
+        elif angle_difference < 0:
+            worm.facing_angle += 0.1 * frames
+
+        position[0] += math.cos(worm.facing_angle) * worm.current_speed * frames
+        position[1] -= math.sin(worm.facing_angle) * worm.current_speed * frames
+
+        # 영역 경계 충돌: 코 터치 뉴런 자극
+        touched = False
+        if position[0] < 0:
+            position[0] = 0
+            touched = True
+        elif position[0] > self.width:
+            position[0] = self.width
+            touched = True
+        if position[1] < 0:
+            position[1] = 0
+            touched = True
+        elif position[1] > self.height:
+            position[1] = self.height
+            touched = True
+        if touched:
+            worm.brain.IsStimulatedNoseTouchNeurons = True
+            worm.last_touch_time = self.time
+
+        self.sense_food(worm)
+
+        # 먹이 섭취 범위 내: 먹이 제거 및 배고픔 감소
+        for food_id, _, _ in self.food.within(position[0], position[1], params.food_eat_distance):
+            self.remove_food(food_id)
+            worm.decrease_hunger(self.time, params)
+
+    def sense_food(self, worm):
+        """
+        먹이 감각 뉴런(ADF, ASG, ASI, ASJ) 자극 여부와 세기를 정합니다.
+
+        - 냄새 필드 사용 시: 머리 위치 농도가 odour_detection_threshold 이상이면 자극,
+          세기 = 농도 × food_sense_concentration_gain
+               + 진행 방향 농도 증가량 × food_sense_gradient_gain (짙어지는 쪽으로 갈 때만)
+        - 냄새 필드 미사용 시: 감지 범위 안에 먹이가 있으면 세기 1.0 으로 자극
+        """
+        params = self.params
+        head_x, head_y = worm.position
+        if self.odour_field is None:
+            if self.food.nearest(head_x, head_y, params.food_sense_distance) is None:
+                return
+            intensity = 1.0
+        else:
+            worm.odour_at_worm = concentration = self.odour_field.concentration_at(head_x, head_y)
+            if concentration < params.odour_detection_threshold:
+                return
+            gradient_x, gradient_y = self.odour_field.gradient_at(head_x, head_y)
+            approaching = (gradient_x * math.cos(worm.facing_angle)
+                           - gradient_y * math.sin(worm.facing_angle)) * params.food_sense_lookahead_distance
+            intensity = (params.food_sense_concentration_gain * concentration
+                         + params.food_sense_gradient_gain * max(approaching, 0.0))
+            intensity = min(intensity, params.food_sense_max_intensity)
+        worm.brain.IsStimulatedFoodSenseNeurons = True
+        worm.brain.FoodSenseIntensity = intensity
+        worm.last_food_sense_time = self.time
+
+    def reset_stimuli(self, worm):
+        """배고픔 뉴런은 항상 자극하고, 코 터치 / 먹이 감각 자극은 neuron_reset_time 이 지나면 해제합니다."""
+        brain = worm.brain
+        brain.IsStimulatedHungerNeurons = True
+        reset_time = self.params.neuron_reset_time
+        if worm.last_touch_time is not None and self.time - worm.last_touch_time >= reset_time:
+            brain.IsStimulatedNoseTouchNeurons = False
+        if worm.last_food_sense_time is not None and self.time - worm.last_food_sense_time >= reset_time:
+            brain.IsStimulatedFoodSenseNeurons = False
@@ -0,0 +1,104 @@
+# ============================================================
+# worm_body.py - 벌레 몸체 (점 배열 역운동학)
+# ============================================================
+#
+# 벌레 몸체를 머리부터 꼬리까지 이어진 점 N 개의 (N, 2) 배열로 나타냅니다.
+# 머리 점을 벌레 위치로 옮긴 뒤, 이웃한 두 점 사이 거리가 segment_length 가 되도록
+# 모든 마디를 배열 연산으로 한꺼번에 당기거나 미는 이완(relaxation)을 반복합니다.
+#
+# - 짝수 번째 마디와 홀수 번째 마디를 번갈아 계산 (같은 차례의 마디끼리는 점을 공유하지 않으므로
+#   각 마디의 길이를 정확히 맞출 수 있음)
+# - 마디마다 꼬리 쪽 점만 움직임 (머리를 따라가는 방식, 기존 스프링 체인의 탄성 0.998 과 같은 방향)
+# - iterations: 한 번 update() 에 반복할 이완 횟수 (몸이 머리를 따라 휘는 부드러움)
+# - 이완만으로는 마디 길이 오차가 한 스텝 머리 이동 거리만큼 남으므로, 마지막에 머리부터 꼬리까지
+#   차례로 각 마디를 segment_length 로 맞추는 한 번의 통과로 마디 길이와 몸 길이를 정확히 유지
+# - 점 배열은 (..., N, 2) 모양이면 되므로 벌레 무리의 몸체 (벌레 수, N, 2) 도 같은 계산으로 처리
+# ============================================================
+
+import numpy as np
+
+
+class WormBody:
+    """
+    벌레 몸체 점 배열
+
+    속성:
+        points: (..., N, 2) 몸체 점 (0번이 머리)
+        segment_length: 이웃한 점 사이 거리 (픽셀)
+        iterations: update() 한 번에 반복하는 이완 횟수
+    """
+
+    def __init__(self, points, segment_length, iterations=2):
+        """
+        Args:
+            points: (..., N, 2) 시작 몸체 점 (N >= 2)
+            segment_length: 마디 길이 (픽셀)
+            iterations: update() 한 번에 반복하는 이완 횟수
+        """
+        self.points = np.array(points, dtype=np.float64)
+        if self.points.ndim < 2 or self.points.shape[-2] < 2 or self.points.shape[-1] != 2:
+            raise ValueError(f"몸체 점 배열은 (..., N >= 2, 2) 모양이어야 합니다: {self.points.shape}")
+        self.segment_length = segment_length
+        self.iterations = iterations
+
+    @classmethod
+    def straight(cls, heads, angles, point_count, segment_length, iterations=2):
+        """
+        머리에서 진행 방향 반대쪽으로 곧게 뻗은 몸체를 만듭니다.
+
+        Args:
+            heads: (..., 2) 머리 위치
+            angles: (...) 진행 각도 (라디안, 화면 위쪽이 +y 방향)
+            point_count: 몸체 점 수
+        """
+        body = cls(np.zeros(np.shape(heads)[:-1] + (point_count, 2)), segment_length, iterations)
+        body.reset(heads, angles)
+        return body
+
+    @property
+    def point_count(self):
+        """몸체 점 수"""
+        return self.points.shape[-2]
+
+    def reset(self, heads, angles):
+        """몸체를 머리에서 진행 방향 반대쪽으로 곧게 다시 놓습니다. (불러오기 / 순간 이동 후)"""
+        heads = np.asarray(heads, dtype=np.float64)
+        angles = np.asarray(angles, dtype=np.float64)
+        distances = np.arange(self.point_count) * self.segment_length
+        self.points[..., 0] = heads[..., None, 0] - np.cos(angles)[..., None] * distances
+        self.points[..., 1] = heads[..., None, 1] + np.sin(angles)[..., None] * distances
+
+    def update(self, heads):
+        """
+        머리 점을 heads 로 옮기고 iterations 번 이완한 뒤 마디 길이를 정확히 맞춥니다.
+
+        Args:
+            heads: (..., 2) 새 머리 위치
+        """
+        self.points[..., 0, :] = heads
+        for _ in range(self.iterations):
+            self._relax(0)
+            self._relax(1)
+        self._constrain()
+
+    def _relax(self, parity):
+        """parity(0: 짝수, 1: 홀수) 번째 마디들의 길이를 segment_length 로 맞춥니다."""
+        front = self.points[..., parity:-1:2, :]
+        back = self.points[..., parity + 1::2, :]
+        count = min(front.shape[-2], back.shape[-2])
+        front, back = front[..., :count, :], back[..., :count, :]
+
+        # 마디 길이가 segment_length 가 되도록 꼬리 쪽 점을 머리 쪽 점 방향으로 옮김
+        delta = back - front
+        distance = np.sqrt((delta * delta).sum(axis=-1, keepdims=True))
+        stretch = (distance - self.segment_length) / np.where(distance > 0, distance, 1.0) * delta
+        back -= stretch
+
+    def _constrain(self):
+        """머리부터 꼬리까지 차례로 각 점을 앞 점에서 segment_length 거리로 옮깁니다. (겹친 점은 그대로)"""
+        points = self.points
+        for k in range(1, self.point_count):
+            front = points[..., k - 1, :]
+            delta = points[..., k, :] - front
+            distance = np.hypot(delta[..., 0], delta[..., 1])[..., None]
+            points[..., k, :] = front + delta * (self.segment_length / np.maximum(distance, 1e-12))